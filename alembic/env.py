@@ -8,6 +8,7 @@ from sqlmodel import SQLModel
 from alembic import context
 from src.core.config import database_settings as settings
 from src.entities import todo, user
+from src.entities.todo import SEARCH_INDEXES, SEARCH_VECTOR_COLUMN
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -24,6 +25,18 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = SQLModel.metadata
 
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # The full-text search column and its index are managed by hand in
+    # migrations and intentionally not mapped on the model
+    if type_ == "column" and name == SEARCH_VECTOR_COLUMN and reflected:
+        return False
+    if type_ == "index" and name in SEARCH_INDEXES and reflected:
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -51,6 +64,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -58,7 +72,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
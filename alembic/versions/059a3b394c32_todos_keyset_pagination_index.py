@@ -0,0 +1,44 @@
+"""Todos keyset pagination index
+
+Revision ID: 059a3b394c32
+Revises: 42bda04e2ac6
+Create Date: 2026-10-17 09:12:41.502117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '059a3b394c32'
+down_revision: Union[str, Sequence[str], None] = '42bda04e2ac6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Cursor keys cannot be NULL, so backfill before tightening the column
+    op.execute("UPDATE todos SET created_at = now() WHERE created_at IS NULL")
+    op.alter_column(
+        'todos',
+        'created_at',
+        existing_type=postgresql.TIMESTAMP(),
+        nullable=False,
+    )
+    op.create_index(
+        'ix_todos_created_at_id', 'todos', ['created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_todos_created_at_id', table_name='todos')
+    op.alter_column(
+        'todos',
+        'created_at',
+        existing_type=postgresql.TIMESTAMP(),
+        nullable=True,
+    )
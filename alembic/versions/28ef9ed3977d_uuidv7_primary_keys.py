@@ -0,0 +1,34 @@
+"""UUIDv7 primary keys
+
+Revision ID: 28ef9ed3977d
+Revises: 70c4a0584a27
+Create Date: 2026-10-17 15:20:37.019284
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '28ef9ed3977d'
+down_revision: Union[str, Sequence[str], None] = '70c4a0584a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The application generates UUIDv7 keys itself; the server default
+    # (uuidv7() is built in from Postgres 18) covers raw SQL inserts. Existing
+    # v4 keys stay valid: ids are opaque and referenced by foreign keys, so
+    # they are not rewritten - new rows simply append to the right of the
+    # index from here on.
+    op.alter_column('users', 'id', server_default=sa.text('uuidv7()'))
+    op.alter_column('todos', 'id', server_default=sa.text('uuidv7()'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('todos', 'id', server_default=None)
+    op.alter_column('users', 'id', server_default=None)
@@ -0,0 +1,93 @@
+"""Todo row and list versions
+
+Revision ID: 5b79df597871
+Revises: 28ef9ed3977d
+Create Date: 2026-10-17 16:05:12.481337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5b79df597871'
+down_revision: Union[str, Sequence[str], None] = '28ef9ed3977d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# One bump per owner per statement, whatever the number of rows. As with the
+# stats counters, deletes only UPDATE: rows removed by the users ON DELETE
+# CASCADE must not re-insert a version row for the deleted owner.
+BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION todo_list_versions_bump() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        UPDATE todo_list_versions AS v
+        SET version = v.version + 1
+        WHERE v.owner_id IN (SELECT owner_id FROM old_rows);
+    ELSE
+        INSERT INTO todo_list_versions (owner_id, version)
+        SELECT DISTINCT owner_id, 1 FROM new_rows
+        ON CONFLICT (owner_id)
+        DO UPDATE SET version = todo_list_versions.version + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+TRIGGERS = {
+    'todo_list_versions_insert': (
+        'AFTER INSERT ON todos REFERENCING NEW TABLE AS new_rows'
+    ),
+    'todo_list_versions_update': (
+        'AFTER UPDATE ON todos REFERENCING NEW TABLE AS new_rows'
+    ),
+    'todo_list_versions_delete': (
+        'AFTER DELETE ON todos REFERENCING OLD TABLE AS old_rows'
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'todos',
+        sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    )
+    op.add_column(
+        'todos_archive',
+        sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    )
+    op.create_table(
+        'todo_list_versions',
+        sa.Column('owner_id', sa.Uuid(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('owner_id'),
+    )
+    op.execute(BUMP_FUNCTION)
+    # Every owner with todos gets a row up front, so deletes always find one
+    op.execute('LOCK TABLE todos IN SHARE ROW EXCLUSIVE MODE')
+    for name, timing in TRIGGERS.items():
+        op.execute(
+            f'CREATE TRIGGER {name} {timing} '
+            'FOR EACH STATEMENT EXECUTE FUNCTION todo_list_versions_bump()'
+        )
+    op.execute(
+        'INSERT INTO todo_list_versions (owner_id, version) '
+        'SELECT DISTINCT owner_id, 1 FROM todos'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {name} ON todos')
+    op.execute('DROP FUNCTION IF EXISTS todo_list_versions_bump()')
+    op.drop_table('todo_list_versions')
+    op.drop_column('todos_archive', 'version')
+    op.drop_column('todos', 'version')
@@ -0,0 +1,114 @@
+"""Todo stats counters
+
+Revision ID: 663d0c7833b1
+Revises: 7417b7d55a28
+Create Date: 2026-10-17 13:02:44.730158
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '663d0c7833b1'
+down_revision: Union[str, Sequence[str], None] = '7417b7d55a28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Statement-level triggers aggregate each statement's transition table, so a
+# bulk insert/update/delete touches at most eight counter rows per owner.
+# Deletes only ever UPDATE existing counters: rows removed by the users
+# ON DELETE CASCADE must not try to re-insert counters for a deleted owner.
+APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION todo_stats_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO todo_stats (owner_id, is_completed, priority, count)
+        SELECT owner_id, is_completed, priority, count(*)
+        FROM new_rows
+        GROUP BY owner_id, is_completed, priority
+        ON CONFLICT (owner_id, is_completed, priority)
+        DO UPDATE SET count = todo_stats.count + EXCLUDED.count;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO todo_stats (owner_id, is_completed, priority, count)
+        SELECT owner_id, is_completed, priority, sum(delta)
+        FROM (
+            SELECT owner_id, is_completed, priority, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT owner_id, is_completed, priority, -1 FROM old_rows
+        ) AS changes
+        GROUP BY owner_id, is_completed, priority
+        HAVING sum(delta) <> 0
+        ON CONFLICT (owner_id, is_completed, priority)
+        DO UPDATE SET count = todo_stats.count + EXCLUDED.count;
+    ELSE
+        UPDATE todo_stats AS s
+        SET count = s.count - d.removed
+        FROM (
+            SELECT owner_id, is_completed, priority, count(*) AS removed
+            FROM old_rows
+            GROUP BY owner_id, is_completed, priority
+        ) AS d
+        WHERE s.owner_id = d.owner_id
+          AND s.is_completed = d.is_completed
+          AND s.priority = d.priority;
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+TRIGGERS = {
+    'todo_stats_insert': 'AFTER INSERT ON todos REFERENCING NEW TABLE AS new_rows',
+    'todo_stats_update': (
+        'AFTER UPDATE ON todos '
+        'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows'
+    ),
+    'todo_stats_delete': 'AFTER DELETE ON todos REFERENCING OLD TABLE AS old_rows',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'todo_stats',
+        sa.Column('owner_id', sa.Uuid(), nullable=False),
+        sa.Column('is_completed', sa.Boolean(), nullable=False),
+        sa.Column(
+            'priority',
+            postgresql.ENUM(
+                'Low', 'Medium', 'High', 'Critical',
+                name='priority',
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('owner_id', 'is_completed', 'priority'),
+    )
+    op.execute(APPLY_FUNCTION)
+    # Block writers while the triggers go in and the counters are backfilled
+    op.execute('LOCK TABLE todos IN SHARE ROW EXCLUSIVE MODE')
+    for name, timing in TRIGGERS.items():
+        op.execute(
+            f'CREATE TRIGGER {name} {timing} '
+            'FOR EACH STATEMENT EXECUTE FUNCTION todo_stats_apply()'
+        )
+    op.execute(
+        'INSERT INTO todo_stats (owner_id, is_completed, priority, count) '
+        'SELECT owner_id, is_completed, priority, count(*) FROM todos '
+        'GROUP BY owner_id, is_completed, priority'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {name} ON todos')
+    op.execute('DROP FUNCTION IF EXISTS todo_stats_apply()')
+    op.drop_table('todo_stats')
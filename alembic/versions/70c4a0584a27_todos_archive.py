@@ -0,0 +1,124 @@
+"""Todos archive
+
+Revision ID: 70c4a0584a27
+Revises: 663d0c7833b1
+Create Date: 2026-10-17 14:31:09.662410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '70c4a0584a27'
+down_revision: Union[str, Sequence[str], None] = '663d0c7833b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'todos_archive',
+        sa.Column('id', postgresql.UUID(), nullable=False),
+        sa.Column('title', sa.String(length=50), nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=False),
+        sa.Column('is_completed', sa.Boolean(), nullable=False),
+        sa.Column('created_at', postgresql.TIMESTAMP(), nullable=False),
+        sa.Column(
+            'priority',
+            postgresql.ENUM(
+                'Low', 'Medium', 'High', 'Critical',
+                name='priority',
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column('owner_id', sa.Uuid(), nullable=False),
+        sa.Column(
+            'archived_at',
+            postgresql.TIMESTAMP(),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        # Same generated search document as todos.search_vector
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_todos_archive_owner_created_at_id',
+        'todos_archive',
+        ['owner_id', 'created_at', 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_todos_archive_owner_search',
+        'todos_archive',
+        ['owner_id', 'search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+    op.create_index(
+        'ix_todos_completed_created_at',
+        'todos',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text('is_completed = true'),
+    )
+
+
+# Archived titles may have been reused in todos since. Stop rather than drop
+# archived rows the live table has no room for
+CHECK_RESTORABLE = """
+DO $$
+DECLARE
+    conflicts integer;
+BEGIN
+    SELECT count(*) INTO conflicts
+    FROM todos_archive AS a
+    WHERE EXISTS (
+        SELECT 1 FROM todos AS t
+        WHERE t.id = a.id OR (t.owner_id = a.owner_id AND t.title = a.title)
+    );
+    IF conflicts > 0 THEN
+        RAISE EXCEPTION '% archived todos collide with live todos on id or '
+            '(owner_id, title); resolve them before downgrading', conflicts;
+    END IF;
+END
+$$
+"""
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Bring archived rows back rather than dropping them with the table; any
+    # collision left (e.g. two archived rows sharing a title) fails the INSERT
+    op.execute(CHECK_RESTORABLE)
+    op.execute(
+        'INSERT INTO todos '
+        '(id, title, description, is_completed, created_at, priority, owner_id) '
+        'SELECT id, title, description, is_completed, created_at, priority, '
+        'owner_id FROM todos_archive'
+    )
+    op.drop_index('ix_todos_completed_created_at', table_name='todos')
+    op.drop_index(
+        'ix_todos_archive_owner_search',
+        table_name='todos_archive',
+        postgresql_using='gin',
+    )
+    op.drop_index(
+        'ix_todos_archive_owner_created_at_id', table_name='todos_archive'
+    )
+    op.drop_table('todos_archive')
@@ -0,0 +1,41 @@
+"""Open todo partial indexes
+
+Revision ID: 7417b7d55a28
+Revises: e56740e50f0f
+Create Date: 2026-10-17 12:20:05.117204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '7417b7d55a28'
+down_revision: Union[str, Sequence[str], None] = 'e56740e50f0f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_todos_owner_open_created_at',
+        'todos',
+        ['owner_id', 'created_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text('is_completed = false'),
+    )
+    op.create_index(
+        'ix_todos_owner_open_priority',
+        'todos',
+        ['owner_id', 'priority', 'id'],
+        unique=False,
+        postgresql_where=sa.text('is_completed = false'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_todos_owner_open_priority', table_name='todos')
+    op.drop_index('ix_todos_owner_open_created_at', table_name='todos')
@@ -0,0 +1,54 @@
+"""Todo completed_at
+
+Revision ID: a46eaafb80b8
+Revises: 5b79df597871
+Create Date: 2026-10-17 18:42:37.204816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a46eaafb80b8'
+down_revision: Union[str, Sequence[str], None] = '5b79df597871'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'todos', sa.Column('completed_at', postgresql.TIMESTAMP(), nullable=True)
+    )
+    op.add_column(
+        'todos_archive',
+        sa.Column('completed_at', postgresql.TIMESTAMP(), nullable=True),
+    )
+    # When existing todos were completed is unknown. Their retention starts
+    # now, so none is archived earlier than under the old created_at rule
+    op.execute('UPDATE todos SET completed_at = now() WHERE is_completed')
+    op.drop_index('ix_todos_completed_created_at', table_name='todos')
+    op.create_index(
+        'ix_todos_completed_at',
+        'todos',
+        ['completed_at'],
+        unique=False,
+        postgresql_where=sa.text('is_completed = true'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_todos_completed_at', table_name='todos')
+    op.create_index(
+        'ix_todos_completed_created_at',
+        'todos',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text('is_completed = true'),
+    )
+    op.drop_column('todos_archive', 'completed_at')
+    op.drop_column('todos', 'completed_at')
@@ -0,0 +1,46 @@
+"""Owner scoped todo indexes
+
+Revision ID: b2ece86357f6
+Revises: 059a3b394c32
+Create Date: 2026-10-17 10:03:18.224950
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2ece86357f6'
+down_revision: Union[str, Sequence[str], None] = '059a3b394c32'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_todos_owner_created_at_id',
+        'todos',
+        ['owner_id', 'created_at', 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_todos_owner_status_priority',
+        'todos',
+        ['owner_id', 'is_completed', 'priority'],
+        unique=False,
+    )
+    # Both are left prefixes of / superseded by the owner-leading index above
+    op.drop_index('ix_todos_created_at_id', table_name='todos')
+    op.drop_index(op.f('ix_todos_owner_id'), table_name='todos')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_todos_owner_id'), 'todos', ['owner_id'], unique=False)
+    op.create_index(
+        'ix_todos_created_at_id', 'todos', ['created_at', 'id'], unique=False
+    )
+    op.drop_index('ix_todos_owner_status_priority', table_name='todos')
+    op.drop_index('ix_todos_owner_created_at_id', table_name='todos')
@@ -0,0 +1,50 @@
+"""Todos full text search
+
+Revision ID: e56740e50f0f
+Revises: b2ece86357f6
+Create Date: 2026-10-17 11:12:41.508317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e56740e50f0f'
+down_revision: Union[str, Sequence[str], None] = 'b2ece86357f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Lets the GIN index lead with the scalar owner_id column
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+    op.add_column(
+        'todos',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_todos_owner_search',
+        'todos',
+        ['owner_id', 'search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_todos_owner_search', table_name='todos', postgresql_using='gin')
+    op.drop_column('todos', 'search_vector')
@@ -0,0 +1,177 @@
+"""Fingerprinted, precompressed static assets.
+
+``python -m src.assets`` copies every file under ``static/`` to
+``static/dist/`` under a content-hashed name (``js/auth.<hash>.js``), writes
+``.gz`` (and, with the optional ``brotli`` package, ``.br``) siblings for
+text assets, and records the names in ``static/dist/manifest.json``. The
+image runs it at build time; templates resolve paths through ``asset_url``
+and fall back to the plain file when there is no build.
+
+``PrecompressedStaticFiles`` serves the precompressed sibling the client
+accepts and marks hashed files immutable.
+
+Deliberately free of application settings, so the build step needs no
+environment.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+from mimetypes import guess_type
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+try:
+    import brotli
+except ImportError:  # optional: assets are then precompressed as gzip only
+    brotli = None
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+DIST_DIR = STATIC_DIR / "dist"
+MANIFEST_PATH = DIST_DIR / "manifest.json"
+STATIC_URL = "/static/"
+
+COMPRESSIBLE = frozenset({".css", ".js", ".json", ".map", ".svg", ".txt"})
+# Sibling suffixes in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+DIGEST_LENGTH = 12
+# A hashed name never changes content, so it may be cached for good
+IMMUTABLE = "public, max-age=31536000, immutable"
+FINGERPRINTED = re.compile(rf"\.[0-9a-f]{{{DIGEST_LENGTH}}}\.[^.]+$")
+
+# (path, mtime) of the manifest last read, and its contents
+_manifest: tuple[tuple[Path, int], dict[str, str]] | None = None
+
+
+def accepted_encodings(header: str) -> dict[str, float]:
+    """Content codings of an ``Accept-Encoding`` header with their q-values."""
+    weights = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        if coding:
+            weights[coding.lower()] = weight
+    return weights
+
+
+def accepts(weights: dict[str, float], coding: str) -> bool:
+    return weights.get(coding, weights.get("*", 0.0)) > 0
+
+
+def build(static_dir: Path = STATIC_DIR) -> dict[str, str]:
+    """Rebuild ``dist/`` and its manifest; returns the manifest."""
+    dist_dir = static_dir / DIST_DIR.name
+    shutil.rmtree(dist_dir, ignore_errors=True)
+    sources = [path for path in sorted(static_dir.rglob("*")) if path.is_file()]
+
+    manifest = {}
+    for source in sources:
+        relative = source.relative_to(static_dir)
+        data = source.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()[:DIGEST_LENGTH]
+        target = dist_dir / relative.with_name(
+            f"{source.stem}.{digest}{source.suffix}"
+        )
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        if source.suffix in COMPRESSIBLE:
+            Path(f"{target}.gz").write_bytes(
+                gzip.compress(data, compresslevel=9, mtime=0)
+            )
+            if brotli is not None:
+                Path(f"{target}.br").write_bytes(brotli.compress(data, quality=11))
+        manifest[relative.as_posix()] = target.relative_to(static_dir).as_posix()
+
+    (dist_dir / MANIFEST_PATH.name).write_text(
+        json.dumps(manifest, indent=2, sort_keys=True)
+    )
+    return manifest
+
+
+def load_manifest() -> dict[str, str]:
+    """The build's manifest, parsed again only after the file changes."""
+    global _manifest
+    try:
+        stamp = (MANIFEST_PATH, MANIFEST_PATH.stat().st_mtime_ns)
+    except FileNotFoundError:
+        return {}
+    if _manifest is None or _manifest[0] != stamp:
+        _manifest = (stamp, json.loads(MANIFEST_PATH.read_text()))
+    return _manifest[1]
+
+
+def asset_url(path: str) -> str:
+    """URL of a static file, fingerprinted when the build has run."""
+    return STATIC_URL + load_manifest().get(path, path)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    ``StaticFiles`` that answers with a ``.br``/``.gz`` sibling when the
+    client accepts it (``FileResponse`` streams it, or hands the path to
+    servers that support sendfile), and caches hashed files immutably.
+    """
+
+    def file_response(
+        self,
+        full_path: os.PathLike | str,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        requested = Path(full_path)
+        full_path = str(full_path)
+        media_type = guess_type(full_path)[0] or "text/plain"
+        headers = {}
+
+        if requested.suffix in COMPRESSIBLE:
+            headers["Vary"] = "Accept-Encoding"
+            weights = accepted_encodings(request_headers.get("accept-encoding", ""))
+            for coding, suffix in ENCODINGS:
+                if not accepts(weights, coding):
+                    continue
+                try:
+                    stat_result = os.stat(full_path + suffix)
+                except FileNotFoundError:
+                    continue
+                full_path += suffix
+                headers["Content-Encoding"] = coding
+                break
+
+        # Not the manifest, which keeps its name across builds
+        if requested.is_relative_to(DIST_DIR) and FINGERPRINTED.search(
+            requested.name
+        ):
+            headers["Cache-Control"] = IMMUTABLE
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            stat_result=stat_result,
+            media_type=media_type,
+            headers=headers,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+if __name__ == "__main__":
+    for source, target in build().items():
+        print(f"{source} -> {target}")
@@ -0,0 +1,103 @@
+"""Per-process cache of authenticated principals.
+
+Provides:
+* ``principal_cache`` – bounded LRU of ``Principal`` by user id, each entry
+  kept for ``PRINCIPAL_CACHE_TTL_SECONDS``;
+* ``invalidate_principal`` – evicts a user here and, through Redis pub/sub,
+  in every other worker (called by ``UserService`` after a user changes);
+* ``listen_for_invalidations`` – subscriber loop started from the app
+  lifespan.
+
+Only active principals are cached. If the subscriber loses Redis the local
+cache is cleared on reconnect, and the TTL bounds how long a missed
+eviction can keep a stale principal alive.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from src.auth.models import Principal
+from src.core.config import security_settings
+from src.database.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+PRINCIPAL_CHANNEL = "auth:principal:invalidate"
+RECONNECT_DELAY = 1.0
+
+
+class PrincipalCache:
+    """LRU of principals whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[UUID, tuple[float, Principal]] = OrderedDict()
+
+    def get(self, user_id: UUID) -> Principal | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires, principal = entry
+        if expires <= time.monotonic():
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return principal
+
+    def put(self, principal: Principal) -> None:
+        if self.ttl <= 0:
+            return
+        self._entries[principal.id] = (time.monotonic() + self.ttl, principal)
+        self._entries.move_to_end(principal.id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, user_id: UUID) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    maxsize=security_settings.PRINCIPAL_CACHE_SIZE,
+    ttl=security_settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+async def invalidate_principal(user_id: UUID) -> None:
+    """Evict ``user_id`` from this worker's cache and broadcast the eviction."""
+    principal_cache.discard(user_id)
+    try:
+        await get_redis_client().publish(PRINCIPAL_CHANNEL, str(user_id))
+    except RedisError:
+        # Other workers drop the entry when its TTL runs out
+        log.exception(f"Failed to broadcast principal eviction for {user_id}")
+
+
+async def listen_for_invalidations() -> None:
+    """Apply evictions published by other workers until cancelled."""
+    while True:
+        pubsub = get_redis_client().pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(PRINCIPAL_CHANNEL)
+            # Evictions sent while we were not subscribed are lost
+            principal_cache.clear()
+            async for message in pubsub.listen():
+                try:
+                    principal_cache.discard(UUID(message["data"]))
+                except ValueError:
+                    log.warning(f"Ignoring malformed eviction {message['data']!r}")
+        except RedisError:
+            log.exception("Principal eviction subscriber lost Redis, reconnecting")
+            await asyncio.sleep(RECONNECT_DELAY)
+        finally:
+            await pubsub.aclose()
@@ -0,0 +1,101 @@
+"""
+Command line Argon2 calibration, for tuning password hashing per host.
+
+    python -m src.auth.cli calibrate --target-ms 250 --write .env
+
+Finds the most expensive Argon2id parameters whose verify time on this
+machine stays within the target: memory first (up to ``--max-memory-mib``),
+then passes. Prints them as ``ARGON2_*`` settings and, with ``--write``,
+updates the env file. Existing hashes are upgraded on their owners' next
+login. Imports no application settings, so it runs before ``.env`` exists.
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from argon2 import PasswordHasher
+
+SAMPLE_PASSWORD = "calibration-Pa$$w0rd"
+# OWASP's floor for Argon2id memory; below it, raise the target instead
+MIN_MEMORY_KIB = 19 * 1024
+
+
+def measure(time_cost: int, memory_cost: int, parallelism: int, rounds: int) -> float:
+    """Median seconds one verify takes with these parameters."""
+    hasher = PasswordHasher(
+        time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+    )
+    password_hash = hasher.hash(SAMPLE_PASSWORD)
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        hasher.verify(password_hash, SAMPLE_PASSWORD)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def calibrate(
+    target: float, max_memory_kib: int, parallelism: int, rounds: int
+) -> dict[str, int]:
+    memory_cost = max(max_memory_kib, MIN_MEMORY_KIB)
+    while (
+        memory_cost // 2 >= MIN_MEMORY_KIB
+        and measure(1, memory_cost, parallelism, rounds) > target
+    ):
+        memory_cost //= 2
+    time_cost = 1
+    while measure(time_cost + 1, memory_cost, parallelism, rounds) <= target:
+        time_cost += 1
+    return {
+        "ARGON2_TIME_COST": time_cost,
+        "ARGON2_MEMORY_COST": memory_cost,
+        "ARGON2_PARALLELISM": parallelism,
+    }
+
+
+def write_env(path: Path, values: dict[str, int]) -> None:
+    """Set ``values`` in an env file, replacing existing assignments."""
+    lines = path.read_text().splitlines() if path.exists() else []
+    remaining = dict(values)
+    for index, line in enumerate(lines):
+        key = line.partition("=")[0].strip()
+        if key in remaining:
+            lines[index] = f"{key}={remaining.pop(key)}"
+    lines.extend(f"{key}={value}" for key, value in remaining.items())
+    path.write_text("\n".join(lines) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Auth maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    calibrator = commands.add_parser(
+        "calibrate", help="Tune Argon2 cost for a target verify time"
+    )
+    calibrator.add_argument("--target-ms", type=float, default=250)
+    calibrator.add_argument("--max-memory-mib", type=int, default=256)
+    calibrator.add_argument("--parallelism", type=int, default=4)
+    calibrator.add_argument("--rounds", type=int, default=5)
+    calibrator.add_argument("--write", type=Path, help="Env file to update")
+
+    args = parser.parse_args()
+    values = calibrate(
+        args.target_ms / 1000, args.max_memory_mib * 1024, args.parallelism, args.rounds
+    )
+    verify_ms = measure(
+        values["ARGON2_TIME_COST"],
+        values["ARGON2_MEMORY_COST"],
+        args.parallelism,
+        args.rounds,
+    )
+    for key, value in values.items():
+        print(f"{key}={value}")
+    print(f"# verify takes {verify_ms * 1000:.0f} ms on this host")
+    if args.write:
+        write_env(args.write, values)
+
+
+if __name__ == "__main__":
+    main()
@@ -91,9 +91,8 @@ async def logout(
     if access_token:
         # Decode the token to get the JTI (JWT ID) for blacklisting
         payload = decode_access_token(access_token)
-        # if payload and payload["jti"]:
-        if payload and getattr(payload, "jti", None):
-            await add_jti_to_blacklist(payload["jti"])
+        if payload and payload.get("jti"):
+            await add_jti_to_blacklist(payload["jti"], expires_at=payload.get("exp"))
 
     # Return 204 No Content
     response.status_code = status.HTTP_204_NO_CONTENT
@@ -3,7 +3,7 @@ from uuid import UUID
 from pydantic import EmailStr, Field
 from sqlmodel import SQLModel
 
-from src.entities.user import Role
+from src.entities.user import Role, User
 
 
 class UserCreate(SQLModel):
@@ -23,3 +23,20 @@ class Token(SQLModel):
 class TokenPayload(SQLModel):
     user_id: str | None = None
     jti: str | None = None
+
+
+class Principal(SQLModel):
+    """
+    The authenticated caller - only the columns authorization needs,
+    loaded without touching the user's todos.
+    """
+
+    id: UUID
+    email: EmailStr
+    role: "Role"
+    is_active: bool
+    email_verified: bool
+
+    @classmethod
+    def columns(cls) -> tuple:
+        return tuple(getattr(User, name) for name in cls.model_fields)
@@ -0,0 +1,51 @@
+"""
+Background password rehashing.
+
+When a login verifies a hash made with older Argon2 parameters, the new hash
+is computed on the password hashing pool and stored after the response has
+gone out. The update only applies while the stored hash is still the one
+that was verified, so a password change in the meantime wins. One rehash
+runs per user at a time; a failed one is retried on the next login.
+"""
+
+import asyncio
+import logging
+from uuid import UUID
+
+from sqlalchemy import update as sa_update
+
+from src.core.security import password_hashing
+from src.database.db import async_session_factory
+from src.entities.user import User
+
+log = logging.getLogger(__name__)
+
+_pending: dict[UUID, asyncio.Task] = {}
+
+
+def schedule_rehash(user_id: UUID, password_hash: str, password: str) -> None:
+    if user_id in _pending:
+        return
+    task = asyncio.create_task(_rehash(user_id, password_hash, password))
+    _pending[user_id] = task
+    task.add_done_callback(lambda _: _pending.pop(user_id, None))
+
+
+async def _rehash(user_id: UUID, password_hash: str, password: str) -> None:
+    try:
+        new_hash = await password_hashing.hash(password)
+        async with async_session_factory() as session:
+            await session.exec(
+                sa_update(User)
+                .where(User.id == user_id, User.password_hash == password_hash)
+                .values(password_hash=new_hash)
+            )
+            await session.commit()
+    except Exception:
+        log.exception("Rehashing the password of user %s failed", user_id)
+
+
+async def drain(timeout: float = 5.0) -> None:
+    """Wait briefly for scheduled rehashes, e.g. before shutdown."""
+    if _pending:
+        await asyncio.wait(list(_pending.values()), timeout=timeout)
@@ -12,6 +12,7 @@ from src.auth.exceptions import (
     UserAlreadyExistsError,
 )
 from src.auth.models import UserCreate
+from src.auth.rehash import schedule_rehash
 from src.core import security
 from src.core.config import app_settings
 from src.database.db import DBSession
@@ -57,7 +58,7 @@ class AuthService:
 
         user = User(
             **credentials.model_dump(exclude=["password"]),
-            password_hash=security.hash_password(credentials.password),
+            password_hash=await security.password_hashing.hash(credentials.password),
             email_verified=False,  # Require email verification
         )
 
@@ -87,16 +88,17 @@ class AuthService:
     ):
         user = await user_service._get_user_by_email(email)
 
-        if not user or not security.verify_password(password, user.password_hash):
+        if not user or not await security.password_hashing.verify(
+            password, user.password_hash
+        ):
             print(user)
             logging.warning(f"Failed authentication attempt for email: {email}")
             raise InvalidCredentialsError()
 
-        # Check if the hash needs an upgrade (re-hashing)
+        # Hashes made with older Argon2 parameters are upgraded after the
+        # response, so a cost change never slows the login itself
         if security.password_context.check_needs_rehash(user.password_hash):
-            new_hash = security.password_context.hash(password)
-            user.password_hash = new_hash
-            await self.session.commit()
+            schedule_rehash(user.id, user.password_hash, password)
 
         return user
 
@@ -0,0 +1,115 @@
+"""
+Rows/sec of the todo list read path.
+
+Compares, for one owner and full pages of ``--rows`` todos:
+
+* orm  - ``select(Todo)`` hydration, ``TodoRead`` validation per row and
+         FastAPI-style response_model validation + ``jsonable_encoder``;
+* core - Core select of the ``TodoRead`` columns returning row mappings,
+         dumped to JSON bytes by ``todo_page_serializer``.
+
+Runs against an in-memory SQLite database unless ``--url`` points at a
+migrated Postgres:
+
+    python -m src.benchmarks.list_read_path --rows 1000 --rounds 50
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.repositories.base import BaseRepository
+from src.core.repositories.todo import TodoRepository
+from src.entities.todo import Todo
+from src.entities.user import User
+from src.todos.models import TodoPage, TodoRead, todo_page_serializer
+
+
+async def seed(session: AsyncSession, rows: int) -> User:
+    user = User(
+        id=uuid4(),
+        email=f"bench_{uuid4().hex}@example.com",
+        username=f"bench_{uuid4().hex}",
+        password_hash="-",
+        first_name="Bench",
+        last_name="Mark",
+    )
+    session.add(user)
+    start = datetime.now()
+    session.add_all(
+        Todo(
+            title=f"Benchmark todo {i}",
+            description="Seeded row for the list read path benchmark",
+            priority=i % 4,
+            created_at=start + timedelta(microseconds=i),
+            owner_id=user.id,
+        )
+        for i in range(rows)
+    )
+    await session.commit()
+    return user
+
+
+async def orm_page(session: AsyncSession, owner_id, rows: int) -> bytes:
+    todos, _, _ = await BaseRepository(session, Todo).keyset(
+        sort_column=Todo.created_at,
+        limit=rows,
+        where=(Todo.owner_id == owner_id,),
+    )
+    page = TodoPage(items=[TodoRead.model_validate(todo) for todo in todos])
+    return json.dumps(jsonable_encoder(TodoPage.model_validate(page))).encode()
+
+
+async def core_page(session: AsyncSession, owner_id, rows: int) -> bytes:
+    page = await TodoRepository(session).get_all(owner_id=owner_id, limit=rows)
+    return todo_page_serializer.dump_json(page)
+
+
+async def run(url: str, rows: int, rounds: int) -> None:
+    engine = create_async_engine(url)
+    if url.startswith("sqlite"):
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with session_factory() as session:
+        user = await seed(session, rows)
+
+    for name, read_page in (("orm", orm_page), ("core", core_page)):
+        async with session_factory() as session:
+            await read_page(session, user.id, rows)  # warm-up
+            started = time.perf_counter()
+            for _ in range(rounds):
+                await read_page(session, user.id, rows)
+                # Empty the identity map so ORM rows are rehydrated each
+                # round, as they are for every real request's new session
+                session.expunge_all()
+            elapsed = time.perf_counter() - started
+        print(
+            f"{name:>4}: {rows * rounds / elapsed:>10,.0f} rows/s "
+            f"({elapsed / rounds * 1000:.2f} ms per {rows}-row page)"
+        )
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.rows, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,26 +4,29 @@ from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from jose import JWTError
 from redis.asyncio import Redis
+from sqlmodel import select
 
+from src.auth.cache import principal_cache
+from src.auth.models import Principal
 from src.auth.service import AuthService
 from src.core import security
 from src.core.repositories.todo import TodoRepository
-from src.database.db import DBSession
+from src.database.db import DBSession, ReadDBSession
 from src.database.redis import get_redis
-from src.entities.user import User
+from src.entities.user import Role, User
 from src.todos.service import TodoService
 from src.users.service import UserService
 
 
-def get_user_service(session: DBSession):
-    return UserService(session=session)
+def get_user_service(session: DBSession, read_session: ReadDBSession):
+    return UserService(session=session, read_session=read_session)
 
 
 UserServiceDep = Annotated[UserService, Depends(get_user_service)]
 
 
-def get_todo_repo(session: DBSession) -> TodoRepository:
-    return TodoRepository(session=session)
+def get_todo_repo(session: DBSession, read_session: ReadDBSession) -> TodoRepository:
+    return TodoRepository(session=session, read_session=read_session)
 
 
 def get_todo_service(
@@ -44,13 +47,11 @@ AuthServiceDep = Annotated[AuthService, Depends(get_auth_service)]
 
 async def get_current_user(
     token: Annotated[dict, Depends(security.verify_access_token)],
-    session: DBSession,
-):
+    session: ReadDBSession,
+) -> Principal:
     try:
         # Cast the string ID to a UUID object
         user_id = UUID(token["user"]["user_id"])
-
-        return await session.get(User, user_id)
     except (ValueError, TypeError):
         # Handles cases where the ID in the token is not a valid UUID
         raise HTTPException(
@@ -65,8 +66,38 @@ async def get_current_user(
             detail="Could not validate user.",
         )
 
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    # Load only the principal's columns - never the user's todos
+    result = await session.exec(
+        select(*Principal.columns()).where(User.id == user_id)
+    )
+    row = result.first()
+    if row is None or not row.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate user.",
+        )
+    principal = Principal.model_validate(row, from_attributes=True)
+    principal_cache.put(principal)
+    return principal
+
+
+UserDep = Annotated[Principal, Depends(get_current_user)]
+
+
+async def get_current_admin(principal: UserDep) -> Principal:
+    if principal.role != Role.Admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required.",
+        )
+    return principal
+
 
-UserDep = Annotated[User, Depends(get_current_user)]
+AdminDep = Annotated[Principal, Depends(get_current_admin)]
 
 
 async def get_redis_dependency() -> AsyncGenerator[Redis, None]:
@@ -0,0 +1,44 @@
+"""Entity tags for conditional requests.
+
+Tags are weak (``W/"..."``) and built from version counters rather than a
+hash of the body, so they can be checked before the resource is loaded.
+"""
+
+from typing import Optional
+
+ANY = "*"
+
+
+def weak_etag(*parts) -> str:
+    return 'W/"' + ".".join(str(part) for part in parts) + '"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    return tag.strip('"')
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header."""
+    if not header:
+        return False
+    if header.strip() == ANY:
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(",")}
+
+
+def if_match_version(header: Optional[str]) -> Optional[int]:
+    """
+    The version an ``If-Match`` header asks a write to apply to; ``None``
+    when there is no precondition. Tags are compared weakly, like
+    ``If-None-Match``. Raises ``ValueError`` for a tag this API never issued.
+    """
+    if not header or header.strip() == ANY:
+        return None
+    tags = header.split(",")
+    if len(tags) != 1:
+        raise ValueError("If-Match must carry a single entity tag")
+    version, _, _ = _opaque(tags[0]).partition(".")
+    return int(version)
@@ -0,0 +1,40 @@
+"""
+Primary key generation.
+
+Keys are UUIDv7 (RFC 9562): a 48-bit millisecond Unix timestamp followed by
+random bits. New rows therefore land on the right-hand edge of the primary
+key B-tree instead of on random leaf pages, and ``id`` sorts in creation
+order, which keeps ``(created_at, id)`` keyset ties in insertion order.
+"""
+
+import os
+import time
+from uuid import UUID
+
+try:
+    from uuid import uuid7
+except ImportError:  # Python < 3.14
+    _last_ms = 0
+    _last_rand = 0
+
+    def uuid7() -> UUID:
+        """
+        48-bit ms timestamp, then 74 random bits around the version and
+        variant. Within one millisecond the random part is incremented
+        instead, so ids from one process stay strictly increasing, as with
+        the standard library implementation.
+        """
+        global _last_ms, _last_rand
+        timestamp_ms = time.time_ns() // 1_000_000
+        if timestamp_ms <= _last_ms:
+            timestamp_ms, rand = _last_ms, _last_rand + 1
+        else:
+            rand = int.from_bytes(os.urandom(10), "big") >> 6
+        _last_ms, _last_rand = timestamp_ms, rand
+        return UUID(
+            int=(timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+            | 0x7 << 76
+            | (rand >> 62 & 0xFFF) << 64
+            | 0x2 << 62
+            | rand & (1 << 62) - 1
+        )
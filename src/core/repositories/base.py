@@ -1,26 +1,72 @@
-from typing import Any, Generic, Literal, Optional, Type, TypeVar
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from typing import Any, Generic, Literal, Optional, Sequence, Type, TypeVar
 from uuid import UUID
 
 from fastapi import Query
+from pydantic import ValidationError
+from sqlalchemy import delete as sa_delete
+from sqlalchemy import literal, tuple_
+from sqlalchemy import update as sa_update
 from sqlmodel import SQLModel, select
 
 from src.database.db import DBSession
+from src.exceptions import InvalidCursorError
 
 ModelType = TypeVar("ModelType", bound=SQLModel)
 
+MAX_PAGE_SIZE = 100
+
 
 class PaginationParams(SQLModel):
-    offset: int = 1
-    limit: int = Query(default=10, le=10)
-    order_by: Literal["asc", "decs"] = "asc"
+    offset: int = 0
+    limit: int = Query(default=10, ge=1, le=MAX_PAGE_SIZE)
+    order_by: Literal["asc", "desc", "decs"] = "asc"
+    cursor: Optional[str] = None
 
 
 def get_pagination_params(
-    offset: int = 1,
-    limit: int = Query(default=10, le=10),
-    order_by: Literal["asc", "decs"] = "asc",
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=10, ge=1, le=MAX_PAGE_SIZE),
+    order_by: Literal["asc", "desc", "decs"] = "asc",
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor taken from `next_cursor`/`prev_cursor`.",
+    ),
 ):
-    return PaginationParams(offset=offset, limit=limit, order_by=order_by)
+    return PaginationParams(
+        offset=offset, limit=limit, order_by=order_by, cursor=cursor
+    )
+
+
+class Cursor(SQLModel):
+    """
+    Keyset position: the sort key and primary key of the row a page ended on.
+    ``reverse`` marks a cursor that pages backwards from that row. The key is
+    a timestamp or priority for list pages and a relevance score for search
+    pages.
+    """
+
+    key: datetime | int | float
+    id: UUID
+    reverse: bool = False
+
+    def encode(self) -> str:
+        raw = self.model_dump_json().encode()
+        return urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    @classmethod
+    def decode(cls, token: str, key_type: type = datetime) -> "Cursor":
+        try:
+            raw = urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            cursor = cls.model_validate_json(raw)
+        except (binascii.Error, ValueError, ValidationError):
+            raise InvalidCursorError()
+        # A cursor from one listing must not be replayed against another
+        if not isinstance(cursor.key, key_type):
+            raise InvalidCursorError()
+        return cursor
 
 
 class BaseRepository(Generic[ModelType]):
@@ -28,8 +74,8 @@ class BaseRepository(Generic[ModelType]):
         self.session = session
         self.model: Type[ModelType] = model
 
-    async def get(self, pk: UUID) -> Optional[ModelType]:
-        statement = select(self.model).where(self.model.id == pk)
+    async def get(self, pk: UUID, where: Sequence[Any] = ()) -> Optional[ModelType]:
+        statement = select(self.model).where(self.model.id == pk, *where)
         obj = await self.session.exec(statement=statement)
         return obj.unique().first()
 
@@ -52,6 +98,76 @@ class BaseRepository(Generic[ModelType]):
             results = await self.session.exec(statement=statement)
             return results.unique().all()
 
+    async def keyset(
+        self,
+        sort_column: Any,
+        limit: int = 10,
+        descending: bool = False,
+        cursor: Optional[Cursor] = None,
+        offset: int = 0,
+        where: Sequence[Any] = (),
+        columns: Optional[Sequence[Any]] = None,
+    ) -> tuple[Sequence[Any], Optional[Cursor], Optional[Cursor]]:
+        """
+        Seek-method pagination on ``(sort_column, id)``. ``sort_column`` may
+        be a mapped column or any SQL expression (e.g. a search rank).
+
+        With ``columns`` the page is a plain Core select of those columns and
+        the items are dicts rather than ORM instances: no identity map, no
+        relationship loading. ``columns`` must include the primary key.
+
+        Instead of skipping ``offset`` rows the query starts right after the
+        cursor row, so every page is a bounded index range scan no matter how
+        deep it is. ``offset`` is only honoured on the first page. ``where``
+        should pin the leading columns of the supporting index (e.g. the owner).
+
+        Returns the rows plus the cursors for the next and previous pages.
+        """
+        backward = cursor is not None and cursor.reverse
+        # Walking backwards means reading the index in the opposite direction
+        scan_desc = descending != backward
+        key = tuple_(sort_column, self.model.id)
+
+        entities = columns if columns is not None else (self.model,)
+        statement = select(*entities, sort_column.label("_sort_key")).where(*where)
+        if cursor is not None:
+            bound = tuple_(literal(cursor.key, sort_column.type), cursor.id)
+            statement = statement.where(key < bound if scan_desc else key > bound)
+        elif offset:
+            statement = statement.offset(offset)
+
+        if scan_desc:
+            statement = statement.order_by(sort_column.desc(), self.model.id.desc())
+        else:
+            statement = statement.order_by(sort_column.asc(), self.model.id.asc())
+
+        # Fetch one extra row to learn whether another page exists
+        results = await self.session.exec(statement.limit(limit + 1))
+        rows = list(results.all())
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backward:
+            rows.reverse()
+
+        if not rows:
+            return [], None, None
+
+        has_next = has_more if not backward else True
+        has_prev = has_more if backward else (cursor is not None or offset > 0)
+
+        if columns is None:
+            items = [row[0] for row in rows]
+            first_id, last_id = items[0].id, items[-1].id
+        else:
+            items = [dict(zip(row._fields[:-1], row[:-1])) for row in rows]
+            first_id, last_id = items[0]["id"], items[-1]["id"]
+
+        next_cursor = Cursor(key=rows[-1][-1], id=last_id) if has_next else None
+        prev_cursor = (
+            Cursor(key=rows[0][-1], id=first_id, reverse=True) if has_prev else None
+        )
+        return items, next_cursor, prev_cursor
+
     async def create(self, obj: ModelType) -> ModelType:
         db_obj = self.model(**obj.model_dump())
         self.session.add(db_obj)
@@ -59,25 +175,48 @@ class BaseRepository(Generic[ModelType]):
         await self.session.refresh(db_obj)
         return db_obj
 
-    async def delete(self, pk: UUID) -> UUID:
-        instance = await self.get(pk=pk)
-        await self.session.delete(instance)
+    async def delete(self, pk: UUID, where: Sequence[Any] = ()) -> Optional[UUID]:
+        """Single ``DELETE ... RETURNING id``; ``None`` when no row matched."""
+        statement = (
+            sa_delete(self.model)
+            .where(self.model.id == pk, *where)
+            .returning(self.model.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.exec(statement)
+        deleted = result.scalar_one_or_none()
         await self.session.commit()
-        return pk
+        return deleted
 
     async def update(
         self,
         obj_id: UUID,
         obj: ModelType | dict,
+        where: Sequence[Any] = (),
     ) -> Optional[ModelType]:
-        instance = await self.get(pk=obj_id)
-
-        obj_data = obj.model_dump(exclude_unset=True)
-        instance.sqlmodel_update(obj_data)
-
-        self.session.add(instance)
+        """
+        Single ``UPDATE ... RETURNING`` of the fields set on ``obj``.
+        Returns ``None`` when no row matched ``id`` and ``where``. Models with
+        a ``version`` column get it incremented, so a caller can make the
+        update conditional by putting the expected version in ``where``.
+        """
+        values = obj if isinstance(obj, dict) else obj.model_dump(exclude_unset=True)
+        if not values:
+            return await self.get(pk=obj_id, where=where)
+        version = getattr(self.model, "version", None)
+        if version is not None:
+            values = {**values, "version": version + 1}
+
+        statement = (
+            sa_update(self.model)
+            .where(self.model.id == obj_id, *where)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.exec(statement)
+        instance = result.scalars().unique().one_or_none()
         await self.session.commit()
-        await self.session.refresh(instance)
 
         return instance
 
@@ -85,11 +224,6 @@ class BaseRepository(Generic[ModelType]):
         self,
         obj_id: UUID,
         obj: ModelType | dict,
+        where: Sequence[Any] = (),
     ) -> Optional[ModelType]:
-        instance = await self.get(pk=obj_id)
-        instance.sqlmodel_update(obj)
-        self.session.add(instance)
-        await self.session.commit()
-        await self.session.refresh(instance)
-
-        return instance
+        return await self.update(obj_id=obj_id, obj=obj, where=where)
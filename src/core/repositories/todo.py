@@ -1,28 +1,484 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
 from uuid import UUID
-from sqlmodel import asc, desc
 
-from src.core.repositories.base import BaseRepository
-from src.entities.todo import Todo
-from src.todos.models import TodoCreate, TodoDelete, TodoRead, TodoUpdate, TodoPatch
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+
+from src.core.config import database_settings
+from src.core.ids import uuid7
+from src.core.repositories.base import BaseRepository, Cursor
+from src.entities.todo import (
+    SEARCH_CONFIG,
+    SEARCH_VECTOR_COLUMN,
+    Priority,
+    Todo,
+    TodoArchive,
+    TodoListVersion,
+    TodoStats,
+    search_vector,
+)
+from src.todos.exceptions import (
+    TodoBulkConflictError,
+    TodoNotFoundError,
+    TodoVersionMismatchError,
+)
+from src.todos.models import (
+    MAX_IMPORT_ERRORS,
+    BulkStatus,
+    TodoBulkItemResult,
+    TodoBulkUpdateItem,
+    TodoCreate,
+    TodoDelete,
+    TodoFilterParams,
+    TodoPage,
+    TodoPatch,
+    TodoPriorityCount,
+    TodoRead,
+    TodoRowPage,
+    TodoSortKey,
+    TodoStatsRead,
+    TodoUpdate,
+)
+
+
+# Rows per UPDATE ... FROM (VALUES ...) statement, well under the
+# 32767 bind parameters Postgres accepts per statement
+BULK_UPDATE_CHUNK = 1000
+
+_BULK_UPDATE_FIELDS = ("title", "description", "priority", "is_completed")
+
+# Columns of TodoRead, selected directly by the list fast path
+_READ_COLUMNS = tuple(getattr(Todo, name) for name in TodoRead.model_fields)
+
+# Rows fetched per round trip from the server-side export cursor
+EXPORT_CHUNK = 1000
+
+# Connection-local staging table for COPY imports. It is emptied on commit
+# rather than dropped so its OID - and asyncpg's cached COPY statements for
+# it - stay valid for the next import on the same pooled connection
+IMPORT_STAGING_TABLE = "todo_import_staging"
+_IMPORT_COLUMNS = (
+    "line", "id", "title", "description", "is_completed", "priority", "created_at"
+)
+_CREATE_IMPORT_STAGING = sa.text(
+    f"""
+    CREATE TEMPORARY TABLE IF NOT EXISTS {IMPORT_STAGING_TABLE} (
+        line integer NOT NULL,
+        id uuid NOT NULL,
+        title text NOT NULL,
+        description text NOT NULL,
+        is_completed boolean NOT NULL,
+        priority text NOT NULL,
+        created_at timestamp NOT NULL
+    ) ON COMMIT DELETE ROWS
+    """
+)
+# Rows are merged in file order, so the first of several rows sharing a
+# title wins and the rest are conflicts, as are titles the owner already has.
+# Run on the asyncpg connection directly, which takes a per-call timeout
+_MERGE_IMPORT_STAGING = f"""
+    INSERT INTO todos
+        (id, title, description, is_completed, priority, created_at,
+         completed_at, owner_id)
+    SELECT id, title, description, is_completed, priority::priority,
+           created_at, CASE WHEN is_completed THEN created_at END, $1
+    FROM {IMPORT_STAGING_TABLE}
+    ORDER BY line
+    ON CONFLICT (owner_id, title) DO NOTHING
+"""
+_IMPORT_CONFLICT_LINES = f"""
+    SELECT s.line FROM {IMPORT_STAGING_TABLE} AS s
+    WHERE NOT EXISTS (SELECT 1 FROM todos AS t WHERE t.id = s.id)
+    ORDER BY s.line
+    LIMIT $1
+"""
+# Transaction-scoped, like SET LOCAL, so the pooled connection keeps the
+# engine's statement_timeout afterwards
+_SET_IMPORT_TIMEOUT = sa.text(
+    "SELECT set_config('statement_timeout', :timeout, true)"
+)
+
+# List sort keys: the attribute seeked on and the cursor key type it produces
+_SORT_KEYS = {
+    TodoSortKey.CreatedAt: ("created_at", datetime),
+    TodoSortKey.Priority: ("priority", int),
+}
+
+_TODO_COLUMNS = tuple(column.name for column in Todo.__table__.columns)
+
+
+def _completed_at(is_completed: Any, now: datetime) -> sa.ColumnElement:
+    """
+    ``completed_at`` for a write of ``is_completed`` (a value or column, where
+    NULL keeps the stored state): stamped with ``now`` when a todo becomes
+    completed, kept while it stays completed, cleared when it is reopened.
+    """
+    if not isinstance(is_completed, sa.ColumnElement):
+        is_completed = sa.literal(is_completed, sa.Boolean)
+    return sa.case(
+        (
+            sa.or_(is_completed.is_(None), is_completed == Todo.is_completed),
+            Todo.completed_at,
+        ),
+        (is_completed, now),
+        else_=None,
+    )
+
+
+def _with_completed_at(payload: TodoUpdate | TodoPatch) -> dict:
+    """The fields set on ``payload``, plus ``completed_at`` if it sets status."""
+    values = payload.model_dump(exclude_unset=True)
+    if values.get("is_completed") is not None:
+        values["completed_at"] = _completed_at(values["is_completed"], datetime.now())
+    return values
 
 
 class TodoRepository:
-    def __init__(self, session):
+    """
+    Todo persistence. Every query is scoped to ``owner_id`` at the SQL level
+    so it is served by the owner-leading composite indexes.
+    """
+
+    def __init__(self, session, read_session=None):
         self.repository = BaseRepository(session=session, model=Todo)
+        # Read-only lookups may be served by a replica
+        self.reader = BaseRepository(session=read_session or session, model=Todo)
+
+    @staticmethod
+    def _owned_by(owner_id: UUID, model=Todo) -> tuple:
+        return (model.owner_id == owner_id,)
+
+    def _matching(self, owner_id: UUID, version: Optional[int]) -> tuple:
+        """Owner scope, plus the expected version for conditional writes."""
+        clauses = self._owned_by(owner_id)
+        if version is not None:
+            clauses += (Todo.version == version,)
+        return clauses
+
+    async def _not_matched(
+        self, todo_id: UUID, owner_id: UUID, version: Optional[int]
+    ) -> Exception:
+        """Why a conditional write matched no row: stale version or no todo."""
+        if version is not None and await self.repository.get(
+            pk=todo_id, where=self._owned_by(owner_id)
+        ):
+            return TodoVersionMismatchError(todo_id=todo_id)
+        return TodoNotFoundError(todo_id=todo_id)
+
+    @staticmethod
+    def _filtered(filters: TodoFilterParams, model=Todo) -> tuple:
+        """
+        WHERE clauses for the list filters. ``is_completed = false`` is spelled
+        as an equality so the planner can match the open-todo partial indexes.
+        """
+        clauses = []
+        if filters.is_completed is not None:
+            clauses.append(model.is_completed == filters.is_completed)
+        if filters.priority:
+            priorities = set(filters.priority)
+            clauses.append(
+                model.priority == priorities.pop()
+                if len(priorities) == 1
+                else model.priority.in_(sorted(priorities))
+            )
+        if filters.created_after is not None:
+            clauses.append(model.created_at >= filters.created_after)
+        if filters.created_before is not None:
+            clauses.append(model.created_at < filters.created_before)
+        return tuple(clauses)
+
+    def _with_archive(self, with_search: bool = False):
+        """
+        ``Todo`` aliased to ``todos UNION ALL todos_archive``. Owner, filter
+        and keyset predicates are pushed into both branches by the planner,
+        so each side is still read through its own owner-leading index. The
+        archive is only touched by callers that ask for it.
+        """
+        branches = []
+        for model in (Todo, TodoArchive):
+            columns = [model.__table__.c[name] for name in _TODO_COLUMNS]
+            if with_search:
+                columns.append(
+                    sa.literal_column(
+                        f"{model.__tablename__}.{SEARCH_VECTOR_COLUMN}",
+                        postgresql.TSVECTOR,
+                    ).label(SEARCH_VECTOR_COLUMN)
+                )
+            branches.append(sa.select(*columns))
+        union = sa.union_all(*branches).subquery("todos_all")
+        return aliased(Todo, union), union
+
+    def _source(self, include_archived: bool, with_search: bool = False):
+        """Model and reader for hot rows only, or hot plus archived rows."""
+        if not include_archived:
+            return Todo, self.reader, search_vector
+        model, union = self._with_archive(with_search)
+        reader = BaseRepository(session=self.reader.session, model=model)
+        vector = union.c[SEARCH_VECTOR_COLUMN] if with_search else None
+        return model, reader, vector
 
     async def get_all(
-        self, limit: int = 10, offset: int = 0, order_by: str = "asc"
-    ) -> list[TodoRead]:
-        return await self.repository.list(
+        self,
+        owner_id: UUID,
+        limit: int = 10,
+        offset: int = 0,
+        order_by: str = "asc",
+        cursor: Optional[str] = None,
+        filters: Optional[TodoFilterParams] = None,
+        include_archived: bool = False,
+    ) -> TodoRowPage:
+        """
+        Filtered keyset page ordered by ``(created_at, id)`` or
+        ``(priority, id)``. Returns plain row mappings of the ``TodoRead``
+        columns, ready for ``todo_page_serializer``.
+        """
+        filters = filters or TodoFilterParams()
+        model, reader, _ = self._source(include_archived)
+        sort_name, key_type = _SORT_KEYS[filters.sort_by]
+        position = Cursor.decode(cursor, key_type=key_type) if cursor else None
+        if position is not None and key_type is int:
+            # Bound against the enum column by member, not by raw integer
+            position.key = Priority(position.key)
+        rows, next_cursor, prev_cursor = await reader.keyset(
+            sort_column=getattr(model, sort_name),
+            limit=limit,
+            descending=order_by != "asc",
+            cursor=position,
             offset=offset,
+            where=(*self._owned_by(owner_id, model), *self._filtered(filters, model)),
+            columns=tuple(getattr(model, name) for name in TodoRead.model_fields),
+        )
+        return TodoRowPage(
+            items=rows,
+            next_cursor=next_cursor.encode() if next_cursor else None,
+            prev_cursor=prev_cursor.encode() if prev_cursor else None,
+        )
+
+    async def export(self, owner_id: UUID) -> AsyncIterator[list[dict]]:
+        """
+        Every todo of the owner as chunks of ``TodoRead`` row mappings, read
+        through a server-side cursor so memory stays flat for any row count.
+        Chunks are only fetched as fast as the caller consumes them.
+        """
+        statement = (
+            sa.select(*_READ_COLUMNS)
+            .where(*self._owned_by(owner_id))
+            .order_by(Todo.created_at, Todo.id)
+            .execution_options(yield_per=EXPORT_CHUNK)
+        )
+        result = await self.reader.session.stream(statement)
+        try:
+            async for rows in result.partitions():
+                yield [row._asdict() for row in rows]
+        finally:
+            # Release the cursor if the client goes away mid-stream
+            await result.close()
+
+    async def copy_import(
+        self,
+        batches: AsyncIterator[list[tuple[int, TodoCreate]]],
+        owner_id: UUID,
+        report_limit: int = MAX_IMPORT_ERRORS,
+    ) -> tuple[int, int, list[int]]:
+        """
+        Load validated ``(line, todo)`` batches with asyncpg ``COPY`` into a
+        temporary staging table, then merge them into ``todos`` with one
+        ``INSERT ... SELECT ... ON CONFLICT (owner_id, title) DO NOTHING``.
+        All of it is one transaction, with ``POSTGRES_IMPORT_TIMEOUT_MS``
+        instead of the request-sized statement timeouts.
+
+        Returns the inserted count, the conflict count and the line numbers
+        of the first ``report_limit`` conflicting rows.
+        """
+        session = self.repository.session
+        timeout_ms = database_settings.POSTGRES_IMPORT_TIMEOUT_MS
+        timeout = timeout_ms / 1000
+        driver = None
+        staged = 0
+        now = datetime.now()
+        async for batch in batches:
+            if driver is None:
+                await session.exec(
+                    _SET_IMPORT_TIMEOUT, params={"timeout": str(timeout_ms)}
+                )
+                await session.exec(_CREATE_IMPORT_STAGING)
+                connection = await session.connection()
+                raw = await connection.get_raw_connection()
+                driver = raw.driver_connection
+            await driver.copy_records_to_table(
+                IMPORT_STAGING_TABLE,
+                records=[
+                    (
+                        line,
+                        uuid7(),
+                        todo.title,
+                        todo.description,
+                        todo.is_completed,
+                        Priority(todo.priority).name,
+                        now,
+                    )
+                    for line, todo in batch
+                ],
+                columns=_IMPORT_COLUMNS,
+                timeout=timeout,
+            )
+            staged += len(batch)
+
+        if not staged:
+            return 0, 0, []
+
+        # Command status is "INSERT 0 <rows>"
+        command = await driver.execute(
+            _MERGE_IMPORT_STAGING, owner_id, timeout=timeout
+        )
+        inserted = int(command.rsplit(" ", 1)[-1])
+        conflicts = []
+        if inserted < staged:
+            rows = await driver.fetch(
+                _IMPORT_CONFLICT_LINES, report_limit, timeout=timeout
+            )
+            conflicts = [row["line"] for row in rows]
+        await session.commit()
+        return inserted, staged - inserted, conflicts
+
+    async def search(
+        self,
+        owner_id: UUID,
+        q: str,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> TodoPage:
+        """
+        Full-text search over title and description, best matches first.
+        The match and owner filter are served by the ``(owner_id,
+        search_vector)`` GIN index; pages seek on ``(rank, id)``.
+        """
+        model, reader, vector = self._source(include_archived, with_search=True)
+        query = sa.func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        rank = sa.func.ts_rank_cd(vector, query)
+        rows, next_cursor, prev_cursor = await reader.keyset(
+            sort_column=rank,
             limit=limit,
-            order_by=(asc(Todo.created_at))
-            if order_by == "asc"
-            else desc(Todo.created_at),
+            descending=True,
+            cursor=Cursor.decode(cursor, key_type=float) if cursor else None,
+            where=(*self._owned_by(owner_id, model), vector.op("@@")(query)),
+        )
+        return TodoPage(
+            items=[TodoRead.model_validate(row) for row in rows],
+            next_cursor=next_cursor.encode() if next_cursor else None,
+            prev_cursor=prev_cursor.encode() if prev_cursor else None,
         )
 
-    async def get_by_id(self, todo_id: UUID) -> TodoRead:
-        todo = await self.repository.get(pk=todo_id)
+    async def archive_completed(
+        self, cutoff: datetime, batch_size: int
+    ) -> tuple[int, set[UUID]]:
+        """
+        Move one batch of todos completed before ``cutoff`` into
+        ``todos_archive`` with a single ``DELETE ... RETURNING`` feeding an
+        ``INSERT``. ``SKIP LOCKED`` keeps the batch from waiting on rows that
+        users are editing. Returns the number of rows moved and their owners.
+        """
+        batch = (
+            sa.select(Todo.id)
+            .where(Todo.is_completed == True, Todo.completed_at < cutoff)  # noqa: E712
+            .order_by(Todo.completed_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            sa.delete(Todo)
+            .where(Todo.id.in_(batch.scalar_subquery()))
+            .returning(*(Todo.__table__.c[name] for name in _TODO_COLUMNS))
+            .cte("moved")
+        )
+        statement = (
+            sa.insert(TodoArchive)
+            .from_select(
+                _TODO_COLUMNS, sa.select(*(moved.c[name] for name in _TODO_COLUMNS))
+            )
+            .returning(TodoArchive.owner_id)
+        )
+        session = self.repository.session
+        owners = (await session.exec(statement)).scalars().all()
+        await session.commit()
+        return len(owners), set(owners)
+
+    async def stats(self, owner_id: UUID) -> TodoStatsRead:
+        """Counts by status and priority, read from ``todo_stats``."""
+        statement = sa.select(
+            TodoStats.is_completed, TodoStats.priority, TodoStats.count
+        ).where(TodoStats.owner_id == owner_id)
+        rows = (await self.reader.session.exec(statement)).all()
+
+        by_priority = {p: TodoPriorityCount(priority=p) for p in Priority}
+        for is_completed, priority, count in rows:
+            bucket = by_priority[priority]
+            if is_completed:
+                bucket.completed += count
+            else:
+                bucket.open += count
+        open_count = sum(b.open for b in by_priority.values())
+        completed = sum(b.completed for b in by_priority.values())
+        return TodoStatsRead(
+            total=open_count + completed,
+            open=open_count,
+            completed=completed,
+            by_priority=list(by_priority.values()),
+        )
+
+    async def count(
+        self,
+        owner_id: UUID,
+        filters: Optional[TodoFilterParams] = None,
+        include_archived: bool = False,
+    ) -> Optional[int]:
+        """
+        Total rows matching the list filters, summed from ``todo_stats``.
+        ``None`` when a ``created_at`` bound is set or archived rows are
+        included, which the counters cannot answer.
+        """
+        filters = filters or TodoFilterParams()
+        if filters.created_after or filters.created_before:
+            return None
+        if include_archived:
+            return None
+        statement = sa.select(
+            sa.func.coalesce(sa.func.sum(TodoStats.count), 0)
+        ).where(TodoStats.owner_id == owner_id)
+        if filters.is_completed is not None:
+            statement = statement.where(TodoStats.is_completed == filters.is_completed)
+        if filters.priority:
+            priorities = sorted(set(filters.priority))
+            statement = statement.where(TodoStats.priority.in_(priorities))
+        result = await self.reader.session.exec(statement)
+        return result.scalar_one()
+
+    async def version_of(
+        self, todo_id: UUID, owner_id: UUID
+    ) -> Optional[tuple[int, bool]]:
+        """``(version, is_completed)`` of a todo, enough to build its ETag."""
+        statement = sa.select(Todo.version, Todo.is_completed).where(
+            Todo.id == todo_id, *self._owned_by(owner_id)
+        )
+        row = (await self.reader.session.exec(statement)).first()
+        return tuple(row) if row is not None else None
+
+    async def list_version(self, owner_id: UUID) -> int:
+        """Counter bumped by every write to the owner's todos."""
+        statement = sa.select(TodoListVersion.version).where(
+            TodoListVersion.owner_id == owner_id
+        )
+        result = await self.reader.session.exec(statement)
+        return result.scalar_one_or_none() or 0
+
+    async def get_by_id(self, todo_id: UUID, owner_id: UUID) -> TodoRead:
+        todo = await self.reader.get(pk=todo_id, where=self._owned_by(owner_id))
+        if todo is None:
+            raise TodoNotFoundError(todo_id=todo_id)
         return TodoRead.model_validate(todo)
 
     async def create(self, payload: TodoCreate, owner_id: UUID) -> TodoRead:
@@ -30,21 +486,227 @@ class TodoRepository:
         new_todo = await self.repository.create(todo)
         return TodoRead.model_validate(new_todo)
 
-    async def update(self, todo_id: UUID, payload: TodoUpdate) -> TodoRead:
+    async def update(
+        self,
+        todo_id: UUID,
+        payload: TodoUpdate,
+        owner_id: UUID,
+        version: Optional[int] = None,
+    ) -> TodoRead:
         """Update todo with title, description, and/or priority - does NOT update is_completed"""
         updated = await self.repository.update(
             obj_id=todo_id,
-            obj=payload,
+            obj=_with_completed_at(payload),
+            where=self._matching(owner_id, version),
         )
+        if updated is None:
+            raise await self._not_matched(todo_id, owner_id, version)
         return TodoRead.model_validate(updated, from_attributes=True)
 
-    async def patch_todo(self, todo_id: UUID, data: TodoPatch) -> TodoRead:
+    async def patch_todo(
+        self,
+        todo_id: UUID,
+        data: TodoPatch,
+        owner_id: UUID,
+        version: Optional[int] = None,
+    ) -> TodoRead:
         """Partial update - ONLY for toggling is_completed status"""
-        return await self.repository.patch(todo_id, data)
+        patched = await self.repository.patch(
+            todo_id, _with_completed_at(data), where=self._matching(owner_id, version)
+        )
+        if patched is None:
+            raise await self._not_matched(todo_id, owner_id, version)
+        return TodoRead.model_validate(patched)
 
-    async def delete(self, todo_id: UUID) -> TodoDelete:
+    async def delete(
+        self, todo_id: UUID, owner_id: UUID, version: Optional[int] = None
+    ) -> TodoDelete:
         """
         Delete the row and return a minimal delete‑schema (containing the id).
         """
-        await self.repository.delete(pk=todo_id)
+        deleted = await self.repository.delete(
+            pk=todo_id, where=self._matching(owner_id, version)
+        )
+        if deleted is None:
+            raise await self._not_matched(todo_id, owner_id, version)
         return TodoDelete(id=todo_id)
+
+    async def bulk_create(
+        self, payloads: list[TodoCreate], owner_id: UUID
+    ) -> list[TodoBulkItemResult]:
+        """
+        Multi-row ``INSERT ... ON CONFLICT (owner_id, title) DO NOTHING``.
+        Rows whose title already exists (in the table or earlier in the
+        batch) are reported as conflicts instead of failing the batch.
+        """
+        now = datetime.now()
+        rows = [
+            {
+                **payload.model_dump(),
+                "id": uuid7(),
+                "owner_id": owner_id,
+                "created_at": now,
+                "completed_at": now if payload.is_completed else None,
+            }
+            for payload in payloads
+        ]
+        statement = (
+            postgresql.insert(Todo)
+            .on_conflict_do_nothing(index_elements=["owner_id", "title"])
+            .returning(Todo.id)
+        )
+        session = self.repository.session
+        # executemany + RETURNING is batched into multi-VALUES INSERTs
+        result = await session.exec(statement, params=rows)
+        created = set(result.scalars().all())
+        await session.commit()
+
+        return [
+            TodoBulkItemResult(index=i, id=row["id"], status=BulkStatus.Created)
+            if row["id"] in created
+            else TodoBulkItemResult(index=i, status=BulkStatus.Conflict)
+            for i, row in enumerate(rows)
+        ]
+
+    async def bulk_update(
+        self, items: list[TodoBulkUpdateItem], owner_id: UUID
+    ) -> list[TodoBulkItemResult]:
+        """
+        ``UPDATE todos ... FROM (VALUES ...)`` joined on id and owner; a null
+        field in an item keeps the stored value.
+        """
+        columns = Todo.__table__.c
+        session = self.repository.session
+        updated: set[UUID] = set()
+        now = datetime.now()
+
+        for start in range(0, len(items), BULK_UPDATE_CHUNK):
+            chunk = items[start : start + BULK_UPDATE_CHUNK]
+            data = sa.values(
+                sa.column("id", columns.id.type),
+                *(sa.column(name, columns[name].type) for name in _BULK_UPDATE_FIELDS),
+                name="data",
+            ).data(
+                [
+                    (item.id, *(getattr(item, name) for name in _BULK_UPDATE_FIELDS))
+                    for item in chunk
+                ]
+            )
+            statement = (
+                sa.update(Todo)
+                .where(Todo.id == data.c.id, Todo.owner_id == owner_id)
+                .values(
+                    {
+                        **{
+                            name: sa.func.coalesce(data.c[name], columns[name])
+                            for name in _BULK_UPDATE_FIELDS
+                        },
+                        "completed_at": _completed_at(data.c.is_completed, now),
+                        "version": Todo.version + 1,
+                    }
+                )
+                .returning(Todo.id)
+                .execution_options(synchronize_session=False)
+            )
+            try:
+                result = await session.exec(statement)
+            except IntegrityError:
+                await session.rollback()
+                raise TodoBulkConflictError()
+            updated.update(result.scalars().all())
+
+        await session.commit()
+        return [
+            TodoBulkItemResult(
+                index=i,
+                id=item.id,
+                status=(
+                    BulkStatus.Updated if item.id in updated else BulkStatus.NotFound
+                ),
+            )
+            for i, item in enumerate(items)
+        ]
+
+    async def bulk_delete(
+        self, ids: list[UUID], owner_id: UUID
+    ) -> list[TodoBulkItemResult]:
+        """``DELETE ... WHERE owner_id = :owner AND id = ANY(:ids)``."""
+        statement = (
+            sa.delete(Todo)
+            .where(
+                Todo.owner_id == owner_id,
+                Todo.id == sa.any_(sa.cast(ids, postgresql.ARRAY(sa.Uuid))),
+            )
+            .returning(Todo.id)
+            .execution_options(synchronize_session=False)
+        )
+        session = self.repository.session
+        result = await session.exec(statement)
+        deleted = set(result.scalars().all())
+        await session.commit()
+
+        return [
+            TodoBulkItemResult(
+                index=i,
+                id=todo_id,
+                status=(
+                    BulkStatus.Deleted if todo_id in deleted else BulkStatus.NotFound
+                ),
+            )
+            for i, todo_id in enumerate(ids)
+        ]
+
+    async def set_all_completed(self, is_completed: bool, owner_id: UUID) -> int:
+        """Flip every todo of the owner in one ``UPDATE``; returns the row count."""
+        statement = (
+            sa.update(Todo)
+            .where(Todo.owner_id == owner_id, Todo.is_completed != is_completed)
+            .values(
+                is_completed=is_completed,
+                completed_at=datetime.now() if is_completed else None,
+                version=Todo.version + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        session = self.repository.session
+        result = await session.exec(statement)
+        await session.commit()
+        return result.rowcount
+
+    async def apply_completion(self, states: list[tuple[UUID, UUID, bool]]) -> int:
+        """
+        Write buffered ``(todo_id, owner_id, is_completed)`` states with
+        ``UPDATE todos ... FROM (VALUES ...)``. Rows already in that state or
+        gone since the toggle are skipped; returns the rows changed.
+        """
+        columns = Todo.__table__.c
+        session = self.repository.session
+        changed = 0
+        now = datetime.now()
+
+        for start in range(0, len(states), BULK_UPDATE_CHUNK):
+            data = sa.values(
+                sa.column("id", columns.id.type),
+                sa.column("owner_id", columns.owner_id.type),
+                sa.column("is_completed", columns.is_completed.type),
+                name="data",
+            ).data(states[start : start + BULK_UPDATE_CHUNK])
+            statement = (
+                sa.update(Todo)
+                .where(
+                    Todo.id == data.c.id,
+                    Todo.owner_id == data.c.owner_id,
+                    Todo.is_completed != data.c.is_completed,
+                )
+                .values(
+                    is_completed=data.c.is_completed,
+                    completed_at=_completed_at(data.c.is_completed, now),
+                    version=Todo.version + 1,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            result = await session.exec(statement)
+            changed += result.rowcount
+
+        await session.commit()
+        return changed
@@ -1,7 +1,10 @@
+import asyncio
 import hashlib
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Annotated, Any
+from typing import Annotated, Any, Callable, TypeVar
 from uuid import uuid4
 
 from argon2 import PasswordHasher
@@ -17,7 +20,13 @@ from src.database.redis import is_jti_blacklisted
 
 log = logging.getLogger(__name__)
 
-password_context = PasswordHasher()
+T = TypeVar("T")
+
+password_context = PasswordHasher(
+    time_cost=security_settings.ARGON2_TIME_COST,
+    memory_cost=security_settings.ARGON2_MEMORY_COST,
+    parallelism=security_settings.ARGON2_PARALLELISM,
+)
 
 
 _serializer = URLSafeTimedSerializer(
@@ -59,6 +68,96 @@ def verify_password(plain_password: str, password_hash: str) -> bool:
         return False
 
 
+class PasswordHashStats:
+    """Process-wide queue and wait counters for the password hashing pool."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.queued = 0
+        self.queued_max = 0
+        self.running = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited: float) -> None:
+        self.calls += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "queued": self.queued,
+            "queued_max": self.queued_max,
+            "running": self.running,
+            "wait_avg_ms": (
+                round(self.wait_total / self.calls * 1000, 2) if self.calls else 0.0
+            ),
+            "wait_max_ms": round(self.wait_max * 1000, 2),
+        }
+
+
+class PasswordHashPool:
+    """
+    Runs Argon2 on a small dedicated thread pool so hashing never blocks the
+    event loop. argon2-cffi releases the GIL while hashing, so the threads
+    run in parallel. At most ``workers`` calls run at once; the rest wait
+    for a slot on the loop, which is where ``stats.queued`` counts them, so a
+    burst of logins only delays other logins.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self.stats = PasswordHashStats()
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _slots_for(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        # A semaphore binds to the loop that first waits on it, so each loop
+        # (the app's, or a test's) gets its own
+        if self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.workers)
+            self._loop = loop
+        return self._slots
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="argon2"
+            )
+        loop = asyncio.get_running_loop()
+        slots = self._slots_for(loop)
+        self.stats.queued += 1
+        self.stats.queued_max = max(self.stats.queued_max, self.stats.queued)
+        started = time.perf_counter()
+        try:
+            await slots.acquire()
+        finally:
+            self.stats.queued -= 1
+        self.stats.record(time.perf_counter() - started)
+        self.stats.running += 1
+        try:
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.stats.running -= 1
+            slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, password_hash: str) -> bool:
+        return await self._run(verify_password, plain_password, password_hash)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hashing = PasswordHashPool(security_settings.PASSWORD_HASH_WORKERS)
+
+
 async def create_access_token(
     payload: dict,
     expiry: timedelta = timedelta(minutes=20),
@@ -1,26 +1,193 @@
-from typing import Annotated, AsyncGenerator
+import logging
+import time
+from typing import Annotated, AsyncGenerator, Optional
 
-from fastapi import Depends
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from fastapi import Depends, Request
+from sqlalchemy import event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.core.config import app_settings
 from src.core.config import database_settings as settings
+from src.database.instrumentation import instrument
 
-engine = create_async_engine(
-    url=settings.POSTGRES_URL,
-    echo=True,
-    future=True,
+log = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Process-wide counters for connection checkouts from the pool."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        self.checkouts += 1
+        self.timeouts += timed_out
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            pool_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_stats.record(time.perf_counter() - started)
+        return connection
+
+
+def _engine_options() -> dict:
+    return dict(
+        echo=settings.POSTGRES_ECHO,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+        pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+        pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+        connect_args={
+            "prepared_statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE,
+            "command_timeout": settings.POSTGRES_COMMAND_TIMEOUT,
+            "server_settings": {
+                "statement_timeout": str(settings.POSTGRES_STATEMENT_TIMEOUT_MS),
+                "application_name": app_settings.APP_NAME,
+            },
+        },
+    )
+
+
+engine = create_async_engine(url=settings.POSTGRES_URL, **_engine_options())
+instrument(engine)
+
+
+class ReplicaSet:
+    """
+    Round-robin over the read replicas. A replica whose connection fails is
+    ejected for ``POSTGRES_REPLICA_EJECT_SECONDS`` and reads fall back to the
+    remaining replicas, or to the primary when none are healthy.
+    """
+
+    def __init__(self, urls: list[str], eject_seconds: int):
+        self.engines: list[AsyncEngine] = [
+            create_async_engine(url=url, **_engine_options()) for url in urls
+        ]
+        self.eject_seconds = eject_seconds
+        self._ejected_until: dict[int, float] = {}
+        self._next = 0
+        for replica in self.engines:
+            event.listen(replica.sync_engine, "handle_error", self._on_error)
+            instrument(replica)
+
+    def pick(self) -> Optional[AsyncEngine]:
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            index = self._next
+            self._next = (self._next + 1) % len(self.engines)
+            if self._ejected_until.get(index, 0.0) <= now:
+                return self.engines[index]
+        return None
+
+    def eject(self, replica: AsyncEngine) -> None:
+        index = self.engines.index(replica)
+        self._ejected_until[index] = time.monotonic() + self.eject_seconds
+        log.warning(f"Read replica {replica.url!r} ejected for {self.eject_seconds}s")
+
+    def _on_error(self, context: ExceptionContext) -> None:
+        # Lost connections only - not ordinary SQL errors
+        if context.is_disconnect:
+            for replica in self.engines:
+                if replica.sync_engine is context.engine:
+                    self.eject(replica)
+
+    async def dispose(self) -> None:
+        for replica in self.engines:
+            await replica.dispose()
+
+
+replicas = ReplicaSet(
+    settings.POSTGRES_REPLICA_URLS, settings.POSTGRES_REPLICA_EJECT_SECONDS
 )
 
+# Built once per process; sessions are cheap, the factory is not
+async_session_factory = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+
+def get_pool_stats() -> dict:
+    """Snapshot of pool occupancy and checkout wait times for monitoring."""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+        "checkouts": pool_stats.checkouts,
+        "timeouts": pool_stats.timeouts,
+        "wait_avg_ms": round(
+            pool_stats.wait_total / pool_stats.checkouts * 1000, 3
+        )
+        if pool_stats.checkouts
+        else 0.0,
+        "wait_max_ms": round(pool_stats.wait_max * 1000, 3),
+    }
+
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    async_session = async_sessionmaker(
-        bind=engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
-    async with async_session() as session:
+    async with async_session_factory() as session:
         yield session
 
 
 DBSession = Annotated[AsyncSession, Depends(get_session)]
+
+# Cookie set by ``ReadYourWritesMiddleware`` after a write; holds the epoch
+# until which this client's reads must go to the primary.
+PRIMARY_PIN_COOKIE = "db_primary_until"
+
+
+def is_pinned_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_session(
+    request: Request, session: DBSession
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only queries. Served by a replica when one is configured
+    and healthy, otherwise (or while the client is pinned after a write) this
+    is the request's primary session.
+    """
+    replica = None if is_pinned_to_primary(request) else replicas.pick()
+    if replica is None:
+        yield session
+        return
+
+    async with async_session_factory(bind=replica) as read_session:
+        try:
+            yield read_session
+        except OSError:
+            # Refused/timed out connects never reach the DBAPI error hooks
+            replicas.eject(replica)
+            raise
+
+
+ReadDBSession = Annotated[AsyncSession, Depends(get_read_session)]
@@ -0,0 +1,130 @@
+"""Per-request SQL instrumentation.
+
+Provides:
+* ``instrument(engine)`` – SQLAlchemy cursor hooks that count statements and
+  accumulate database time into the current request's ``QueryStats``;
+* ``track_queries()`` – context manager that opens a ``QueryStats`` scope
+  (used by ``QueryTimingMiddleware``);
+* ``query_metrics`` – process-wide per-route aggregates for monitoring;
+* N+1 detection: the same statement shape repeated within one request.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+log = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Statements and database time spent by one request."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed at least ``threshold`` times."""
+        return [
+            (statement, count)
+            for statement, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries"'
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+# ----------------------------------------------------------------------
+# Engine hooks
+# ----------------------------------------------------------------------
+# The start time lives on the statement's execution context, which is
+# dropped with it: a statement that raises (and so never reaches
+# ``after_cursor_execute``) leaves nothing behind on the pooled connection.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    started = context._query_started
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def instrument(engine: AsyncEngine) -> None:
+    """Attach the timing hooks to ``engine`` (idempotent)."""
+    target = engine.sync_engine
+    if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+
+# ----------------------------------------------------------------------
+# Process-wide aggregates
+# ----------------------------------------------------------------------
+class RouteQueryMetrics:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.queries = 0
+        self.db_time = 0.0
+        self.max_queries = 0
+        self.n_plus_one = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "queries": self.queries,
+            "queries_avg": round(self.queries / self.requests, 2),
+            "queries_max": self.max_queries,
+            "db_ms_avg": round(self.db_time / self.requests * 1000, 3),
+            "n_plus_one": self.n_plus_one,
+        }
+
+
+class QueryMetrics:
+    """Per-route totals of statements and database time."""
+
+    def __init__(self) -> None:
+        self.routes: dict[str, RouteQueryMetrics] = {}
+
+    def observe(self, route: str, stats: QueryStats, n_plus_one: bool) -> None:
+        metrics = self.routes.setdefault(route, RouteQueryMetrics())
+        metrics.requests += 1
+        metrics.queries += stats.count
+        metrics.db_time += stats.duration
+        metrics.max_queries = max(metrics.max_queries, stats.count)
+        metrics.n_plus_one += n_plus_one
+
+    def snapshot(self) -> dict:
+        return {route: m.as_dict() for route, m in sorted(self.routes.items())}
+
+
+query_metrics = QueryMetrics()
@@ -4,18 +4,27 @@ Provides:
 * a lazily‑created singleton ``Redis`` client that re‑uses a global
   ``ConnectionPool``;
 * high‑level helpers ``add_jti_to_blacklist`` and ``is_jti_blacklisted``;
+* ``revoked_tokens`` – per-worker Bloom filter of revoked JTIs, kept in
+  sync by ``listen_for_revocations`` so that the blacklist check only goes
+  to Redis for probable hits;
 * ``close_redis`` for graceful shutdown (to be called from the app lifespan).
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from typing import AsyncGenerator
+import time
+from typing import AsyncGenerator, Iterable
 
 import redis.asyncio as redis
 from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import RedisError
 
+from src.core.bloom import BloomFilter
 from src.core.config import database_settings as settings
+from src.core.config import security_settings
 
 log = logging.getLogger(__name__)
 
@@ -68,23 +77,146 @@ async def get_redis() -> AsyncGenerator[Redis, None]:
 # ----------------------------------------------------------------------
 # Public helper functions used throughout the codebase
 # ----------------------------------------------------------------------
-async def add_jti_to_blacklist(jti: str, ttl: int = 60 * 60 * 24 * 7) -> None:
+async def add_jti_to_blacklist(jti: str, expires_at: float | None = None) -> None:
     """
-    Store a JWT identifier (JTI) in Redis for ``ttl`` seconds.
+    Revoke a JWT identifier (JTI) until ``expires_at`` (the token's ``exp``,
+    epoch seconds) - after that the token is rejected as expired anyway.
+    Every worker is told through ``REVOKED_CHANNEL``.
     """
+    now = time.time()
+    if expires_at is None:
+        expires_at = now + DEFAULT_BLACKLIST_TTL
+    ttl = int(expires_at - now) + 1
+    if ttl <= 0:
+        return
+
+    revoked_tokens.add(jti, expires_at)
     client = get_redis_client()
-    await client.set(jti, "1", ex=ttl)
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.set(jti, "1", ex=ttl)
+        pipe.zadd(REVOKED_JTIS_KEY, {jti: expires_at})
+        pipe.zremrangebyscore(REVOKED_JTIS_KEY, "-inf", now)
+        pipe.publish(REVOKED_CHANNEL, json.dumps({"jti": jti, "exp": expires_at}))
+        await pipe.execute()
 
 
 async def is_jti_blacklisted(jti: str) -> bool:
     """
     Return ``True`` if the supplied JTI exists in the blacklist.
     """
+    known = revoked_tokens.check(jti)
+    if known is not None:
+        return known
     client = get_redis_client()
     # ``exists`` returns 0 or 1 → cast to ``bool`` for clarity.
     return bool(await client.exists(jti))
 
 
+# ----------------------------------------------------------------------
+# Worker-local view of the blacklist
+# ----------------------------------------------------------------------
+# Fallback lifetime for a revocation whose token expiry is unknown
+DEFAULT_BLACKLIST_TTL = 60 * 60 * 24 * 7
+# Sorted set of live revoked JTIs scored by expiry, used to (re)build filters
+REVOKED_JTIS_KEY = "auth:revoked_jtis"
+REVOKED_CHANNEL = "auth:revoked"
+# Expired JTIs are dropped from the filter by rebuilding it this often
+REVOKED_REBUILD_SECONDS = 300
+RECONNECT_DELAY = 1.0
+
+
+class RevokedTokens:
+    """
+    Bloom filter of every live revoked JTI plus the exact JTIs revoked since
+    it was built. A filter miss means "not revoked" without asking Redis;
+    only filter hits that are not known revocations are checked with
+    ``EXISTS``. Until the subscriber has loaded the set every check goes to
+    Redis.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.synced = False
+        self.built_at = 0.0
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._recent: dict[str, float] = {}
+
+    def add(self, jti: str, expires_at: float) -> None:
+        self._bloom.add(jti)
+        self._recent[jti] = expires_at
+
+    def replace(self, entries: Iterable[tuple[str, float]]) -> None:
+        """Rebuild from the full set of live revocations."""
+        entries = list(entries)
+        bloom = BloomFilter(max(self.capacity, len(entries) * 2), self.error_rate)
+        for jti, _ in entries:
+            bloom.add(jti)
+        self._bloom, self._recent = bloom, {}
+        self.built_at = time.monotonic()
+        self.synced = True
+
+    def check(self, jti: str) -> bool | None:
+        """``True``/``False`` when known locally, ``None`` to ask Redis."""
+        if not self.synced:
+            return None
+        expires_at = self._recent.get(jti)
+        if expires_at is not None:
+            return expires_at > time.time()
+        if jti not in self._bloom:
+            return False
+        return None
+
+    @property
+    def stale(self) -> bool:
+        return (
+            time.monotonic() - self.built_at > REVOKED_REBUILD_SECONDS
+            or self._bloom.count > self._bloom.capacity
+        )
+
+
+revoked_tokens = RevokedTokens(
+    capacity=security_settings.JTI_BLOOM_CAPACITY,
+    error_rate=security_settings.JTI_BLOOM_ERROR_RATE,
+)
+
+
+async def _load_revoked_tokens(client: Redis) -> None:
+    now = time.time()
+    await client.zremrangebyscore(REVOKED_JTIS_KEY, "-inf", now)
+    entries = await client.zrange(REVOKED_JTIS_KEY, 0, -1, withscores=True)
+    revoked_tokens.replace(entries)
+
+
+async def listen_for_revocations() -> None:
+    """
+    Keep ``revoked_tokens`` in sync until cancelled: load the live
+    revocations once subscribed, then apply published ones and rebuild
+    periodically so expired JTIs leave the filter.
+    """
+    while True:
+        client = get_redis_client()
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            # Subscribe before loading so nothing revoked in between is missed
+            await pubsub.subscribe(REVOKED_CHANNEL)
+            await _load_revoked_tokens(client)
+            while True:
+                message = await pubsub.get_message(timeout=REVOKED_REBUILD_SECONDS)
+                if message is not None:
+                    data = json.loads(message["data"])
+                    revoked_tokens.add(data["jti"], data["exp"])
+                if revoked_tokens.stale:
+                    await _load_revoked_tokens(client)
+        except (RedisError, ValueError, KeyError):
+            log.exception("Revocation subscriber failed, reconnecting")
+            await asyncio.sleep(RECONNECT_DELAY)
+        finally:
+            # Without the stream the local view may miss revocations
+            revoked_tokens.synced = False
+            await pubsub.aclose()
+
+
 # ----------------------------------------------------------------------
 # Graceful shutdown helper – to be called from the FastAPI lifespan
 # ----------------------------------------------------------------------
@@ -1,10 +1,13 @@
 from datetime import datetime
 from enum import IntEnum
-from typing import TYPE_CHECKING
-from uuid import UUID, uuid4
+from typing import TYPE_CHECKING, Optional
+from uuid import UUID
 
+from sqlalchemy import BigInteger, literal_column, text
 from sqlalchemy.dialects import postgresql
-from sqlmodel import Column, Field, Relationship, SQLModel, UniqueConstraint
+from sqlmodel import Column, Field, Index, Relationship, SQLModel, UniqueConstraint
+
+from src.core.ids import uuid7
 
 if TYPE_CHECKING:
     from src.entities.user import User
@@ -18,13 +21,22 @@ class Priority(IntEnum):
     Critical = 3
 
 
+# Full-text search document. ``todos.search_vector`` is a Postgres generated
+# column (see the search migration) and is deliberately left unmapped so the
+# ORM never reads or writes it and the SQLite test schema stays portable.
+SEARCH_CONFIG = "english"
+SEARCH_VECTOR_COLUMN = "search_vector"
+SEARCH_INDEXES = ("ix_todos_owner_search", "ix_todos_archive_owner_search")
+search_vector = literal_column(f"todos.{SEARCH_VECTOR_COLUMN}", postgresql.TSVECTOR)
+
+
 class Todo(SQLModel, table=True):
     __tablename__ = "todos"
 
     id: UUID = Field(
         sa_column=Column(
             postgresql.UUID,
-            default=uuid4,
+            default=uuid7,
             primary_key=True,
         ),
     )
@@ -35,18 +47,27 @@ class Todo(SQLModel, table=True):
         sa_column=Column(
             postgresql.TIMESTAMP,
             default=datetime.now,
+            nullable=False,
         )
     )
+    # When the todo was last marked completed; NULL while it is open. Set by
+    # every write of is_completed, and what archive retention counts from
+    completed_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(postgresql.TIMESTAMP, nullable=True)
+    )
     priority: "Priority" = Field(nullable=False, default=Priority.Medium.value)
+    # Bumped by every UPDATE; the todo's ETag and If-Match token
+    version: int = Field(
+        nullable=False, default=1, sa_column_kwargs={"server_default": "1"}
+    )
     owner_id: UUID = Field(
         foreign_key="users.id",
         nullable=False,
         ondelete="CASCADE",
-        index=True,
     )
     owner: "User" = Relationship(
         back_populates="todos",
-        sa_relationship_kwargs={"lazy": "joined"},
+        sa_relationship_kwargs={"lazy": "select"},
     )
     __table_args__ = (
         UniqueConstraint(
@@ -54,6 +75,32 @@ class Todo(SQLModel, table=True):
             "title",
             name="uq_user_title",
         ),
+        # Per-owner keyset pagination seeks on (created_at, id); the owner
+        # prefix also serves the foreign key and ON DELETE CASCADE lookups
+        Index("ix_todos_owner_created_at_id", "owner_id", "created_at", "id"),
+        Index("ix_todos_owner_status_priority", "owner_id", "is_completed", "priority"),
+        # Partial indexes for the open-todo views (list filters with
+        # is_completed=false), sorted by date or by priority
+        Index(
+            "ix_todos_owner_open_created_at",
+            "owner_id",
+            "created_at",
+            "id",
+            postgresql_where=text("is_completed = false"),
+        ),
+        Index(
+            "ix_todos_owner_open_priority",
+            "owner_id",
+            "priority",
+            "id",
+            postgresql_where=text("is_completed = false"),
+        ),
+        # Lets the archive task find the longest-completed rows cheaply
+        Index(
+            "ix_todos_completed_at",
+            "completed_at",
+            postgresql_where=text("is_completed = true"),
+        ),
     )
 
     @staticmethod
@@ -62,4 +109,80 @@ class Todo(SQLModel, table=True):
         Build a Todo ORM object from a validated TodoCreate schema.
         This method does **not** need any instance data.
         """
-        return Todo(**todo_create.model_dump(), owner_id=owner_id)
+        completed_at = datetime.now() if todo_create.is_completed else None
+        return Todo(
+            **todo_create.model_dump(), owner_id=owner_id, completed_at=completed_at
+        )
+
+
+class TodoArchive(SQLModel, table=True):
+    """
+    Cold storage for completed todos, moved here in batches by the
+    ``archive_completed_todos`` task. Same columns as ``todos`` (and the same
+    unmapped ``search_vector``) plus ``archived_at``; titles are not unique
+    here so an archived title can be reused in ``todos``.
+    """
+
+    __tablename__ = "todos_archive"
+
+    id: UUID = Field(sa_column=Column(postgresql.UUID, primary_key=True))
+    title: str = Field(nullable=False, max_length=50)
+    description: str = Field(nullable=False, max_length=255)
+    is_completed: bool = Field(nullable=False, default=True)
+    created_at: datetime = Field(
+        sa_column=Column(postgresql.TIMESTAMP, nullable=False)
+    )
+    completed_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(postgresql.TIMESTAMP, nullable=True)
+    )
+    priority: "Priority" = Field(nullable=False)
+    version: int = Field(nullable=False, default=1)
+    owner_id: UUID = Field(
+        foreign_key="users.id",
+        nullable=False,
+        ondelete="CASCADE",
+    )
+    archived_at: datetime = Field(
+        sa_column=Column(postgresql.TIMESTAMP, nullable=False, default=datetime.now)
+    )
+    __table_args__ = (
+        Index("ix_todos_archive_owner_created_at_id", "owner_id", "created_at", "id"),
+    )
+
+
+class TodoStats(SQLModel, table=True):
+    """
+    Per-owner todo counts by status and priority (at most eight rows per
+    owner). Maintained by statement-level triggers on ``todos`` in the same
+    transaction as every insert, update and delete - see the counters
+    migration - so the application never writes to it directly.
+    """
+
+    __tablename__ = "todo_stats"
+
+    owner_id: UUID = Field(
+        foreign_key="users.id",
+        primary_key=True,
+        ondelete="CASCADE",
+    )
+    is_completed: bool = Field(primary_key=True)
+    priority: "Priority" = Field(primary_key=True)
+    count: int = Field(nullable=False, default=0)
+
+
+class TodoListVersion(SQLModel, table=True):
+    """
+    Per-owner counter bumped by a statement-level trigger on ``todos`` after
+    every insert, update and delete (see the list versions migration); it
+    is the ETag of the owner's list pages. An owner without a row is at
+    version 0.
+    """
+
+    __tablename__ = "todo_list_versions"
+
+    owner_id: UUID = Field(
+        foreign_key="users.id",
+        primary_key=True,
+        ondelete="CASCADE",
+    )
+    version: int = Field(nullable=False, default=0, sa_type=BigInteger)
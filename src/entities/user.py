@@ -1,11 +1,13 @@
 from enum import StrEnum
 from typing import TYPE_CHECKING
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from pydantic import EmailStr, field_validator
 from sqlalchemy.dialects import postgresql
 from sqlmodel import Column, Field, Relationship, SQLModel, UniqueConstraint
 
+from src.core.ids import uuid7
+
 if TYPE_CHECKING:
     from src.entities.todo import Todo  # noqa: F401
 
@@ -20,7 +22,7 @@ class User(SQLModel, table=True):
     id: UUID = Field(
         sa_column=Column(
             postgresql.UUID,
-            default=uuid4,
+            default=uuid7,
             primary_key=True,
         )
     )
@@ -34,7 +36,8 @@ class User(SQLModel, table=True):
     role: "Role" = Field(default=Role.User.value)
     todos: list["Todo"] = Relationship(
         back_populates="owner",
-        sa_relationship_kwargs={"lazy": "joined"},
+        # Loaded on demand only; never hydrate every todo with the user
+        sa_relationship_kwargs={"lazy": "select"},
     )
     __table_args__ = (
         UniqueConstraint("username", name="uq_user_username"),
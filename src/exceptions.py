@@ -30,3 +30,13 @@ class DomainError(ApiException):
             status_code=status_code,
             detail=detail or f"{self.entity} operation faild.",
         )
+
+
+class InvalidCursorError(ApiException):
+    """Raised when a pagination cursor is malformed or was tampered with."""
+
+    def __init__(self, *, detail: Optional[str] = None):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail or "Invalid pagination cursor.",
+        )
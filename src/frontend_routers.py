@@ -1,65 +1,72 @@
-from typing import Optional
-
 from fastapi import APIRouter, Request
-from fastapi.templating import Jinja2Templates
 
-from src.core.config import TEMPLATE_DIR
+from src.pages import pages
 
 router = APIRouter(tags=["frontend"], include_in_schema=False)
-templates = Jinja2Templates(directory=TEMPLATE_DIR)
+
+# Every page is static HTML rendered once; the JavaScript on each page reads
+# anything request-specific (e.g. the reset token) from the URL itself
+PAGES = [
+    "index.html",
+    "login.html",
+    "register.html",
+    "verify-email.html",
+    "todos.html",
+    "profile.html",
+    "forgot-password.html",
+    "reset-password.html",
+]
 
 
 @router.get("/")
 async def home(request: Request):
     """Redirect to dashboard or login"""
-    return templates.TemplateResponse("index.html", {"request": request})
+    return pages.response(request, "index.html")
 
 
 @router.get("/login")
 async def login_page(request: Request):
     """Serve login page"""
-    return templates.TemplateResponse("login.html", {"request": request})
+    return pages.response(request, "login.html")
 
 
 @router.get("/register")
 async def register_page(request: Request):
     """Serve registration page"""
-    return templates.TemplateResponse("register.html", {"request": request})
+    return pages.response(request, "register.html")
 
 
 @router.get("/verify-email")
 async def verify_email_page(request: Request):
     """Serve email verification page"""
-    return templates.TemplateResponse("verify-email.html", {"request": request})
+    return pages.response(request, "verify-email.html")
 
 
 @router.get("/todos")
 async def todos_page(request: Request):
     """Serve todos page"""
-    return templates.TemplateResponse("todos.html", {"request": request})
+    return pages.response(request, "todos.html")
 
 
 @router.get("/dashboard")
 async def dashboard_page(request: Request):
-    """Serve dashboard page"""
-    return templates.TemplateResponse("dashboard.html", {"request": request})
+    """Serve dashboard page - the todos page, there is no separate template"""
+    return pages.response(request, "todos.html")
 
 
 @router.get("/profile")
 async def profile_page(request: Request):
     """Serve profile page"""
-    return templates.TemplateResponse("profile.html", {"request": request})
+    return pages.response(request, "profile.html")
 
 
 @router.get("/forgot-password")
 async def forgot_password_page(request: Request):
     """Serve forgot password page"""
-    return templates.TemplateResponse("forgot-password.html", {"request": request})
+    return pages.response(request, "forgot-password.html")
 
 
 @router.get("/reset-password")
-async def reset_password_page(request: Request, token: Optional[str] = None):
+async def reset_password_page(request: Request):
     """Serve reset password page"""
-    return templates.TemplateResponse(
-        "reset-password.html", {"request": request, "token": token}
-    )
+    return pages.response(request, "reset-password.html")
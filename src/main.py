@@ -1,25 +1,39 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI, Request, status
+from fastapi import Depends, FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from scalar_fastapi import get_scalar_api_reference
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from starlette.middleware.sessions import SessionMiddleware
 
 from src.api.v1 import routers
-from src.core.config import APP_DIR, TEMPLATE_DIR, security_settings
+from src.assets import STATIC_DIR, PrecompressedStaticFiles
+from src.auth import rehash
+from src.auth.cache import listen_for_invalidations
+from src.core.config import app_settings, security_settings
+from src.core.dependencies import get_current_admin
+from src.core.security import password_hashing
 from src.database import redis as redis_helper
+from src.database.db import engine, get_pool_stats, replicas
+from src.database.instrumentation import query_metrics
 from src.exceptions import DomainError
+from src.frontend_routers import PAGES
 from src.frontend_routers import router as web_router
 from src.logs import logger
-from src.middleware import SecurityHeaderMiddleware
+from src.middleware import (
+    QueryTimingMiddleware,
+    ReadYourWritesMiddleware,
+    SecurityHeaderMiddleware,
+)
+from src.pages import pages
 from src.rate_limiting import limiter
 from src.tags import APITags
+from src.todos.cache import cache_stats
+from src.todos.write_behind import completion_buffer, run_flusher
 
 description = """
 Clean Arch Todo App
@@ -40,17 +54,47 @@ async def lifespan(app: FastAPI):
     """
     FastAPI lifespan hook.
     - Runs once when the app starts.
-    - Guarantees that ``close_redis`` is awaited when the process stops.
+    - Renders the frontend pages up front.
+    - Starts the principal cache eviction and token revocation subscribers
+      and, when enabled, the completion write-behind flusher.
+    - Guarantees that ``close_redis`` is awaited and the database pool is
+      disposed when the process stops.
     """
+    flusher = None
+    subscriber = None
+    revocations = None
     try:
         # Force creation of the Redis client early so connection errors surface
         redis_helper.get_redis_client()
         logger.info("Application startup – Redis client ready")
+        pages.warm(PAGES)
+        subscriber = asyncio.create_task(listen_for_invalidations())
+        revocations = asyncio.create_task(redis_helper.listen_for_revocations())
+        if app_settings.TODO_WRITE_BEHIND:
+            flusher = asyncio.create_task(
+                run_flusher(app_settings.TODO_WRITE_BEHIND_FLUSH_MS / 1000)
+            )
         yield
     finally:
         # This block runs on shutdown
+        for task in (subscriber, revocations):
+            if task is not None:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        if flusher is not None:
+            flusher.cancel()
+            with suppress(asyncio.CancelledError):
+                await flusher
+            # Write what is still pending before the connections go away
+            await completion_buffer.flush()
+        # Let upgrades from recent logins land before the pool goes away
+        await rehash.drain()
+        password_hashing.shutdown()
         await redis_helper.close_redis()
-        logger.info("Application shutdown – Redis connections closed")
+        await engine.dispose()
+        await replicas.dispose()
+        logger.info("Application shutdown – Redis and database connections closed")
 
 
 app = FastAPI(
@@ -76,8 +120,7 @@ app = FastAPI(
 
 @app.get("/api/v1")
 async def home(request: Request):
-    templates = Jinja2Templates(directory=TEMPLATE_DIR)
-    return templates.TemplateResponse({"request": request}, name="login.html")
+    return pages.response(request, "login.html")
 
 
 @app.get("/health")
@@ -92,6 +135,34 @@ async def health():
     return JSONResponse(status_code=200, content={"detail": "OK"})
 
 
+# Internals of the pools and caches are for operators, not the public
+ADMIN_ONLY = [Depends(get_current_admin)]
+
+
+@app.get("/health/db", include_in_schema=False, dependencies=ADMIN_ONLY)
+async def health_db():
+    """Connection pool occupancy and checkout wait statistics."""
+    return JSONResponse(status_code=200, content=get_pool_stats())
+
+
+@app.get("/health/queries", include_in_schema=False, dependencies=ADMIN_ONLY)
+async def health_queries():
+    """Per-route SQL statement counts and database time."""
+    return JSONResponse(status_code=200, content=query_metrics.snapshot())
+
+
+@app.get("/health/cache", include_in_schema=False, dependencies=ADMIN_ONLY)
+async def health_cache():
+    """Todo read cache hits, misses and stampede waits."""
+    return JSONResponse(status_code=200, content=cache_stats.snapshot())
+
+
+@app.get("/health/passwords", include_in_schema=False, dependencies=ADMIN_ONLY)
+async def health_passwords():
+    """Password hashing pool queue depth and slot waits."""
+    return JSONResponse(status_code=200, content=password_hashing.stats.snapshot())
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -99,6 +170,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.add_middleware(SecurityHeaderMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryTimingMiddleware)
 app.add_middleware(
     SessionMiddleware,
     secret_key=security_settings.SESSION_MIDDLEWARE_SECRET_KEY,
@@ -111,7 +184,7 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 
 # Mount Static Files for CSS/JS
-app.mount("/static", StaticFiles(directory=APP_DIR / "static"), name="static")
+app.mount("/static", PrecompressedStaticFiles(directory=STATIC_DIR), name="static")
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
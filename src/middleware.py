@@ -1,6 +1,18 @@
+import logging
+import time
+from typing import AsyncIterator
+
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from src.core.config import app_settings, database_settings
+from src.database.db import PRIMARY_PIN_COOKIE
+from src.database.instrumentation import QueryStats, query_metrics, track_queries
+
+log = logging.getLogger(__name__)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
 
 # Security Headers Middleware
 class SecurityHeaderMiddleware(BaseHTTPMiddleware):
@@ -27,3 +39,75 @@ class SecurityHeaderMiddleware(BaseHTTPMiddleware):
         )
 
         return response
+
+
+# Read-your-writes for replica routing
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """
+    After a successful write, pin the client to the primary for a few seconds
+    so its next reads cannot hit a replica that has not replayed the write.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+
+        if (
+            database_settings.POSTGRES_REPLICA_URLS
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            window = database_settings.POSTGRES_PRIMARY_PIN_SECONDS
+            response.set_cookie(
+                key=PRIMARY_PIN_COOKIE,
+                value=str(time.time() + window),
+                max_age=window,
+                httponly=True,
+                samesite="lax",
+            )
+
+        return response
+
+
+# Per-request SQL statement counts and database time
+class QueryTimingMiddleware(BaseHTTPMiddleware):
+    """
+    Reports the request's statement count and DB time in ``Server-Timing``,
+    aggregates them per route, and outside production flags statement shapes
+    repeated often enough to be an N+1.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        with track_queries() as stats:
+            response = await call_next(request)
+
+        route = request.scope.get("route")
+        name = f"{request.method} {getattr(route, 'path', 'unmatched')}"
+
+        if _repeated(stats):
+            response.headers["X-Query-Warning"] = "n+1"
+        response.headers["Server-Timing"] = stats.server_timing()
+        # Streamed bodies (exports) keep querying after the headers are out:
+        # those statements reach the route metrics, not Server-Timing
+        response.body_iterator = _observe_when_sent(
+            response.body_iterator, name, stats
+        )
+        return response
+
+
+def _repeated(stats: QueryStats) -> list[tuple[str, int]]:
+    if app_settings.is_production:
+        return []
+    return stats.repeated(app_settings.SQL_N_PLUS_ONE_THRESHOLD)
+
+
+async def _observe_when_sent(
+    body: AsyncIterator[bytes], name: str, stats: QueryStats
+) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        repeated = _repeated(stats)
+        for statement, count in repeated:
+            log.warning(f"Possible N+1 in {name}: {count}x {statement[:200]}")
+        query_metrics.observe(name, stats, n_plus_one=bool(repeated))
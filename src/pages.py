@@ -0,0 +1,110 @@
+"""Pre-rendered frontend pages.
+
+The frontend templates take no per-request context, so each page is
+rendered once into bytes, compressed once per content coding and served
+with a strong ETag. Static files are linked through ``asset()``, which
+resolves to their fingerprinted names once ``src.assets`` has been built.
+Outside production the pages are rebuilt whenever a file under
+``TEMPLATE_DIR`` or the asset manifest changes.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+from fastapi import Request, status
+from fastapi.responses import Response
+from jinja2 import Environment, FileSystemLoader
+
+from src.assets import MANIFEST_PATH, accepted_encodings, accepts, asset_url
+from src.core.config import TEMPLATE_DIR, app_settings
+from src.core.etags import etag_matches
+
+try:
+    import brotli
+except ImportError:  # optional: pages are then offered as gzip only
+    brotli = None
+
+# Pages may change with a deploy, so browsers revalidate them every time
+CACHE_CONTROL = "no-cache"
+
+
+class RenderedPage:
+    """A page's HTML plus its compressed variants by content coding."""
+
+    def __init__(self, html: str) -> None:
+        self.body = html.encode()
+        self.digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.encoded = {"gzip": gzip.compress(self.body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.encoded["br"] = brotli.compress(self.body, quality=11)
+
+    def etag(self, coding: Optional[str]) -> str:
+        # Strong tags differ per content coding, the bytes do too
+        return f'"{self.digest}-{coding}"' if coding else f'"{self.digest}"'
+
+
+class PageCache:
+    """Rendered pages by template name, rebuilt on change when ``reload``."""
+
+    def __init__(self, directory: Path, reload: bool = False) -> None:
+        self.directory = directory
+        self.reload = reload
+        self.env = Environment(loader=FileSystemLoader(directory), autoescape=True)
+        self.env.globals["asset"] = asset_url
+        self._pages: dict[str, RenderedPage] = {}
+        self._stamp = self._latest_change() if reload else 0.0
+
+    def _latest_change(self) -> float:
+        paths = [*self.directory.rglob("*.html"), MANIFEST_PATH]
+        return max(
+            (path.stat().st_mtime for path in paths if path.exists()),
+            default=0.0,
+        )
+
+    def get(self, name: str) -> RenderedPage:
+        if self.reload:
+            stamp = self._latest_change()
+            if stamp != self._stamp:
+                self.env.cache.clear()
+                self._pages.clear()
+                self._stamp = stamp
+        page = self._pages.get(name)
+        if page is None:
+            page = RenderedPage(self.env.get_template(name).render())
+            self._pages[name] = page
+        return page
+
+    def warm(self, names: list[str]) -> None:
+        for name in names:
+            self.get(name)
+
+    def response(self, request: Request, name: str) -> Response:
+        """The page in the best coding the client accepts, or 304."""
+        page = self.get(name)
+        weights = accepted_encodings(request.headers.get("accept-encoding", ""))
+        coding = next(
+            (c for c in ("br", "gzip") if c in page.encoded and accepts(weights, c)),
+            None,
+        )
+        etag = page.etag(coding)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        if coding is not None:
+            headers["Content-Encoding"] = coding
+        return Response(
+            content=page.encoded[coding] if coding else page.body,
+            media_type="text/html",
+            headers=headers,
+        )
+
+
+pages = PageCache(TEMPLATE_DIR, reload=not app_settings.is_production)
@@ -57,6 +57,11 @@ const apiClient = {
         throw new Error("You do not have permission to access this resource.");
       }
 
+      // Handle 412 Precondition Failed - the todo changed since it was read
+      if (response.status === 412) {
+        throw new Error("This item was changed elsewhere. Reload and try again.");
+      }
+
       // Handle 404 Not Found
       if (response.status === 404) {
         throw new Error("The requested resource was not found.");
@@ -154,6 +159,13 @@ const apiClient = {
   },
 };
 
+/**
+ * Request options carrying an If-Match precondition for a todo version
+ */
+function ifMatch(version) {
+  return version === null ? {} : { headers: { "If-Match": `W/"${version}"` } };
+}
+
 /**
  * Todo API Client
  */
@@ -166,10 +178,33 @@ const todoAPI = {
   },
 
   /**
-   * Get all todos for the current user
+   * Get a page of todos for the current user.
+   * Pass `next_cursor`/`prev_cursor` from a previous page to move through the list.
    */
-  async getTodos(offset = 0, limit = 10) {
-    return apiClient.get(`/todos?offset=${offset}&limit=${limit}`);
+  async getTodos(cursor = null, limit = 100) {
+    const params = new URLSearchParams({ limit });
+    if (cursor) {
+      params.set("cursor", cursor);
+    }
+    return apiClient.get(`/todos/?${params}`);
+  },
+
+  /**
+   * Dashboard counters by status and priority
+   */
+  async getStats() {
+    return apiClient.get("/todos/stats");
+  },
+
+  /**
+   * Full-text search over the current user's todos, best matches first
+   */
+  async searchTodos(q, cursor = null, limit = 20) {
+    const params = new URLSearchParams({ q, limit });
+    if (cursor) {
+      params.set("cursor", cursor);
+    }
+    return apiClient.get(`/todos/search?${params}`);
   },
 
   /**
@@ -180,24 +215,25 @@ const todoAPI = {
   },
 
   /**
-   * Update a todo
+   * Update a todo. Pass the `version` it was read at to refuse
+   * overwriting someone else's change (412).
    */
-  async updateTodo(id, data) {
-    return apiClient.put(`/todos/${id}`, data);
+  async updateTodo(id, data, version = null) {
+    return apiClient.put(`/todos/${id}`, data, ifMatch(version));
   },
 
   /**
    * Partially update a todo
    */
-  async patchTodo(id, data) {
-    return apiClient.patch(`/todos/${id}`, data);
+  async patchTodo(id, data, version = null) {
+    return apiClient.patch(`/todos/${id}`, data, ifMatch(version));
   },
 
   /**
    * Delete a todo
    */
-  async deleteTodo(id) {
-    return apiClient.delete(`/todos/${id}`);
+  async deleteTodo(id, version = null) {
+    return apiClient.delete(`/todos/${id}`, ifMatch(version));
   },
 };
 
@@ -8,13 +8,20 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.core import security
+from src.core.config import app_settings
+from src.core.repositories import todo as todo_repository
 from src.database import redis as redis_helper
 from src.database.db import get_session
+from src.database.instrumentation import instrument
 from src.entities.todo import Todo
-from src.entities.user import User
+from src.entities.user import Role, User
 from src.main import app
+from src.rate_limiting import limiter
 from src.tests.example import create_test_user
 from src.tests.utils.auth import issue_test_token
+from src.tests.utils.redis import FakeRedis
+from src.tests.utils.search import SEARCH_DOCUMENT, install_sqlite_search
 
 # ----------------------------------------------------------------------
 # 1. In‑memory SQLite for tests
@@ -24,6 +31,8 @@ TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:?cache=shared"
 engine = create_async_engine(
     TEST_DATABASE_URL, echo=False, connect_args={"check_same_thread": False}
 )
+# Same per-request SQL accounting (and N+1 detection) as the app engine
+instrument(engine)
 
 async_test_session_maker = async_sessionmaker(
     bind=engine,
@@ -72,9 +81,86 @@ async def redis_cleanup():
         print(f"Redis cleanup failed: {exc}")
 
 
+@pytest.fixture
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> FakeRedis:
+    """In-memory Redis behind ``get_redis_client`` for this test."""
+    fake = FakeRedis()
+    monkeypatch.setattr(redis_helper, "_client", fake)
+    return fake
+
+
+@pytest.fixture
+def write_behind(fake_redis: FakeRedis, monkeypatch: pytest.MonkeyPatch) -> FakeRedis:
+    monkeypatch.setattr(app_settings, "TODO_WRITE_BEHIND", True)
+    return fake_redis
+
+
+@pytest.fixture
+def todo_cache_enabled(
+    fake_redis: FakeRedis, monkeypatch: pytest.MonkeyPatch
+) -> FakeRedis:
+    monkeypatch.setattr(app_settings, "TODO_CACHE", True)
+    return fake_redis
+
+
+# Row-level SQLite stand-ins for the statement-level Postgres triggers of the
+# todo_stats migration (663d0c7833b1), which create_all does not install
+TODO_STATS_TRIGGERS = (
+    """
+    CREATE TRIGGER todo_stats_insert AFTER INSERT ON todos BEGIN
+        INSERT INTO todo_stats (owner_id, is_completed, priority, count)
+        VALUES (NEW.owner_id, NEW.is_completed, NEW.priority, 1)
+        ON CONFLICT (owner_id, is_completed, priority)
+        DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER todo_stats_update AFTER UPDATE ON todos BEGIN
+        UPDATE todo_stats SET count = count - 1
+        WHERE owner_id = OLD.owner_id
+          AND is_completed = OLD.is_completed
+          AND priority = OLD.priority;
+        INSERT INTO todo_stats (owner_id, is_completed, priority, count)
+        VALUES (NEW.owner_id, NEW.is_completed, NEW.priority, 1)
+        ON CONFLICT (owner_id, is_completed, priority)
+        DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER todo_stats_delete AFTER DELETE ON todos BEGIN
+        UPDATE todo_stats SET count = count - 1
+        WHERE owner_id = OLD.owner_id
+          AND is_completed = OLD.is_completed
+          AND priority = OLD.priority;
+    END
+    """,
+)
+
+
+@pytest_asyncio.fixture
+async def todo_stats_triggers():
+    """Keep ``todo_stats`` in step with ``todos`` for this test."""
+    async with engine.begin() as conn:
+        for trigger in TODO_STATS_TRIGGERS:
+            await conn.exec_driver_sql(trigger)
+
+
+@pytest_asyncio.fixture
+async def sqlite_search(monkeypatch: pytest.MonkeyPatch):
+    """Full-text search over SQLite, with Python stand-ins for Postgres'."""
+    await install_sqlite_search(engine)
+    monkeypatch.setattr(todo_repository, "search_vector", SEARCH_DOCUMENT)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def reset_rate_limits():
+    """Per-route limits are per client address, which all tests share."""
+    limiter.reset()
+
+
 @pytest_asyncio.fixture
 async def client(
-    db_session: AsyncSession, test_user: User
+    db_session: AsyncSession, test_user: User, monkeypatch: pytest.MonkeyPatch
 ) -> AsyncGenerator[AsyncClient, None]:
     """Builds a client with dependency overrides."""
 
@@ -86,6 +172,8 @@ async def client(
 
     app.dependency_overrides[get_session] = get_session_override
     app.dependency_overrides[redis_helper.is_jti_blacklisted] = fake_is_jti_blacklisted
+    # ``verify_access_token`` calls the blacklist helper directly, not via Depends
+    monkeypatch.setattr(security, "is_jti_blacklisted", fake_is_jti_blacklisted)
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
@@ -108,4 +196,12 @@ async def test_user(db_session: AsyncSession) -> User:
 async def auth_headers(test_user: User) -> dict[str, str]:
     print(test_user)
     token = await issue_test_token(test_user)
-    return {"Authorization": f"Bearer {token}"}
+    # The API reads the JWT from the HttpOnly ``access_token`` cookie
+    return {"Cookie": f"access_token={token}"}
+
+
+@pytest_asyncio.fixture(scope="function")
+async def admin_headers(db_session: AsyncSession) -> dict[str, str]:
+    admin = await create_test_user(db_session, role=Role.Admin.value)
+    token = await issue_test_token(admin)
+    return {"Cookie": f"access_token={token}"}
@@ -0,0 +1,243 @@
+import asyncio
+import json
+import time
+
+import pytest
+from argon2 import PasswordHasher
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.auth import rehash
+from src.auth.cli import write_env
+from src.core import security
+from src.core.bloom import BloomFilter
+from src.database import redis as redis_helper
+from src.database.redis import (
+    REVOKED_CHANNEL,
+    REVOKED_JTIS_KEY,
+    RevokedTokens,
+    add_jti_to_blacklist,
+)
+from src.entities.user import User
+from src.tests.conftest import async_test_session_maker
+from src.tests.example import create_test_user
+
+
+@pytest.mark.asyncio
+class TestTokenRevocation:
+    """Revoked JTIs: Bloom filter, worker-local view and Redis entries."""
+
+    async def test_bloom_filter_has_no_false_negatives(self):
+        """Bloom: every added item is found, few absent ones are."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        added = [f"jti-{i}" for i in range(1000)]
+        for item in added:
+            bloom.add(item)
+
+        assert all(item in bloom for item in added)
+        assert bloom.count == 1000
+        false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+        # Well within 3x the configured rate at full capacity
+        assert false_positives < 300
+
+    async def test_check_defers_to_redis_until_synced(self):
+        """Local view: no answer before the load, exact answers after it."""
+        tokens = RevokedTokens(capacity=100, error_rate=0.01)
+        assert tokens.check("revoked") is None
+
+        now = time.time()
+        tokens.replace([("revoked", now + 60)])
+        assert tokens.synced
+        assert tokens.check("never-revoked") is False
+        # Filter hits from the load are confirmed with Redis
+        assert tokens.check("revoked") is None
+
+        tokens.add("just-revoked", now + 60)
+        tokens.add("long-expired", now - 1)
+        assert tokens.check("just-revoked") is True
+        assert tokens.check("long-expired") is False
+
+    async def test_blacklist_ttl_follows_token_expiry(
+        self, fake_redis, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Blacklist: entries live until the token expires, not longer."""
+        tokens = RevokedTokens(capacity=100, error_rate=0.01)
+        monkeypatch.setattr(redis_helper, "revoked_tokens", tokens)
+        expires_at = time.time() + 120
+
+        await add_jti_to_blacklist("live-token", expires_at=expires_at)
+        assert 119 <= await fake_redis.ttl("live-token") <= 121
+        assert await fake_redis.zrange(REVOKED_JTIS_KEY, 0, -1) == ["live-token"]
+        channel, message = fake_redis.published[-1]
+        assert channel == REVOKED_CHANNEL
+        assert json.loads(message) == {"jti": "live-token", "exp": expires_at}
+
+        await add_jti_to_blacklist("expired-token", expires_at=time.time() - 5)
+        assert await fake_redis.ttl("expired-token") == -2
+        assert len(fake_redis.published) == 1
+
+        await add_jti_to_blacklist("unknown-expiry")
+        ttl = await fake_redis.ttl("unknown-expiry")
+        assert abs(ttl - redis_helper.DEFAULT_BLACKLIST_TTL) <= 1
+
+
+@pytest.mark.asyncio
+class TestOperatorEndpoints:
+    """Pool, query and cache internals are served to admins only."""
+
+    @pytest.mark.parametrize("name", ["db", "queries", "cache", "passwords"])
+    async def test_health_details_need_an_admin(
+        self,
+        name: str,
+        client: AsyncClient,
+        auth_headers: dict,
+        admin_headers: dict,
+    ):
+        """Access: anonymous is 401, a regular user 403, an admin 200."""
+        url = f"/health/{name}"
+        assert (await client.get(url)).status_code == 401
+        assert (await client.get(url, headers=auth_headers)).status_code == 403
+        assert (await client.get(url, headers=admin_headers)).status_code == 200
+
+
+@pytest.mark.asyncio
+class TestPasswordHashing:
+    """Argon2 runs on a capped pool whose queue is reported."""
+
+    async def test_hashes_beyond_the_cap_queue(
+        self,
+        client: AsyncClient,
+        admin_headers: dict,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Pool: at most ``workers`` run, the rest wait and are counted."""
+
+        def slow_hash(password: str) -> str:
+            time.sleep(0.2)
+            return f"hashed:{password}"
+
+        monkeypatch.setattr(security, "hash_password", slow_hash)
+        pool = security.password_hashing
+        calls = pool.stats.calls
+        hashes = [
+            asyncio.create_task(pool.hash(f"password-{i}"))
+            for i in range(pool.workers + 3)
+        ]
+        await asyncio.sleep(0.05)
+
+        res = await client.get("/health/passwords", headers=admin_headers)
+        stats = res.json()
+        assert stats["running"] == pool.workers
+        assert stats["queued"] == 3
+        assert stats["queued_max"] >= 3
+
+        results = await asyncio.gather(*hashes)
+        assert results == [f"hashed:password-{i}" for i in range(len(hashes))]
+        res = await client.get("/health/passwords", headers=admin_headers)
+        stats = res.json()
+        assert (stats["running"], stats["queued"]) == (0, 0)
+        assert stats["calls"] - calls == len(hashes)
+        assert stats["wait_max_ms"] >= 150
+
+    async def test_pool_works_across_event_loops(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Pool: slots are not tied to the loop that first contended."""
+        monkeypatch.setattr(
+            security, "hash_password", lambda password: time.sleep(0.02) or password
+        )
+        pool = security.password_hashing
+
+        async def contend() -> list[str]:
+            return await asyncio.gather(
+                *(pool.hash(str(i)) for i in range(pool.workers + 2))
+            )
+
+        expected = [str(i) for i in range(pool.workers + 2)]
+        assert await contend() == expected
+        # A fresh loop, as each test or a restarted app gets
+        assert await asyncio.to_thread(asyncio.run, contend()) == expected
+        assert await contend() == expected
+
+
+@pytest.mark.asyncio
+class TestPasswordRehash:
+    """Argon2 cost: calibrated settings and upgrades after login."""
+
+    async def test_write_env_updates_only_argon2_keys(self, tmp_path):
+        """Calibration: existing keys are replaced, missing ones appended."""
+        env = tmp_path / ".env"
+        env.write_text(
+            "# secrets\n"
+            "JWT_SECRET_KEY=abc=def\n"
+            "ARGON2_TIME_COST=3\n"
+            "\n"
+            "REDIS_HOST=localhost\n"
+        )
+        write_env(
+            env,
+            {
+                "ARGON2_TIME_COST": 2,
+                "ARGON2_MEMORY_COST": 131072,
+                "ARGON2_PARALLELISM": 4,
+            },
+        )
+        assert env.read_text().splitlines() == [
+            "# secrets",
+            "JWT_SECRET_KEY=abc=def",
+            "ARGON2_TIME_COST=2",
+            "",
+            "REDIS_HOST=localhost",
+            "ARGON2_MEMORY_COST=131072",
+            "ARGON2_PARALLELISM=4",
+        ]
+
+    async def test_login_defers_one_rehash_of_an_outdated_hash(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Rehash: upgraded after the response, once, then never again."""
+        password = "Outdated_Pas$word1"
+        user = await create_test_user(db_session)
+        weak = PasswordHasher(time_cost=1, memory_cost=8192, parallelism=1)
+        user.password_hash = old_hash = weak.hash(password)
+        await db_session.commit()
+
+        release = asyncio.Event()
+        started = []
+        real_rehash = rehash._rehash
+
+        async def held_rehash(*args):
+            started.append(args[0])
+            await release.wait()
+            await real_rehash(*args)
+
+        monkeypatch.setattr(rehash, "_rehash", held_rehash)
+        monkeypatch.setattr(rehash, "async_session_factory", async_test_session_maker)
+
+        form = {"username": user.email, "password": password}
+        for _ in range(2):
+            res = await client.post("/api/v1/auth/token", data=form)
+            assert res.status_code == 200
+        await asyncio.sleep(0)
+        # Both logins answered with the old hash still stored
+        assert started == [user.id]
+        await db_session.refresh(user)
+        assert user.password_hash == old_hash
+
+        release.set()
+        await rehash.drain()
+        async with async_test_session_maker() as session:
+            stored = (await session.get(User, user.id)).password_hash
+        assert stored != old_hash
+        assert not security.password_context.check_needs_rehash(stored)
+        assert security.verify_password(password, stored)
+
+        # Requests share this session here; a real one would load afresh
+        await db_session.refresh(user)
+        res = await client.post("/api/v1/auth/token", data=form)
+        assert res.status_code == 200
+        await rehash.drain()
+        assert started == [user.id]
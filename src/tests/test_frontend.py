@@ -0,0 +1,193 @@
+import gzip
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from starlette import status
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from src import assets
+from src.pages import pages
+
+
+@pytest.mark.asyncio
+class TestFrontendPages:
+    """Pre-rendered pages: content codings, strong ETags and revalidation."""
+
+    async def test_page_is_served_in_the_accepted_coding(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Codings: br over gzip by preference, identity when neither fits."""
+        page = pages.get("login.html")
+        # Offer br even where the optional brotli package is missing
+        monkeypatch.setitem(page.encoded, "br", b"brotli bytes")
+
+        async with client.stream(
+            "GET", "/login", headers={"Accept-Encoding": "gzip, br"}
+        ) as res:
+            assert res.headers["Content-Encoding"] == "br"
+            assert b"".join([chunk async for chunk in res.aiter_raw()]) == (
+                b"brotli bytes"
+            )
+
+        async with client.stream(
+            "GET", "/login", headers={"Accept-Encoding": "br;q=0, gzip"}
+        ) as res:
+            assert res.headers["Content-Encoding"] == "gzip"
+            raw = b"".join([chunk async for chunk in res.aiter_raw()])
+        assert gzip.decompress(raw) == page.body
+
+        res = await client.get("/login", headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in res.headers
+        assert res.content == page.body
+        # CORS middleware appends Origin
+        assert "Accept-Encoding" in res.headers["Vary"]
+        assert res.headers["Cache-Control"] == "no-cache"
+
+    async def test_strong_etag_revalidates_per_coding(self, client: AsyncClient):
+        """ETags: strong, distinct per coding, and a match is a bodiless 304."""
+        identity = await client.get(
+            "/dashboard", headers={"Accept-Encoding": "identity"}
+        )
+        gzipped = await client.get("/dashboard", headers={"Accept-Encoding": "gzip"})
+        etag = gzipped.headers["ETag"]
+        assert not etag.startswith("W/")
+        assert etag != identity.headers["ETag"]
+        assert etag.endswith('-gzip"')
+
+        res = await client.get(
+            "/dashboard",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": etag},
+        )
+        assert res.status_code == status.HTTP_304_NOT_MODIFIED
+        assert res.content == b""
+        assert res.headers["ETag"] == etag
+
+        res = await client.get(
+            "/dashboard",
+            headers={"Accept-Encoding": "identity", "If-None-Match": etag},
+        )
+        assert res.status_code == status.HTTP_200_OK
+
+    async def test_dashboard_serves_the_todos_page(self, client: AsyncClient):
+        """Routes: /dashboard and /todos are the same rendered page."""
+        dashboard = await client.get("/dashboard")
+        todos = await client.get("/todos")
+        assert dashboard.status_code == status.HTTP_200_OK
+        assert dashboard.headers["ETag"] == todos.headers["ETag"]
+        assert dashboard.headers["content-type"].startswith("text/html")
+
+
+@pytest_asyncio.fixture
+async def static_client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """The static mount over a built copy of ``static/``."""
+    static_dir = tmp_path / "static"
+    shutil.copytree(
+        assets.STATIC_DIR, static_dir, ignore=shutil.ignore_patterns("dist")
+    )
+    monkeypatch.setattr(assets, "DIST_DIR", static_dir / "dist")
+    monkeypatch.setattr(assets, "MANIFEST_PATH", static_dir / "dist" / "manifest.json")
+    app = Starlette(
+        routes=[
+            Mount(
+                "/static",
+                app=assets.PrecompressedStaticFiles(directory=static_dir),
+                name="static",
+            )
+        ]
+    )
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        yield ac, static_dir
+
+
+@pytest.mark.asyncio
+class TestStaticAssets:
+    """Fingerprinted assets: manifest URLs, precompressed siblings, caching."""
+
+    async def test_fingerprinted_urls_resolve(self, static_client):
+        """Build: templates link hashed names that the mount serves."""
+        client, static_dir = static_client
+        assert assets.asset_url("js/auth.js") == "/static/js/auth.js"
+
+        manifest = assets.build(static_dir)
+        url = assets.asset_url("js/auth.js")
+        assert url == f"/static/{manifest['js/auth.js']}"
+        assert url.startswith("/static/dist/js/auth.") and url.endswith(".js")
+        assert pages.env.from_string("{{ asset('js/auth.js') }}").render() == url
+
+        res = await client.get(url, headers={"Accept-Encoding": "identity"})
+        assert res.status_code == status.HTTP_200_OK
+        assert res.content == (static_dir / "js" / "auth.js").read_bytes()
+        assert res.headers["content-type"].startswith("text/javascript")
+
+    async def test_immutable_only_for_dist_assets(self, static_client):
+        """Caching: hashed files are immutable, plain paths revalidate."""
+        client, static_dir = static_client
+        manifest = assets.build(static_dir)
+
+        res = await client.get(f"/static/{manifest['css/custom.css']}")
+        assert res.headers["Cache-Control"] == assets.IMMUTABLE
+        res = await client.get("/static/css/custom.css")
+        assert res.status_code == status.HTTP_200_OK
+        assert "Cache-Control" not in res.headers
+        # Same name after every build, so it must revalidate
+        res = await client.get("/static/dist/manifest.json")
+        assert res.status_code == status.HTTP_200_OK
+        assert "Cache-Control" not in res.headers
+
+    async def test_manifest_is_reread_only_when_changed(self, static_client):
+        """Manifest: parsed once per build, not per asset reference."""
+        _, static_dir = static_client
+        manifest = assets.build(static_dir)
+        url = assets.asset_url("js/auth.js")
+        stat = assets.MANIFEST_PATH.stat()
+
+        assets.MANIFEST_PATH.write_text(json.dumps({"js/auth.js": "rebuilt.js"}))
+        os.utime(assets.MANIFEST_PATH, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert assets.asset_url("js/auth.js") == url == (
+            f"/static/{manifest['js/auth.js']}"
+        )
+
+        os.utime(assets.MANIFEST_PATH, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert assets.asset_url("js/auth.js") == "/static/rebuilt.js"
+
+    async def test_precompressed_variant_is_negotiated(self, static_client):
+        """Codings: the accepted sibling is sent, with Vary on every variant."""
+        client, static_dir = static_client
+        manifest = assets.build(static_dir)
+        path = static_dir / manifest["js/utils.js"]
+        # Offer br even where the optional brotli package is missing
+        Path(f"{path}.br").write_bytes(b"brotli bytes")
+        url = f"/static/{manifest['js/utils.js']}"
+
+        async with client.stream(
+            "GET", url, headers={"Accept-Encoding": "gzip, br"}
+        ) as res:
+            assert res.headers["Content-Encoding"] == "br"
+            raw = b"".join([chunk async for chunk in res.aiter_raw()])
+        assert raw == b"brotli bytes"
+
+        async with client.stream(
+            "GET", url, headers={"Accept-Encoding": "gzip"}
+        ) as res:
+            assert res.headers["Content-Encoding"] == "gzip"
+            assert res.headers["Vary"] == "Accept-Encoding"
+            assert res.headers["content-type"].startswith("text/javascript")
+            raw = b"".join([chunk async for chunk in res.aiter_raw()])
+        assert gzip.decompress(raw) == path.read_bytes()
+
+        res = await client.get(url, headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in res.headers
+        assert res.headers["Vary"] == "Accept-Encoding"
+        etag = res.headers["ETag"]
+        res = await client.get(
+            url, headers={"Accept-Encoding": "identity", "If-None-Match": etag}
+        )
+        assert res.status_code == status.HTTP_304_NOT_MODIFIED
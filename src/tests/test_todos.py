@@ -1,8 +1,38 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime
+from uuid import UUID, uuid4
+
 import pytest
 from httpx import AsyncClient
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette import status
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
 
-from src.tests.example import VALID_TODO, VALID_TODO_UPDATE
+from src.core.repositories.base import Cursor
+from src.core.repositories.todo import TodoRepository
+from src.database import db
+from src.database.instrumentation import query_metrics, track_queries
+from src.entities.todo import Priority, Todo, TodoArchive
+from src.entities.user import User
+from src.middleware import QueryTimingMiddleware
+from src.tests.conftest import async_test_session_maker, engine
+from src.tests.example import VALID_TODO, VALID_TODO_UPDATE, create_test_user
+from src.tests.utils.auth import issue_test_token
+from src.todos.cache import VERSION_KEY_PREFIX, cache_stats, todo_cache
+from src.todos.write_behind import (
+    DIRTY_OWNERS_KEY,
+    LOCK_KEY_PREFIX,
+    completion_buffer,
+)
 
 BASE_URL = "/api/v1/todos/"
 
@@ -58,3 +88,928 @@ class TestTodoAPI:
         await client.delete(f"{BASE_URL}/{todo_id}", headers=auth_headers)
         check = await client.get(f"{BASE_URL}{todo_id}", headers=auth_headers)
         assert check.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_list_todos_cursor_pagination(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Pagination: cursors visit every row once, forwards and backwards."""
+        for i in range(5):
+            payload = {**VALID_TODO, "title": f"Paginated todo #{i}"}
+            res = await client.post(BASE_URL, json=payload, headers=auth_headers)
+            assert res.status_code == status.HTTP_201_CREATED
+
+        seen, cursor, pages = [], None, []
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            res = await client.get(BASE_URL, params=params, headers=auth_headers)
+            assert res.status_code == status.HTTP_200_OK
+            page = res.json()
+            pages.append(page)
+            seen.extend(todo["id"] for todo in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert len(seen) == len(set(seen)) == 5
+        assert pages[0]["prev_cursor"] is None
+
+        back = await client.get(
+            BASE_URL,
+            params={"limit": 2, "cursor": pages[-1]["prev_cursor"]},
+            headers=auth_headers,
+        )
+        assert back.json()["items"] == pages[-2]["items"]
+
+    async def test_list_todos_filters(self, client: AsyncClient, auth_headers: dict):
+        """Filtering: status and priority filters are applied server-side."""
+        variants = [(0, False), (2, False), (3, False), (3, True)]
+        for i, (priority, done) in enumerate(variants):
+            payload = {
+                **VALID_TODO,
+                "title": f"Filtered todo #{i}",
+                "priority": priority,
+                "is_completed": done,
+            }
+            res = await client.post(BASE_URL, json=payload, headers=auth_headers)
+            assert res.status_code == status.HTTP_201_CREATED
+
+        res = await client.get(
+            BASE_URL,
+            params={"is_completed": False, "priority": [2, 3]},
+            headers=auth_headers,
+        )
+        assert res.status_code == status.HTTP_200_OK
+        items = res.json()["items"]
+        assert sorted(todo["priority"] for todo in items) == [2, 3]
+        assert not any(todo["is_completed"] for todo in items)
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 1, "sort_by": "priority"}
+            res = await client.get(
+                BASE_URL,
+                params={**params, **({"cursor": cursor} if cursor else {})},
+                headers=auth_headers,
+            )
+            assert res.status_code == status.HTTP_200_OK
+            seen.extend(todo["id"] for todo in res.json()["items"])
+            cursor = res.json()["next_cursor"]
+            if cursor is None:
+                break
+        assert len(seen) == len(set(seen)) == 4
+
+        res = await client.get(
+            BASE_URL,
+            params={"created_before": "2000-01-01T00:00:00"},
+            headers=auth_headers,
+        )
+        assert res.json()["items"] == []
+
+    async def test_todo_stats(
+        self, client: AsyncClient, auth_headers: dict, todo_stats_triggers
+    ):
+        """Dashboard: counters follow creates, completions and deletes."""
+        # Production counters come from the Postgres triggers of the
+        # todo_stats migration; the fixture mirrors them row by row in SQLite
+        ids = {}
+        for priority, is_completed in [
+            (Priority.Low, False),
+            (Priority.High, False),
+            (Priority.High, True),
+            (Priority.Critical, False),
+        ]:
+            payload = {
+                **VALID_TODO,
+                "title": f"Counted {priority.name} {is_completed}",
+                "priority": priority.value,
+                "is_completed": is_completed,
+            }
+            res = await client.post(BASE_URL, json=payload, headers=auth_headers)
+            ids[priority, is_completed] = res.json()["id"]
+        await client.patch(
+            f"{BASE_URL}{ids[Priority.Low, False]}",
+            json={"is_completed": True},
+            headers=auth_headers,
+        )
+        await client.delete(
+            f"{BASE_URL}{ids[Priority.Critical, False]}", headers=auth_headers
+        )
+
+        res = await client.get(f"{BASE_URL}stats", headers=auth_headers)
+        assert res.status_code == status.HTTP_200_OK
+        assert res.json() == {
+            "total": 3,
+            "open": 1,
+            "completed": 2,
+            "by_priority": [
+                {"priority": 0, "open": 0, "completed": 1},
+                {"priority": 1, "open": 0, "completed": 0},
+                {"priority": 2, "open": 1, "completed": 1},
+                {"priority": 3, "open": 0, "completed": 0},
+            ],
+        }
+
+        res = await client.get(BASE_URL, headers=auth_headers)
+        assert res.headers["X-Total-Count"] == "3"
+        res = await client.get(
+            BASE_URL,
+            params={"is_completed": "true", "priority": [2, 3]},
+            headers=auth_headers,
+        )
+        assert res.headers["X-Total-Count"] == "1"
+        # created_at bounds cannot be answered from the counters
+        res = await client.get(
+            BASE_URL,
+            params={"created_after": "2000-01-01T00:00:00"},
+            headers=auth_headers,
+        )
+        assert "X-Total-Count" not in res.headers
+
+    async def test_export_streams_ndjson_and_csv(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Export: every todo is streamed once, in either format."""
+        for i in range(3):
+            payload = {**VALID_TODO, "title": f"Exported todo #{i}"}
+            res = await client.post(BASE_URL, json=payload, headers=auth_headers)
+            assert res.status_code == status.HTTP_201_CREATED
+
+        res = await client.get(f"{BASE_URL}export", headers=auth_headers)
+        assert res.status_code == status.HTTP_200_OK
+        assert res.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in res.text.splitlines()]
+        titles = [f"Exported todo #{i}" for i in range(3)]
+        assert [row["title"] for row in rows] == titles
+
+        res = await client.get(
+            f"{BASE_URL}export", params={"format": "csv"}, headers=auth_headers
+        )
+        assert res.status_code == status.HTTP_200_OK
+        records = list(csv.DictReader(io.StringIO(res.text)))
+        assert {record["id"] for record in records} == {row["id"] for row in rows}
+
+    async def test_import_reports_invalid_rows(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Import: rows failing TodoCreate are reported by line, not loaded."""
+        body = "\n".join(
+            [
+                json.dumps({**VALID_TODO, "title": "short"}),
+                "",
+                "{not json",
+            ]
+        )
+        res = await client.post(
+            f"{BASE_URL}import", content=body, headers=auth_headers
+        )
+        assert res.status_code == status.HTTP_200_OK
+        result = res.json()
+        assert (result["imported"], result["invalid"]) == (0, 2)
+        assert [error["line"] for error in result["errors"]] == [1, 3]
+        assert result["errors"][0]["error"].startswith("title:")
+
+        body = 'title,description,priority\n"Multi\nline",too short,9\n'
+        res = await client.post(
+            f"{BASE_URL}import",
+            params={"format": "csv"},
+            content=body,
+            headers=auth_headers,
+        )
+        result = res.json()
+        assert result["invalid"] == 1
+        assert result["errors"][0]["line"] == 2
+
+    async def test_import_reports_oversized_rows(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Import: a title too long for its column is a row error, not a 500."""
+        staged = []
+
+        async def copy_import(self, batches, owner_id, report_limit):
+            # COPY needs Postgres; record what would have been loaded
+            async for batch in batches:
+                staged.extend(line for line, _ in batch)
+            return len(staged), 0, []
+
+        monkeypatch.setattr(TodoRepository, "copy_import", copy_import)
+        body = "\n".join(
+            json.dumps({**VALID_TODO, "title": title})
+            for title in ("Imported todo one", "x" * 51, "Imported todo two")
+        )
+        res = await client.post(
+            f"{BASE_URL}import", content=body, headers=auth_headers
+        )
+        assert res.status_code == status.HTTP_200_OK
+        result = res.json()
+        assert (result["imported"], result["invalid"]) == (2, 1)
+        assert [error["line"] for error in result["errors"]] == [2]
+        assert result["errors"][0]["error"].startswith("title:")
+        assert staged == [1, 3]
+
+    async def test_list_todos_include_archived(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        db_session: AsyncSession,
+        test_user: User,
+    ):
+        """Archive: archived todos are only read when explicitly requested."""
+        res = await client.post(BASE_URL, json=VALID_TODO, headers=auth_headers)
+        assert res.status_code == status.HTTP_201_CREATED
+        archived = TodoArchive(
+            id=uuid4(),
+            title="Archived todo",
+            description="Completed long ago",
+            priority=Priority.Low,
+            created_at=datetime(2020, 1, 1),
+            owner_id=test_user.id,
+        )
+        db_session.add(archived)
+        await db_session.commit()
+
+        res = await client.get(BASE_URL, headers=auth_headers)
+        assert [t["title"] for t in res.json()["items"]] == [VALID_TODO["title"]]
+
+        res = await client.get(
+            BASE_URL,
+            params={"include_archived": True, "limit": 1},
+            headers=auth_headers,
+        )
+        page = res.json()
+        assert [t["id"] for t in page["items"]] == [str(archived.id)]
+        assert "X-Total-Count" not in res.headers
+
+        res = await client.get(
+            BASE_URL,
+            params={"include_archived": True, "cursor": page["next_cursor"]},
+            headers=auth_headers,
+        )
+        assert [t["title"] for t in res.json()["items"]] == [VALID_TODO["title"]]
+
+    async def test_search_pages_by_rank(
+        self, client: AsyncClient, auth_headers: dict, sqlite_search
+    ):
+        """Search: float rank cursors visit every match once, best first."""
+        # Production matching and ranking is Postgres full-text search; the
+        # fixture stands in for it with word matching and a word-share rank
+        descriptions = [
+            "milk, milk please",
+            "milk and bread",
+            "milk milk milk",
+            "eggs and bread",
+            "oat milk for the coffee",
+            "milk and bread",
+        ]
+        for i, description in enumerate(descriptions):
+            payload = {
+                **VALID_TODO,
+                "title": f"Search todo #{i}",
+                "description": description,
+            }
+            res = await client.post(BASE_URL, json=payload, headers=auth_headers)
+            assert res.status_code == status.HTTP_201_CREATED
+
+        pages, cursor = [], None
+        while True:
+            params = {"q": "Milk", "limit": 2, **({"cursor": cursor} if cursor else {})}
+            res = await client.get(
+                f"{BASE_URL}search", params=params, headers=auth_headers
+            )
+            assert res.status_code == status.HTTP_200_OK
+            pages.append(res.json())
+            cursor = pages[-1]["next_cursor"]
+            if cursor is None:
+                break
+            # Ranks are fractions, so the cursor must carry a float key
+            assert isinstance(Cursor.decode(cursor, key_type=float).key, float)
+
+        titles = [todo["title"] for page in pages for todo in page["items"]]
+        assert len(pages) == 3
+        assert titles[:2] == ["Search todo #2", "Search todo #0"]
+        assert sorted(titles[2:4]) == ["Search todo #1", "Search todo #5"]
+        assert titles[4] == "Search todo #4"
+
+        back = await client.get(
+            f"{BASE_URL}search",
+            params={"q": "milk", "limit": 2, "cursor": pages[-1]["prev_cursor"]},
+            headers=auth_headers,
+        )
+        assert back.json()["items"] == pages[-2]["items"]
+
+        res = await client.get(
+            f"{BASE_URL}search",
+            params={"q": "milk", "cursor": pages[0]["next_cursor"].swapcase()},
+            headers=auth_headers,
+        )
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_list_todos_invalid_cursor(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Input Validation: Tampered cursors are rejected with 400."""
+        res = await client.get(
+            BASE_URL, params={"cursor": "not-a-cursor"}, headers=auth_headers
+        )
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_todos_are_scoped_to_owner(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession
+    ):
+        """Security: Another user can neither list nor touch my todos."""
+        res = await client.post(BASE_URL, json=VALID_TODO, headers=auth_headers)
+        todo_id = res.json()["id"]
+
+        other = await create_test_user(db_session)
+        other_headers = {"Cookie": f"access_token={await issue_test_token(other)}"}
+
+        listing = await client.get(BASE_URL, headers=other_headers)
+        assert listing.json()["items"] == []
+
+        for method in ("get", "delete"):
+            res = await client.request(
+                method, f"{BASE_URL}{todo_id}", headers=other_headers
+            )
+            assert res.status_code == status.HTTP_404_NOT_FOUND
+
+        res = await client.patch(
+            f"{BASE_URL}{todo_id}", json={"is_completed": True}, headers=other_headers
+        )
+        assert res.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_writes_are_single_statement(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Performance: PUT/PATCH/DELETE each issue one UPDATE/DELETE ... RETURNING."""
+        res = await client.post(BASE_URL, json=VALID_TODO, headers=auth_headers)
+        todo_id = res.json()["id"]
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *args):
+            # Ignore the principal lookup in get_current_user
+            if "todos" in statement:
+                statements.append(statement.split()[0].upper())
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            res = await client.put(
+                f"{BASE_URL}{todo_id}",
+                json={"title": "Buy groceries today"},
+                headers=auth_headers,
+            )
+            assert res.json()["title"] == "Buy groceries today"
+            await client.patch(
+                f"{BASE_URL}{todo_id}",
+                json={"is_completed": True},
+                headers=auth_headers,
+            )
+            await client.delete(f"{BASE_URL}{todo_id}", headers=auth_headers)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+        # No read-before-write and no refresh after commit
+        assert statements == ["UPDATE", "UPDATE", "DELETE"]
+
+    async def test_bulk_create_reports_conflicts(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Bulk: one INSERT creates the batch and flags duplicate titles."""
+        await client.post(BASE_URL, json=VALID_TODO, headers=auth_headers)
+        items = [
+            {**VALID_TODO, "title": "Bulk created todo"},
+            VALID_TODO,
+            {**VALID_TODO, "title": "Bulk created todo"},
+        ]
+        res = await client.post(
+            f"{BASE_URL}bulk", json={"items": items}, headers=auth_headers
+        )
+        assert res.status_code == status.HTTP_200_OK
+        statuses = [item["status"] for item in res.json()["results"]]
+        assert statuses == ["created", "conflict", "conflict"]
+
+        listing = await client.get(BASE_URL, headers=auth_headers)
+        assert len(listing.json()["items"]) == 2
+
+    async def test_bulk_rejects_values_longer_than_columns(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Bulk: an oversized item is a 422 naming it, not a failed INSERT."""
+        items = [
+            {**VALID_TODO, "title": "Bulk todo that fits"},
+            {**VALID_TODO, "title": "x" * 51},
+        ]
+        res = await client.post(
+            f"{BASE_URL}bulk", json={"items": items}, headers=auth_headers
+        )
+        assert res.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+        assert res.json()["errors"][0]["field"] == "items.1.title"
+
+        res = await client.post(BASE_URL, json=VALID_TODO, headers=auth_headers)
+        todo_id = res.json()["id"]
+        res = await client.patch(
+            f"{BASE_URL}bulk",
+            json={"items": [{"id": todo_id, "description": "y" * 256}]},
+            headers=auth_headers,
+        )
+        assert res.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+        listing = await client.get(BASE_URL, headers=auth_headers)
+        assert [t["title"] for t in listing.json()["items"]] == [VALID_TODO["title"]]
+
+    async def test_complete_all(self, client: AsyncClient, auth_headers: dict):
+        """Bulk: "mark all complete" flips every open todo at once."""
+        items = [{**VALID_TODO, "title": f"Open todo number {i}"} for i in range(3)]
+        await client.post(
+            f"{BASE_URL}bulk", json={"items": items}, headers=auth_headers
+        )
+
+        res = await client.patch(
+            f"{BASE_URL}bulk/complete",
+            json={"is_completed": True},
+            headers=auth_headers,
+        )
+        assert res.json() == {"updated": 3}
+
+        listing = await client.get(BASE_URL, headers=auth_headers)
+        assert all(todo["is_completed"] for todo in listing.json()["items"])
+
+    async def test_completed_at_follows_status(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Retention: completed_at is set on completion and kept until reopened."""
+
+        async def completed_at() -> dict[str, datetime | None]:
+            async with async_test_session_maker() as session:
+                todos = (await session.exec(select(Todo))).all()
+            return {str(todo.id): todo.completed_at for todo in todos}
+
+        ids = []
+        for i, is_completed in enumerate([False, True]):
+            payload = {
+                **VALID_TODO,
+                "title": f"Retained todo #{i}",
+                "is_completed": is_completed,
+            }
+            res = await client.post(BASE_URL, json=payload, headers=auth_headers)
+            ids.append(res.json()["id"])
+        stamps = await completed_at()
+        assert stamps[ids[0]] is None
+        created_done = stamps[ids[1]]
+        assert created_done is not None
+
+        await client.patch(
+            f"{BASE_URL}{ids[0]}", json={"is_completed": True}, headers=auth_headers
+        )
+        stamps = await completed_at()
+        assert stamps[ids[0]] is not None
+        patched_done = stamps[ids[0]]
+
+        # Completing what is already completed keeps its original stamp
+        await client.patch(
+            f"{BASE_URL}{ids[0]}", json={"is_completed": True}, headers=auth_headers
+        )
+        await client.patch(
+            f"{BASE_URL}bulk/complete",
+            json={"is_completed": True},
+            headers=auth_headers,
+        )
+        assert await completed_at() == {ids[0]: patched_done, ids[1]: created_done}
+
+        await client.patch(
+            f"{BASE_URL}bulk/complete",
+            json={"is_completed": False},
+            headers=auth_headers,
+        )
+        assert await completed_at() == {ids[0]: None, ids[1]: None}
+
+    async def test_principal_lookup_skips_todos(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Performance: authenticating never joins or loads the user's todos."""
+        items = [{**VALID_TODO, "title": f"Principal todo #{i}"} for i in range(3)]
+        await client.post(
+            f"{BASE_URL}bulk", json={"items": items}, headers=auth_headers
+        )
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            res = await client.get("/api/v1/users/me", headers=auth_headers)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+        assert res.status_code == status.HTTP_200_OK
+        assert not any("todos" in statement for statement in statements)
+
+    async def test_server_timing_reports_queries(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Observability: each response carries its SQL count and DB time."""
+        res = await client.get(BASE_URL, headers=auth_headers)
+        timing = res.headers["Server-Timing"]
+        assert timing.startswith("db;dur=")
+        # principal lookup, list version for the ETag, X-Total-Count from
+        # todo_stats, the page itself
+        assert 'desc="4 queries"' in timing
+        assert "X-Query-Warning" not in res.headers
+
+    async def test_streamed_queries_reach_route_metrics(self):
+        """Observability: queries run while a body streams are still counted."""
+        headers_read = asyncio.Event()
+
+        async def stream_rows(request):
+            async def rows():
+                yield b"first\n"
+                await headers_read.wait()
+                async with engine.connect() as conn:
+                    await conn.exec_driver_sql("SELECT 1")
+                yield b"second\n"
+
+            return StreamingResponse(rows())
+
+        app = Starlette(
+            routes=[Route("/stream", stream_rows)],
+            middleware=[Middleware(QueryTimingMiddleware)],
+        )
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/stream",
+            "raw_path": b"/stream",
+            "query_string": b"",
+            "headers": [],
+        }
+        messages = []
+
+        async def receive():
+            await asyncio.Event().wait()
+
+        async def send(message):
+            # httpx buffers ASGI bodies, so read the messages as they are sent
+            if message["type"] == "http.response.start":
+                headers = dict(message["headers"])
+                assert b'desc="0 queries"' in headers[b"server-timing"]
+                headers_read.set()
+            messages.append(message)
+
+        await app(scope, receive, send)
+        body = b"".join(m.get("body", b"") for m in messages[1:])
+        assert body == b"first\nsecond\n"
+        assert query_metrics.snapshot()["GET /stream"]["queries"] == 1
+
+    async def test_failed_statements_leave_no_timing_state(self):
+        """Observability: a raising statement does not leak its start time."""
+        async with engine.connect() as conn:
+            with pytest.raises(Exception):
+                await conn.exec_driver_sql("SELECT * FROM no_such_table")
+            await conn.rollback()
+            with track_queries() as stats:
+                await conn.exec_driver_sql("SELECT 1")
+            assert stats.count == 1
+            assert conn.sync_connection.info == {}
+
+    async def test_principal_is_cached_between_requests(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Performance: a repeat caller is identified without a user query."""
+        first = await client.get(BASE_URL, headers=auth_headers)
+        second = await client.get(BASE_URL, headers=auth_headers)
+
+        assert 'desc="4 queries"' in first.headers["Server-Timing"]
+        assert 'desc="3 queries"' in second.headers["Server-Timing"]
+
+    async def test_conditional_get_returns_not_modified(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Caching: a matching If-None-Match gets a bodiless 304."""
+        res = await client.post(BASE_URL, json=VALID_TODO, headers=auth_headers)
+        todo_id = res.json()["id"]
+
+        res = await client.get(f"{BASE_URL}{todo_id}", headers=auth_headers)
+        etag = res.headers["ETag"]
+        assert etag.startswith('W/"')
+        res = await client.get(
+            f"{BASE_URL}{todo_id}", headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert res.status_code == status.HTTP_304_NOT_MODIFIED
+        assert res.content == b""
+
+        await client.patch(
+            f"{BASE_URL}{todo_id}", json={"is_completed": True}, headers=auth_headers
+        )
+        res = await client.get(
+            f"{BASE_URL}{todo_id}", headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert res.status_code == status.HTTP_200_OK
+        assert res.headers["ETag"] != etag
+
+        res = await client.get(BASE_URL, headers=auth_headers)
+        list_etag = res.headers["ETag"]
+        res = await client.get(
+            BASE_URL, headers={**auth_headers, "If-None-Match": list_etag}
+        )
+        assert res.status_code == status.HTTP_304_NOT_MODIFIED
+
+    async def test_if_match_rejects_stale_writes(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Concurrency: a write based on an outdated ETag fails with 412."""
+        res = await client.post(BASE_URL, json=VALID_TODO, headers=auth_headers)
+        todo_id = res.json()["id"]
+        res = await client.get(f"{BASE_URL}{todo_id}", headers=auth_headers)
+        stale = res.headers["ETag"]
+
+        res = await client.put(
+            f"{BASE_URL}{todo_id}",
+            json={"title": "Changed elsewhere"},
+            headers={**auth_headers, "If-Match": stale},
+        )
+        assert res.status_code == status.HTTP_200_OK
+        assert res.json()["version"] == 2
+        current = res.headers["ETag"]
+
+        res = await client.put(
+            f"{BASE_URL}{todo_id}",
+            json={"title": "Lost update"},
+            headers={**auth_headers, "If-Match": stale},
+        )
+        assert res.status_code == status.HTTP_412_PRECONDITION_FAILED
+        res = await client.delete(
+            f"{BASE_URL}{todo_id}", headers={**auth_headers, "If-Match": stale}
+        )
+        assert res.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+        res = await client.delete(
+            f"{BASE_URL}{todo_id}", headers={**auth_headers, "If-Match": current}
+        )
+        assert res.status_code == status.HTTP_204_NO_CONTENT
+
+    async def test_if_match_keeps_buffered_toggle_on_412(
+        self, client: AsyncClient, auth_headers: dict, write_behind
+    ):
+        """Write-behind: a rejected conditional toggle loses no buffered one."""
+        res = await client.post(BASE_URL, json=VALID_TODO, headers=auth_headers)
+        todo_id = res.json()["id"]
+        res = await client.get(f"{BASE_URL}{todo_id}", headers=auth_headers)
+        stale = res.headers["ETag"]
+        await client.put(
+            f"{BASE_URL}{todo_id}",
+            json={"title": "Edited elsewhere"},
+            headers=auth_headers,
+        )
+        res = await client.patch(
+            f"{BASE_URL}{todo_id}", json={"is_completed": True}, headers=auth_headers
+        )
+        assert res.json()["is_completed"] is True
+
+        res = await client.patch(
+            f"{BASE_URL}{todo_id}",
+            json={"is_completed": False},
+            headers={**auth_headers, "If-Match": stale},
+        )
+        assert res.status_code == status.HTTP_412_PRECONDITION_FAILED
+        res = await client.get(f"{BASE_URL}{todo_id}", headers=auth_headers)
+        assert res.json()["is_completed"] is True
+
+        res = await client.patch(
+            f"{BASE_URL}{todo_id}",
+            json={"is_completed": False},
+            headers={**auth_headers, "If-Match": res.headers["ETag"]},
+        )
+        assert res.status_code == status.HTTP_200_OK
+        assert await completion_buffer.snapshot(UUID(res.json()["owner_id"])) == {}
+        res = await client.get(f"{BASE_URL}{todo_id}", headers=auth_headers)
+        assert res.json()["is_completed"] is False
+
+    async def test_write_behind_overlays_buffered_toggles(
+        self, client: AsyncClient, auth_headers: dict, write_behind
+    ):
+        """Write-behind: reads, lists and ETags see a toggle before its flush."""
+        res = await client.post(BASE_URL, json=VALID_TODO, headers=auth_headers)
+        todo_id = res.json()["id"]
+        res = await client.get(f"{BASE_URL}{todo_id}", headers=auth_headers)
+        etag = res.headers["ETag"]
+        res = await client.get(BASE_URL, headers=auth_headers)
+        list_etag = res.headers["ETag"]
+
+        res = await client.patch(
+            f"{BASE_URL}{todo_id}", json={"is_completed": True}, headers=auth_headers
+        )
+        assert res.json()["is_completed"] is True
+        owner_id = UUID(res.json()["owner_id"])
+        assert await completion_buffer.pending(owner_id, [UUID(todo_id)]) == {
+            UUID(todo_id): True
+        }
+
+        res = await client.get(f"{BASE_URL}{todo_id}", headers=auth_headers)
+        assert res.json()["is_completed"] is True
+        # Still version 1 in Postgres, but a different representation
+        assert res.json()["version"] == 1
+        assert res.headers["ETag"] != etag
+        res = await client.get(BASE_URL, headers=auth_headers)
+        assert [t["is_completed"] for t in res.json()["items"]] == [True]
+        assert res.headers["ETag"] != list_etag
+
+    async def test_write_behind_flush_settles_buffer(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        write_behind,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Write-behind: a flush writes every pending state, then settles it."""
+        ids = []
+        for i in range(2):
+            payload = {**VALID_TODO, "title": f"Flushed todo #{i}"}
+            res = await client.post(BASE_URL, json=payload, headers=auth_headers)
+            ids.append(UUID(res.json()["id"]))
+            res = await client.patch(
+                f"{BASE_URL}{ids[-1]}",
+                json={"is_completed": True},
+                headers=auth_headers,
+            )
+        owner_id = UUID(res.json()["owner_id"])
+        applied = []
+
+        async def apply_completion(self, states):
+            # UPDATE ... FROM (VALUES ...) needs Postgres; record the batch
+            applied.extend(states)
+            # A toggle landing mid-flush must survive the settle step
+            await completion_buffer.record(owner_id, ids[1], False)
+            return len(states)
+
+        monkeypatch.setattr(TodoRepository, "apply_completion", apply_completion)
+        monkeypatch.setattr(db, "async_session_factory", async_test_session_maker)
+
+        assert await completion_buffer.flush() == 2
+        assert sorted(applied) == sorted((i, owner_id, True) for i in ids)
+        assert await completion_buffer.snapshot(owner_id) == {str(ids[1]): "0"}
+        assert write_behind.data[DIRTY_OWNERS_KEY] == {str(owner_id)}
+
+        assert await completion_buffer.flush() == 1
+        assert await completion_buffer.snapshot(owner_id) == {}
+        assert DIRTY_OWNERS_KEY not in write_behind.data
+        assert await completion_buffer.flush() == 0
+
+    async def test_write_behind_direct_writes_discard_buffer(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        write_behind,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Write-behind: bulk writes supersede the toggles they cover."""
+        ids = []
+        for i in range(3):
+            payload = {**VALID_TODO, "title": f"Discarded todo #{i}"}
+            res = await client.post(BASE_URL, json=payload, headers=auth_headers)
+            ids.append(res.json()["id"])
+            await client.patch(
+                f"{BASE_URL}{ids[-1]}",
+                json={"is_completed": True},
+                headers=auth_headers,
+            )
+        owner_id = UUID(res.json()["owner_id"])
+
+        async def bulk_update(self, items, owner_id):
+            # UPDATE ... FROM (VALUES ...) needs Postgres
+            return []
+
+        monkeypatch.setattr(TodoRepository, "bulk_update", bulk_update)
+        items = [
+            {"id": ids[0], "is_completed": False},
+            {"id": ids[1], "title": "Renamed, not toggled"},
+        ]
+        await client.patch(
+            f"{BASE_URL}bulk", json={"items": items}, headers=auth_headers
+        )
+        pending = await completion_buffer.snapshot(owner_id)
+        assert sorted(pending) == sorted(ids[1:])
+
+        res = await client.patch(
+            f"{BASE_URL}bulk/complete",
+            json={"is_completed": False},
+            headers=auth_headers,
+        )
+        assert res.json() == {"updated": 0}
+        assert await completion_buffer.snapshot(owner_id) == {}
+
+    async def test_write_behind_flush_yields_to_direct_writes(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        write_behind,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Write-behind: toggles discarded mid-flush are not written back."""
+        ids = []
+        for i in range(2):
+            payload = {**VALID_TODO, "title": f"Raced todo #{i}"}
+            res = await client.post(BASE_URL, json=payload, headers=auth_headers)
+            ids.append(UUID(res.json()["id"]))
+            await client.patch(
+                f"{BASE_URL}{ids[-1]}",
+                json={"is_completed": True},
+                headers=auth_headers,
+            )
+        owner_id = UUID(res.json()["owner_id"])
+        snapshot_read = asyncio.Event()
+        release = asyncio.Event()
+
+        async def apply_completion(self, states):
+            # UPDATE ... FROM (VALUES ...) needs Postgres; same rows, row by row
+            snapshot_read.set()
+            await release.wait()
+            for todo_id, _, is_completed in states:
+                todo = await self.repository.session.get(Todo, todo_id)
+                todo.is_completed = is_completed
+            await self.repository.session.commit()
+            return len(states)
+
+        monkeypatch.setattr(TodoRepository, "apply_completion", apply_completion)
+        monkeypatch.setattr(db, "async_session_factory", async_test_session_maker)
+
+        flush = asyncio.create_task(completion_buffer.flush())
+        await snapshot_read.wait()
+        # "Undo all" between the flush reading the toggles and writing them
+        undo_all = asyncio.create_task(
+            client.patch(
+                f"{BASE_URL}bulk/complete",
+                json={"is_completed": False},
+                headers=auth_headers,
+            )
+        )
+        await asyncio.sleep(0.1)
+        assert not undo_all.done()
+        # A flush running meanwhile leaves the locked owner alone
+        assert await completion_buffer.flush() == 0
+
+        release.set()
+        assert await flush == 2
+        res = await undo_all
+        assert res.json() == {"updated": 2}
+        assert await completion_buffer.snapshot(owner_id) == {}
+        async with async_test_session_maker() as session:
+            for todo_id in ids:
+                assert not (await session.get(Todo, todo_id)).is_completed
+        assert not await write_behind.keys(f"{LOCK_KEY_PREFIX}*")
+
+    async def test_todo_cache_serves_hits_until_a_write(
+        self, client: AsyncClient, auth_headers: dict, todo_cache_enabled
+    ):
+        """Caching: list pages come from Redis until a write bumps the version."""
+        await client.post(BASE_URL, json=VALID_TODO, headers=auth_headers)
+        before = cache_stats.snapshot()
+
+        first = await client.get(BASE_URL, headers=auth_headers)
+        second = await client.get(BASE_URL, headers=auth_headers)
+        assert second.json() == first.json()
+        after = cache_stats.snapshot()
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 1
+        # List version and X-Total-Count either way; the page only on a miss
+        assert 'desc="3 queries"' in first.headers["Server-Timing"]
+        assert 'desc="2 queries"' in second.headers["Server-Timing"]
+
+        version_key = f"{VERSION_KEY_PREFIX}{first.json()['items'][0]['owner_id']}"
+        version = int(todo_cache_enabled.data[version_key])
+        payload = {**VALID_TODO, "title": "Written after caching"}
+        await client.post(BASE_URL, json=payload, headers=auth_headers)
+        assert int(todo_cache_enabled.data[version_key]) == version + 1
+
+        res = await client.get(BASE_URL, headers=auth_headers)
+        assert len(res.json()["items"]) == 2
+        assert cache_stats.snapshot()["misses"] - after["misses"] == 1
+
+    async def test_todo_cache_coalesces_concurrent_misses(self, todo_cache_enabled):
+        """Caching: one caller loads a missing entry, the others wait for it."""
+        owner_id = uuid4()
+        loads = 0
+
+        async def load():
+            nonlocal loads
+            loads += 1
+            await asyncio.sleep(0.1)
+            return {"loaded": loads}
+
+        adapter = TypeAdapter(dict)
+        before = cache_stats.snapshot()
+        results = await asyncio.gather(
+            *(todo_cache.fetch(owner_id, "read", (1,), load, adapter) for _ in range(3))
+        )
+        assert loads == 1
+        assert results == [{"loaded": 1}] * 3
+        assert cache_stats.snapshot()["coalesced"] - before["coalesced"] == 2
+        assert not await todo_cache_enabled.keys("*:lock")
+
+        await todo_cache.invalidate(owner_id)
+        assert await todo_cache.fetch(owner_id, "read", (1,), load, adapter) == {
+            "loaded": 2
+        }
@@ -0,0 +1,15 @@
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+
+def fake_replica_engine(url: str, **options) -> AsyncEngine:
+    """
+    Stand-in for ``create_async_engine`` when building read replicas: each
+    replica gets a private in-memory SQLite database, whatever its URL, so
+    sessions bound to it can run queries without a Postgres server.
+    """
+    return create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
@@ -0,0 +1,177 @@
+import fnmatch
+from typing import Callable
+
+from src.todos.write_behind import _RELEASE_SCRIPT, _SETTLE_SCRIPT
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the ``decode_responses=True`` asyncio client,
+    covering the commands the app issues. Expiry is recorded, not enforced;
+    Lua scripts are replaced by Python equivalents from ``SCRIPTS``.
+    """
+
+    def __init__(self) -> None:
+        self.data: dict[str, object] = {}
+        self.ttls: dict[str, float] = {}
+        self.published: list[tuple[str, str]] = []
+
+    # Strings
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and key in self.data:
+            return None
+        if isinstance(value, bytes):
+            value = value.decode()
+        self.data[key] = str(value)
+        if ex is not None:
+            self.ttls[key] = ex
+        elif px is not None:
+            self.ttls[key] = px / 1000
+        return True
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+    async def exists(self, *keys):
+        return sum(key in self.data for key in keys)
+
+    async def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            removed += self.data.pop(key, None) is not None
+            self.ttls.pop(key, None)
+        return removed
+
+    async def ttl(self, key):
+        if key not in self.data:
+            return -2
+        return int(self.ttls.get(key, -1))
+
+    async def keys(self, pattern="*"):
+        return [key for key in self.data if fnmatch.fnmatchcase(key, pattern)]
+
+    # Hashes
+    async def hset(self, key, field, value):
+        self.data.setdefault(key, {})[field] = str(value)
+        return 1
+
+    async def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    async def hmget(self, key, fields):
+        values = self.data.get(key, {})
+        return [values.get(field) for field in fields]
+
+    async def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    async def hlen(self, key):
+        return len(self.data.get(key, {}))
+
+    async def hdel(self, key, *fields):
+        values = self.data.get(key, {})
+        removed = sum(values.pop(field, None) is not None for field in fields)
+        if key in self.data and not values:
+            del self.data[key]
+        return removed
+
+    # Sets
+    async def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+        return len(members)
+
+    async def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    async def srem(self, key, *members):
+        values = self.data.get(key, set())
+        values.difference_update(members)
+        if key in self.data and not values:
+            del self.data[key]
+        return len(members)
+
+    # Sorted sets
+    async def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    async def zremrangebyscore(self, key, low, high):
+        low = float(low)
+        high = float(high)
+        values = self.data.get(key, {})
+        expired = [m for m, score in values.items() if low <= score <= high]
+        for member in expired:
+            del values[member]
+        return len(expired)
+
+    async def zrange(self, key, start, end, withscores=False):
+        items = sorted(self.data.get(key, {}).items(), key=lambda item: item[1])
+        items = items[start : None if end == -1 else end + 1]
+        return items if withscores else [member for member, _ in items]
+
+    # Pub/sub, pipelines and scripts
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def register_script(self, script: str):
+        implementation = SCRIPTS[script]
+
+        async def run(keys=(), args=()):
+            return await implementation(self, list(keys), [str(a) for a in args])
+
+        return run
+
+
+class FakePipeline:
+    """Queues commands and runs them in order on ``execute``."""
+
+    def __init__(self, client: FakeRedis) -> None:
+        self.client = client
+        self.commands: list[tuple[str, tuple, dict]] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.commands = []
+
+    def __getattr__(self, name: str) -> Callable:
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        commands, self.commands = self.commands, []
+        return [
+            await getattr(self.client, name)(*args, **kwargs)
+            for name, args, kwargs in commands
+        ]
+
+
+async def _settle(client: FakeRedis, keys: list[str], args: list[str]) -> None:
+    pending, owners = keys
+    owner, *pairs = args
+    for todo_id, value in zip(pairs[::2], pairs[1::2]):
+        if await client.hget(pending, todo_id) == value:
+            await client.hdel(pending, todo_id)
+    if not await client.hlen(pending):
+        await client.srem(owners, owner)
+
+
+async def _release(client: FakeRedis, keys: list[str], args: list[str]) -> None:
+    for key in keys:
+        if await client.get(key) == args[0]:
+            await client.delete(key)
+
+
+SCRIPTS = {_SETTLE_SCRIPT: _settle, _RELEASE_SCRIPT: _release}
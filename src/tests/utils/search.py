@@ -0,0 +1,57 @@
+import re
+
+from sqlalchemy import literal_column
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import BinaryExpression
+
+# Stand-in for the generated ``search_vector`` column: the raw text it is
+# built from, matched and ranked by the SQLite functions below
+SEARCH_DOCUMENT = literal_column("(todos.title || ' ' || todos.description)")
+
+
+@compiles(BinaryExpression, "sqlite")
+def _compile_match(element, compiler, **kw):
+    """SQLite has no ``@@``; a full-text match becomes ``ts_match(doc, query)``."""
+    if getattr(element.operator, "opstring", None) == "@@":
+        return "ts_match(%s, %s)" % (
+            compiler.process(element.left, **kw),
+            compiler.process(element.right, **kw),
+        )
+    return compiler.visit_binary(element, **kw)
+
+
+def _words(text: str) -> list[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+def websearch_to_tsquery(config: str, query: str) -> str:
+    return " ".join(_words(query))
+
+
+def ts_match(document: str, query: str) -> int:
+    words = set(_words(document))
+    return all(term in words for term in query.split())
+
+
+def ts_rank_cd(document: str, query: str) -> float:
+    """Share of the document's words that are query terms."""
+    words = _words(document)
+    terms = set(query.split())
+    return sum(word in terms for word in words) / len(words)
+
+
+async def install_sqlite_search(engine: AsyncEngine) -> None:
+    """
+    Register Python versions of the Postgres full-text functions the search
+    query calls, on the test engine's single in-memory connection.
+    """
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        for function in (websearch_to_tsquery, ts_match, ts_rank_cd):
+            await raw.driver_connection.create_function(
+                function.__name__,
+                function.__code__.co_argcount,
+                function,
+                deterministic=True,
+            )
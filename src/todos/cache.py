@@ -0,0 +1,160 @@
+"""Read-through Redis cache for todo reads.
+
+Provides:
+* ``todo_cache`` – caches serialized single todos and list pages per owner
+  for ``TODO_CACHE_TTL_SECONDS``;
+* ``cache_stats`` – process-wide hit/miss counters for monitoring.
+
+Entries are keyed by the owner's current version, read from
+``todos:cache:version:<owner>``. Writes bump that counter instead of hunting
+down keys, so every page cached before the write stops being read at once
+and simply expires. On a miss only the caller holding a short ``SET NX``
+lock loads from Postgres; concurrent callers for the same key wait for its
+result rather than all querying at once. Redis errors fall through to the
+database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from contextlib import suppress
+from typing import Awaitable, Callable, TypeVar
+from uuid import UUID
+
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError
+
+from src.core.config import app_settings
+from src.database.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+VERSION_KEY_PREFIX = "todos:cache:version:"
+ENTRY_KEY_PREFIX = "todos:cache:"
+
+# A loader holds the lock at most this long; waiters poll for its result
+LOCK_TTL_MS = 2000
+LOCK_POLL_INTERVAL = 0.025
+
+
+class CacheStats:
+    """Process-wide counters for the todo read cache."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def snapshot(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+        }
+
+
+cache_stats = CacheStats()
+
+
+def _version_key(owner_id: UUID | str) -> str:
+    return f"{VERSION_KEY_PREFIX}{owner_id}"
+
+
+def _entry_key(owner_id: UUID, version: str, kind: str, params: tuple) -> str:
+    digest = hashlib.blake2b(repr(params).encode(), digest_size=12).hexdigest()
+    return f"{ENTRY_KEY_PREFIX}{owner_id}:{version}:{kind}:{digest}"
+
+
+class TodoCache:
+    """Per-owner read-through cache invalidated by version bumps."""
+
+    @property
+    def enabled(self) -> bool:
+        return app_settings.TODO_CACHE
+
+    async def fetch(
+        self,
+        owner_id: UUID,
+        kind: str,
+        params: tuple,
+        load: Callable[[], Awaitable[T]],
+        adapter: TypeAdapter[T],
+    ) -> T:
+        """Cached result of ``load()`` for ``(owner_id, kind, params)``."""
+        if not self.enabled:
+            return await load()
+        client = get_redis_client()
+        try:
+            version = await client.get(_version_key(owner_id)) or "0"
+            key = _entry_key(owner_id, version, kind, params)
+            cached = await client.get(key)
+        except RedisError:
+            cache_stats.errors += 1
+            log.warning("Todo cache unavailable, reading from the database")
+            return await load()
+
+        if cached is not None:
+            cache_stats.hits += 1
+            return adapter.validate_json(cached)
+        cache_stats.misses += 1
+
+        lock = f"{key}:lock"
+        try:
+            locked = await client.set(lock, "1", nx=True, px=LOCK_TTL_MS)
+            if not locked:
+                cached = await self._wait_for(key)
+                if cached is not None:
+                    cache_stats.coalesced += 1
+                    return adapter.validate_json(cached)
+        except RedisError:
+            cache_stats.errors += 1
+            return await load()
+
+        try:
+            value = await load()
+            await client.set(
+                key, adapter.dump_json(value), ex=app_settings.TODO_CACHE_TTL_SECONDS
+            )
+        except RedisError:
+            cache_stats.errors += 1
+        finally:
+            if locked:
+                with suppress(RedisError):
+                    await client.delete(lock)
+        return value
+
+    async def _wait_for(self, key: str) -> str | None:
+        """Poll for the entry another caller is loading, until its lock expires."""
+        client = get_redis_client()
+        for _ in range(int(LOCK_TTL_MS / 1000 / LOCK_POLL_INTERVAL)):
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            cached = await client.get(key)
+            if cached is not None:
+                return cached
+        return None
+
+    async def invalidate(self, *owner_ids: UUID | str) -> None:
+        """Retire every cached read of these owners."""
+        if not self.enabled or not owner_ids:
+            return
+        client = get_redis_client()
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for owner_id in owner_ids:
+                    pipe.incr(_version_key(owner_id))
+                await pipe.execute()
+        except RedisError:
+            # Stale entries still expire after TODO_CACHE_TTL_SECONDS
+            cache_stats.errors += 1
+            log.exception("Failed to invalidate the todo cache")
+
+
+todo_cache = TodoCache()
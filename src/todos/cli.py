@@ -0,0 +1,75 @@
+"""
+Command line todo import, for onboarding large exports from other tools.
+
+    python -m src.todos.cli import todos.csv --email user@example.com
+
+Runs the same batched validation and COPY load as
+``POST /api/v1/todos/import`` and prints the result as JSON.
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator
+
+from sqlmodel import select
+
+from src.auth.models import Principal
+from src.core.repositories.todo import TodoRepository
+from src.database.db import async_session_factory, engine
+from src.entities.user import User
+from src.todos.models import TodoFileFormat
+from src.todos.service import TodoService
+
+CHUNK_SIZE = 1 << 16
+
+
+async def read_file(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as file:
+        while chunk := await asyncio.to_thread(file.read, CHUNK_SIZE):
+            yield chunk
+
+
+async def import_file(path: Path, email: str, file_format: TodoFileFormat) -> None:
+    async with async_session_factory() as session:
+        row = (
+            await session.exec(
+                select(*Principal.columns()).where(User.email == email)
+            )
+        ).first()
+        if row is None:
+            raise SystemExit(f"No user with email {email}")
+        user = Principal.model_validate(row, from_attributes=True)
+
+        service = TodoService(TodoRepository(session))
+        result = await service.import_todos(read_file(path), file_format, user)
+        print(result.model_dump_json(indent=2))
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Todo maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="Import todos from a file")
+    importer.add_argument("path", type=Path)
+    importer.add_argument("--email", required=True, help="Owner of the todos")
+    importer.add_argument(
+        "--format",
+        type=TodoFileFormat,
+        choices=list(TodoFileFormat),
+        help="Defaults to the file extension",
+    )
+
+    args = parser.parse_args()
+    file_format = args.format
+    if file_format is None:
+        try:
+            file_format = TodoFileFormat(args.path.suffix.lstrip(".").lower())
+        except ValueError:
+            parser.error("cannot infer --format from the file extension")
+    asyncio.run(import_file(args.path, args.email, file_format))
+
+
+if __name__ == "__main__":
+    main()
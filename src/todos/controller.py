@@ -2,21 +2,70 @@ from pathlib import Path
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, status
 from fastapi.requests import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
 from src.core.dependencies import TodoServiceDep, UserDep
-from src.core.repositories.base import PaginationParams, get_pagination_params
+from src.core.etags import etag_matches, if_match_version
+from src.core.repositories.base import (
+    MAX_PAGE_SIZE,
+    PaginationParams,
+    get_pagination_params,
+)
 from src.rate_limiting import limiter
 from src.tags import APITags
-from src.todos.models import TodoCreate, TodoPatch, TodoRead, TodoUpdate
+from src.todos.exceptions import TodoVersionMismatchError
+from src.todos.models import (
+    TodoBulkCount,
+    TodoBulkCreate,
+    TodoBulkDelete,
+    TodoBulkResult,
+    TodoBulkUpdate,
+    TodoCreate,
+    TodoFileFormat,
+    TodoFilterParams,
+    TodoImportResult,
+    TodoPage,
+    TodoPatch,
+    TodoRead,
+    TodoStatsRead,
+    TodoUpdate,
+    get_todo_filter_params,
+    todo_page_serializer,
+)
+from src.todos.service import todo_etag
 
 APP_DIR = Path(__file__).resolve().parent.parent
 
 
 router = APIRouter(prefix="/todos", tags=[APITags.TODOS])
 
+INCLUDE_ARCHIVED = "Also read completed todos moved to the archive."
+
+# Browsers keep the body but revalidate it with If-None-Match on every use
+REVALIDATE = "private, no-cache"
+
+IfNoneMatch = Annotated[str | None, Header()]
+IfMatch = Annotated[
+    str | None,
+    Header(description="ETag of the todo as read; 412 if it changed since."),
+]
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": REVALIDATE},
+    )
+
+
+def _expected_version(if_match: str | None, todo_id: UUID) -> int | None:
+    try:
+        return if_match_version(if_match)
+    except ValueError:
+        raise TodoVersionMismatchError(todo_id=todo_id)
+
 
 @router.post(
     "/",
@@ -43,29 +92,216 @@ async def create_todo(
     "/",
     status_code=status.HTTP_200_OK,
     response_class=JSONResponse,
-    response_model=list[TodoRead],
+    response_model=TodoPage,
     name="todos",
 )
 @limiter.limit("60/minute")
 async def todo_list(
-    _: UserDep,
+    user: UserDep,
     service: TodoServiceDep,
     request: Request,
     pagination: Annotated[PaginationParams, Depends(get_pagination_params)],
-) -> list[TodoRead]:
-    return await service.list(
-        offset=pagination.offset, limit=pagination.limit, order_by=pagination.order_by
+    filters: Annotated[TodoFilterParams, Depends(get_todo_filter_params)],
+    include_archived: bool = Query(default=False, description=INCLUDE_ARCHIVED),
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    # Read before the page, so a write in between yields an older tag
+    etag = await service.list_etag(user)
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    page = await service.list(
+        user,
+        offset=pagination.offset,
+        limit=pagination.limit,
+        order_by=pagination.order_by,
+        cursor=pagination.cursor,
+        filters=filters,
+        include_archived=include_archived,
+    )
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE}
+    total = await service.count(user, filters, include_archived)
+    if total is not None:
+        headers["X-Total-Count"] = str(total)
+    # Rows are already typed by their columns; skip response_model validation
+    return Response(
+        content=todo_page_serializer.dump_json(page),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+# Fixed-path routes must be registered before "/{todo_id}" so "stats",
+# "export", "import", "search" and "bulk" are not parsed as a todo id.
+@router.get(
+    "/stats",
+    status_code=status.HTTP_200_OK,
+    response_model=TodoStatsRead,
+    description="Dashboard counters by status and priority",
+)
+@limiter.limit("60/minute")
+async def todo_stats(
+    user: UserDep, service: TodoServiceDep, request: Request
+) -> TodoStatsRead:
+    return await service.stats(user)
+
+
+FILE_MEDIA_TYPES = {
+    TodoFileFormat.NDJSON: "application/x-ndjson",
+    TodoFileFormat.CSV: "text/csv",
+}
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    description="Stream every **todo** as NDJSON or CSV",
+)
+@limiter.limit("5/minute")
+async def export_todos(
+    user: UserDep,
+    service: TodoServiceDep,
+    request: Request,
+    export_format: TodoFileFormat = Query(
+        default=TodoFileFormat.NDJSON, alias="format"
+    ),
+) -> StreamingResponse:
+    return StreamingResponse(
+        service.export(user, export_format),
+        media_type=FILE_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="todos.{export_format}"'
+        },
     )
 
 
+@router.post(
+    "/import",
+    status_code=status.HTTP_200_OK,
+    response_model=TodoImportResult,
+    description=(
+        "Import **todos** from a streamed NDJSON or CSV request body. Rows are "
+        "validated in batches and loaded with COPY; invalid rows and titles "
+        "that already exist are reported per line."
+    ),
+)
+@limiter.limit("2/minute")
+async def import_todos(
+    user: UserDep,
+    service: TodoServiceDep,
+    request: Request,
+    import_format: TodoFileFormat = Query(
+        default=TodoFileFormat.NDJSON, alias="format"
+    ),
+) -> TodoImportResult:
+    return await service.import_todos(request.stream(), import_format, user)
+
+
+@router.get(
+    "/search",
+    status_code=status.HTTP_200_OK,
+    response_model=TodoPage,
+    description="Full-text search over **todo** titles and descriptions",
+)
+@limiter.limit("60/minute")
+async def search_todos(
+    user: UserDep,
+    service: TodoServiceDep,
+    request: Request,
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(
+        default=None,
+        description="Opaque cursor taken from `next_cursor`/`prev_cursor`.",
+    ),
+    include_archived: bool = Query(default=False, description=INCLUDE_ARCHIVED),
+) -> TodoPage:
+    return await service.search(
+        user, q=q, limit=limit, cursor=cursor, include_archived=include_archived
+    )
+
+
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_200_OK,
+    response_model=TodoBulkResult,
+    description="Create many **todos** in one transaction",
+)
+@limiter.limit("10/minute")
+async def bulk_create_todos(
+    user: UserDep,
+    payload: TodoBulkCreate,
+    service: TodoServiceDep,
+    request: Request,
+) -> TodoBulkResult:
+    return await service.bulk_create(payload, user)
+
+
+@router.patch(
+    "/bulk",
+    status_code=status.HTTP_200_OK,
+    response_model=TodoBulkResult,
+    description="Update many **todos** in one transaction",
+)
+@limiter.limit("10/minute")
+async def bulk_update_todos(
+    user: UserDep,
+    payload: TodoBulkUpdate,
+    service: TodoServiceDep,
+    request: Request,
+) -> TodoBulkResult:
+    return await service.bulk_update(payload, user)
+
+
+@router.patch(
+    "/bulk/complete",
+    status_code=status.HTTP_200_OK,
+    response_model=TodoBulkCount,
+    description="Mark every **todo** complete (or open) with a single update",
+)
+@limiter.limit("10/minute")
+async def complete_all_todos(
+    user: UserDep,
+    payload: TodoPatch,
+    service: TodoServiceDep,
+    request: Request,
+) -> TodoBulkCount:
+    return await service.set_all_completed(payload, user)
+
+
+@router.delete(
+    "/bulk",
+    status_code=status.HTTP_200_OK,
+    response_model=TodoBulkResult,
+    description="Delete many **todos** in one transaction",
+)
+@limiter.limit("10/minute")
+async def bulk_delete_todos(
+    user: UserDep,
+    payload: TodoBulkDelete,
+    service: TodoServiceDep,
+    request: Request,
+) -> TodoBulkResult:
+    return await service.bulk_delete(payload, user)
+
+
 @router.get("/{todo_id}", name="todo", description="Get a single todo")
 @limiter.limit("60/minute")
 async def read_todo(
-    user: UserDep, todo_id: UUID, service: TodoServiceDep, request: Request
+    user: UserDep,
+    todo_id: UUID,
+    service: TodoServiceDep,
+    request: Request,
+    response: Response,
+    if_none_match: IfNoneMatch = None,
 ) -> TodoRead:
-    todo = await service.read(todo_id)
-    context = todo.model_dump()
-    context["owner"] = user.username
+    if if_none_match:
+        etag = await service.etag(todo_id, user)
+        if etag is not None and etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+    todo = await service.read(todo_id, user)
+    response.headers["ETag"] = todo_etag(todo.version, todo.is_completed)
+    response.headers["Cache-Control"] = REVALIDATE
     return todo
 
 
@@ -77,25 +313,37 @@ async def read_todo(
 )
 @limiter.limit("60/minute")
 async def update_todo(
-    _: UserDep,
+    user: UserDep,
     todo_id: UUID,
     todo: TodoUpdate,
     service: TodoServiceDep,
     request: Request,
+    response: Response,
+    if_match: IfMatch = None,
 ):
-    return await service.update(todo_id, todo)
+    version = _expected_version(if_match, todo_id)
+    updated = await service.update(todo_id, todo, user, version=version)
+    response.headers["ETag"] = todo_etag(updated.version, updated.is_completed)
+    return updated
 
 
 @router.patch("/{todo_id}")
 @limiter.limit("60/minute")
 async def patch_todo(
-    _: UserDep,
+    user: UserDep,
     todo_id: UUID,
     payload: TodoPatch,
     service: TodoServiceDep,
     request: Request,
+    response: Response,
+    if_match: IfMatch = None,
 ):
-    return await service.patch_todo(todo_id=todo_id, payload=payload)
+    version = _expected_version(if_match, todo_id)
+    patched = await service.patch_todo(
+        todo_id=todo_id, payload=payload, user=user, version=version
+    )
+    response.headers["ETag"] = todo_etag(patched.version, patched.is_completed)
+    return patched
 
 
 @router.delete(
@@ -104,10 +352,12 @@ async def patch_todo(
 )
 @limiter.limit("60/minute")
 async def delete_todo(
-    _: UserDep,
+    user: UserDep,
     todo_id: UUID,
     service: TodoServiceDep,
     request: Request,
+    if_match: IfMatch = None,
 ):
-    await service.delete(todo_id)
+    version = _expected_version(if_match, todo_id)
+    await service.delete(todo_id, user, version=version)
     return JSONResponse(content=None, status_code=status.HTTP_204_NO_CONTENT)
@@ -22,3 +22,18 @@ class TodoAlreadyExistsError(TodoError):
             status_code=status.HTTP_409_CONFLICT,
         )
 
+
+class TodoBulkConflictError(TodoError):
+    def __init__(self):
+        super().__init__(
+            detail="Bulk update would give two todos the same title.",
+            status_code=status.HTTP_409_CONFLICT,
+        )
+
+
+class TodoVersionMismatchError(TodoError):
+    def __init__(self, todo_id: str):
+        super().__init__(
+            detail=f"Todo with id '{todo_id}' was modified; reload it and retry.",
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+        )
@@ -0,0 +1,75 @@
+"""
+Incremental readers for todo imports.
+
+Both readers consume an async stream of byte chunks (a request body or a
+file) and yield ``(line, record)`` pairs without buffering the whole input.
+NDJSON records are the raw JSON text, CSV records are dicts keyed by the
+header row; either is validated by the caller.
+"""
+
+import codecs
+import csv
+from typing import AsyncIterator
+
+from src.todos.models import TodoFileFormat
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.removesuffix("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+async def read_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str]]:
+    line_no = 0
+    async for line in iter_lines(chunks):
+        line_no += 1
+        if line.strip():
+            yield line_no, line
+
+
+async def read_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, dict]]:
+    header: list[str] | None = None
+    record: list[str] = []
+    start = line_no = 0
+
+    async for line in iter_lines(chunks):
+        line_no += 1
+        if not record:
+            start = line_no
+        record.append(line)
+        # A quoted field may span lines; wait for its closing quote
+        if sum(part.count('"') for part in record) % 2:
+            continue
+        row = next(csv.reader(record), [])
+        record = []
+        if not any(row):
+            continue
+        if header is None:
+            header = [name.strip() for name in row]
+            continue
+        yield start, _csv_record(header, row)
+
+    if record and header is not None:
+        # Unterminated quote at end of input; let validation report it
+        yield start, _csv_record(header, next(csv.reader(record), []))
+
+
+def _csv_record(header: list[str], row: list[str]) -> dict:
+    # Empty cells fall back to the TodoCreate defaults
+    return {key: value for key, value in zip(header, row) if value != ""}
+
+
+def read_records(
+    chunks: AsyncIterator[bytes], file_format: TodoFileFormat
+) -> AsyncIterator[tuple[int, str | dict]]:
+    if file_format is TodoFileFormat.CSV:
+        return read_csv(chunks)
+    return read_ndjson(chunks)
@@ -1,18 +1,29 @@
 from datetime import datetime
+from enum import StrEnum
 from typing import Optional
 from uuid import UUID
 
-from pydantic import ConfigDict, field_validator
+from fastapi import Query
+from pydantic import ConfigDict, TypeAdapter, field_validator
 from sqlmodel import Field, SQLModel
+from typing_extensions import TypedDict
 
-from src.entities.todo import Priority
+from src.entities.todo import Priority, Todo
+
+# Upper bound on items accepted by a single bulk request
+MAX_BULK_ITEMS = 5000
+
+# Column sizes of ``todos``, so oversized values fail validation per item
+# instead of failing the whole INSERT/UPDATE statement
+TITLE_MAX_LENGTH = Todo.__table__.c.title.type.length
+DESCRIPTION_MAX_LENGTH = Todo.__table__.c.description.type.length
 
 
 class TodoCreate(SQLModel):
     """Model for creating a new todo item."""
 
-    title: str = Field(max_length=100)
-    description: str = Field(max_length=500)
+    title: str = Field(max_length=TITLE_MAX_LENGTH)
+    description: str = Field(max_length=DESCRIPTION_MAX_LENGTH)
     is_completed: bool = Field(default=False)
     priority: "Priority" = Field(default=Priority.Medium.value)
     model_config = {
@@ -44,15 +55,129 @@ class TodoRead(SQLModel):
     priority: "Priority"
     is_completed: bool
     created_at: datetime
+    version: int
 
     model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
+class TodoPage(SQLModel):
+    """A keyset page of todos; pass a cursor back to fetch the adjacent page."""
+
+    items: list[TodoRead]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+class TodoRow(TypedDict):
+    """``TodoRead`` as a plain row mapping, for the Core fast read path."""
+
+    id: UUID
+    owner_id: UUID
+    title: str
+    description: str
+    priority: Priority
+    is_completed: bool
+    created_at: datetime
+    version: int
+
+
+class TodoRowPage(TypedDict):
+    items: list[TodoRow]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+
+# Built once at import: dumps row mappings straight to JSON bytes without
+# validating them (the rows come from typed columns) or building models
+todo_page_serializer = TypeAdapter(TodoRowPage)
+todo_row_serializer = TypeAdapter(TodoRow)
+todo_read_serializer = TypeAdapter(TodoRead)
+
+
+class TodoFileFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+# Rows validated and COPY'd per batch during an import
+IMPORT_BATCH_SIZE = 5000
+
+# Per-row errors returned by an import; the counts cover every row
+MAX_IMPORT_ERRORS = 1000
+
+
+class TodoImportRowError(SQLModel):
+    line: int
+    error: str
+
+
+class TodoImportResult(SQLModel):
+    imported: int = 0
+    conflicts: int = 0
+    invalid: int = 0
+    errors: list[TodoImportRowError] = []
+
+
+class TodoSortKey(StrEnum):
+    CreatedAt = "created_at"
+    Priority = "priority"
+
+
+class TodoFilterParams(SQLModel):
+    """Server-side list filters; unset fields do not filter."""
+
+    is_completed: Optional[bool] = None
+    priority: Optional[list[Priority]] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    sort_by: TodoSortKey = TodoSortKey.CreatedAt
+
+
+def get_todo_filter_params(
+    is_completed: Optional[bool] = None,
+    priority: Optional[list[Priority]] = Query(
+        default=None,
+        description="Repeat to match several priorities, e.g. `priority=2&priority=3`.",
+    ),
+    created_after: Optional[datetime] = Query(
+        default=None, description="Inclusive lower bound on `created_at`."
+    ),
+    created_before: Optional[datetime] = Query(
+        default=None, description="Exclusive upper bound on `created_at`."
+    ),
+    sort_by: TodoSortKey = TodoSortKey.CreatedAt,
+):
+    return TodoFilterParams(
+        is_completed=is_completed,
+        priority=priority,
+        created_after=created_after,
+        created_before=created_before,
+        sort_by=sort_by,
+    )
+
+
+class TodoPriorityCount(SQLModel):
+    priority: "Priority"
+    open: int = 0
+    completed: int = 0
+
+
+class TodoStatsRead(SQLModel):
+    """Dashboard counters for the current user."""
+
+    total: int = 0
+    open: int = 0
+    completed: int = 0
+    by_priority: list[TodoPriorityCount]
+
+
 class TodoUpdate(SQLModel):
     """Model for updating todo - does NOT include is_completed"""
 
-    title: Optional[str] = None
-    description: Optional[str] = None
+    title: Optional[str] = Field(default=None, max_length=TITLE_MAX_LENGTH)
+    description: Optional[str] = Field(
+        default=None, max_length=DESCRIPTION_MAX_LENGTH
+    )
     priority: "Priority" = Field(default=Priority.Medium.value)
     model_config = ConfigDict(from_attributes=True)
 
@@ -67,3 +192,49 @@ class TodoPatch(SQLModel):
 class TodoDelete(SQLModel):
     id: UUID
     model_config = ConfigDict(frozen=True)
+
+
+class TodoBulkCreate(SQLModel):
+    items: list[TodoCreate] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class TodoBulkUpdateItem(SQLModel):
+    """One row of a bulk update - omitted (null) fields are left unchanged."""
+
+    id: UUID
+    title: Optional[str] = Field(default=None, max_length=TITLE_MAX_LENGTH)
+    description: Optional[str] = Field(
+        default=None, max_length=DESCRIPTION_MAX_LENGTH
+    )
+    priority: Optional["Priority"] = None
+    is_completed: Optional[bool] = None
+
+
+class TodoBulkUpdate(SQLModel):
+    items: list[TodoBulkUpdateItem] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class TodoBulkDelete(SQLModel):
+    ids: list[UUID] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkStatus(StrEnum):
+    Created = "created"
+    Updated = "updated"
+    Deleted = "deleted"
+    Conflict = "conflict"
+    NotFound = "not_found"
+
+
+class TodoBulkItemResult(SQLModel):
+    index: int
+    id: Optional[UUID] = None
+    status: BulkStatus
+
+
+class TodoBulkResult(SQLModel):
+    results: list[TodoBulkItemResult]
+
+
+class TodoBulkCount(SQLModel):
+    updated: int
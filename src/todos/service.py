@@ -1,9 +1,43 @@
-from typing import TYPE_CHECKING
+import csv
+import hashlib
+import io
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, AsyncIterator
 from uuid import UUID
 
+from pydantic import ValidationError
+
+from src.core.config import app_settings
+from src.core.etags import weak_etag
 from src.core.repositories.todo import TodoRepository
 from src.todos import exceptions
-from src.todos.models import TodoCreate, TodoDelete, TodoPatch, TodoRead, TodoUpdate
+from src.todos.imports import read_records
+from src.todos.models import (
+    IMPORT_BATCH_SIZE,
+    MAX_IMPORT_ERRORS,
+    TodoBulkCount,
+    TodoBulkCreate,
+    TodoBulkDelete,
+    TodoBulkResult,
+    TodoBulkUpdate,
+    TodoCreate,
+    TodoDelete,
+    TodoFileFormat,
+    TodoFilterParams,
+    TodoImportResult,
+    TodoImportRowError,
+    TodoPage,
+    TodoPatch,
+    TodoRead,
+    TodoRowPage,
+    TodoStatsRead,
+    TodoUpdate,
+    todo_page_serializer,
+    todo_read_serializer,
+    todo_row_serializer,
+)
+from src.todos.cache import todo_cache
+from src.todos.write_behind import completion_buffer
 
 if TYPE_CHECKING:
     from src.core.dependencies import UserDep
@@ -13,16 +47,188 @@ class TodoService:
     def __init__(self, repo: TodoRepository):
         self.repo = repo
 
-    async def read(self, todo_id: UUID) -> TodoRead:
+    async def etag(self, todo_id: UUID, user: "UserDep") -> str | None:
+        """Current ETag of a todo without loading it; ``None`` if it is gone."""
+        state = await self.repo.version_of(todo_id, owner_id=user.id)
+        if state is None:
+            return None
+        version, is_completed = state
+        if app_settings.TODO_WRITE_BEHIND:
+            pending = await completion_buffer.pending(user.id, [todo_id])
+            is_completed = pending.get(todo_id, is_completed)
+        return todo_etag(version, is_completed)
+
+    async def list_etag(self, user: "UserDep") -> str:
+        """ETag shared by all of the owner's list pages."""
+        parts = [await self.repo.list_version(owner_id=user.id)]
+        if app_settings.TODO_WRITE_BEHIND:
+            # Buffered toggles change the pages before the version moves
+            pending = await completion_buffer.snapshot(user.id)
+            if pending:
+                digest = hashlib.blake2b(digest_size=8)
+                for item in sorted(pending.items()):
+                    digest.update(":".join(item).encode())
+                parts.append(digest.hexdigest())
+        return weak_etag(*parts)
+
+    async def read(self, todo_id: UUID, user: "UserDep") -> TodoRead:
         try:
-            return await self.repo.get_by_id(todo_id)
+            todo = await todo_cache.fetch(
+                user.id,
+                "read",
+                (todo_id,),
+                lambda: self.repo.get_by_id(todo_id, owner_id=user.id),
+                todo_read_serializer,
+            )
         except Exception:
             raise exceptions.TodoNotFoundError(todo_id=todo_id)
+        if app_settings.TODO_WRITE_BEHIND:
+            pending = await completion_buffer.pending(user.id, [todo.id])
+            if todo.id in pending:
+                todo = todo.model_copy(update={"is_completed": pending[todo.id]})
+        return todo
 
     async def list(
-        self, offset: int = 0, limit: int = 10, order_by: str = "asc"
-    ) -> list[TodoRead]:
-        return await self.repo.get_all(offset=offset, limit=limit, order_by=order_by)
+        self,
+        user: "UserDep",
+        offset: int = 0,
+        limit: int = 10,
+        order_by: str = "asc",
+        cursor: str | None = None,
+        filters: TodoFilterParams | None = None,
+        include_archived: bool = False,
+    ) -> TodoRowPage:
+        page = await todo_cache.fetch(
+            user.id,
+            "list",
+            (
+                offset,
+                limit,
+                order_by,
+                cursor,
+                filters.model_dump_json() if filters else None,
+                include_archived,
+            ),
+            lambda: self.repo.get_all(
+                owner_id=user.id,
+                offset=offset,
+                limit=limit,
+                order_by=order_by,
+                cursor=cursor,
+                filters=filters,
+                include_archived=include_archived,
+            ),
+            todo_page_serializer,
+        )
+        if app_settings.TODO_WRITE_BEHIND:
+            # Filtering on is_completed still sees the flushed state
+            pending = await completion_buffer.pending(
+                user.id, (row["id"] for row in page["items"])
+            )
+            for row in page["items"]:
+                row["is_completed"] = pending.get(row["id"], row["is_completed"])
+        return page
+
+    async def count(
+        self,
+        user: "UserDep",
+        filters: TodoFilterParams | None = None,
+        include_archived: bool = False,
+    ) -> int | None:
+        return await self.repo.count(
+            owner_id=user.id, filters=filters, include_archived=include_archived
+        )
+
+    async def stats(self, user: "UserDep") -> TodoStatsRead:
+        return await self.repo.stats(owner_id=user.id)
+
+    async def export(
+        self, user: "UserDep", export_format: TodoFileFormat
+    ) -> AsyncIterator[bytes]:
+        """Encode the owner's todos chunk by chunk as NDJSON or CSV."""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(TodoRead.model_fields))
+        if export_format is TodoFileFormat.CSV:
+            writer.writeheader()
+
+        async for rows in self.repo.export(owner_id=user.id):
+            if export_format is TodoFileFormat.NDJSON:
+                yield b"".join(
+                    todo_row_serializer.dump_json(row) + b"\n" for row in rows
+                )
+                continue
+            writer.writerows(
+                todo_row_serializer.dump_python(row, mode="json") for row in rows
+            )
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            # Header of an empty CSV export
+            yield buffer.getvalue().encode()
+
+    async def import_todos(
+        self,
+        chunks: AsyncIterator[bytes],
+        import_format: TodoFileFormat,
+        user: "UserDep",
+    ) -> TodoImportResult:
+        """
+        Validate streamed rows against ``TodoCreate``, whose limits are the
+        ``todos`` column sizes, in batches and hand the valid ones to the
+        repository's COPY loader. Invalid rows and titles that already exist
+        are reported with their line number.
+        """
+        result = TodoImportResult()
+
+        async def valid_batches() -> AsyncIterator[list[tuple[int, TodoCreate]]]:
+            batch = []
+            async for line, record in read_records(chunks, import_format):
+                try:
+                    if isinstance(record, str):
+                        todo = TodoCreate.model_validate_json(record)
+                    else:
+                        todo = TodoCreate.model_validate(record)
+                except ValidationError as e:
+                    result.invalid += 1
+                    if len(result.errors) < MAX_IMPORT_ERRORS:
+                        result.errors.append(_row_error(line, e))
+                    continue
+                batch.append((line, todo))
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        result.imported, result.conflicts, lines = await self.repo.copy_import(
+            valid_batches(), owner_id=user.id, report_limit=MAX_IMPORT_ERRORS
+        )
+        await todo_cache.invalidate(user.id)
+        result.errors.extend(
+            TodoImportRowError(line=line, error="title: already exists")
+            for line in lines
+        )
+        result.errors = sorted(result.errors, key=lambda e: e.line)
+        del result.errors[MAX_IMPORT_ERRORS:]
+        return result
+
+    async def search(
+        self,
+        user: "UserDep",
+        q: str,
+        limit: int = 10,
+        cursor: str | None = None,
+        include_archived: bool = False,
+    ) -> TodoPage:
+        return await self.repo.search(
+            owner_id=user.id,
+            q=q,
+            limit=limit,
+            cursor=cursor,
+            include_archived=include_archived,
+        )
 
     async def create(
         self,
@@ -30,31 +236,132 @@ class TodoService:
         user: "UserDep",
     ) -> TodoRead:
         try:
-            return await self.repo.create(
+            todo = await self.repo.create(
                 payload=payload,
                 owner_id=user.id,
             )
         except exceptions.TodoError as e:
             raise e
+        await todo_cache.invalidate(user.id)
+        return todo
 
     async def update(
         self,
         todo_id: UUID,
         payload: TodoUpdate,
+        user: "UserDep",
+        version: int | None = None,
     ) -> TodoRead:
         try:
-            return await self.repo.update(todo_id, payload)
+            todo = await self.repo.update(
+                todo_id, payload, owner_id=user.id, version=version
+            )
+        except exceptions.TodoVersionMismatchError:
+            raise
         except Exception as e:
             raise exceptions.TodoNotFoundError(todo_id=todo_id) from e
+        await todo_cache.invalidate(user.id)
+        return todo
 
-    async def patch_todo(self, todo_id: UUID, payload: TodoPatch):
-        try:
-            return await self.repo.patch_todo(todo_id, payload)
-        except Exception as e:
-            raise e
+    async def patch_todo(
+        self,
+        todo_id: UUID,
+        payload: TodoPatch,
+        user: "UserDep",
+        version: int | None = None,
+    ):
+        buffered = app_settings.TODO_WRITE_BEHIND and payload.is_completed is not None
+        if buffered and version is None:
+            # Acknowledge from Redis; the flusher writes the last state in bulk
+            todo = await self.repo.get_by_id(todo_id, owner_id=user.id)
+            await completion_buffer.record(user.id, todo_id, payload.is_completed)
+            return todo.model_copy(update={"is_completed": payload.is_completed})
+        async with _superseding_toggles(user.id, buffered):
+            try:
+                todo = await self.repo.patch_todo(
+                    todo_id, payload, owner_id=user.id, version=version
+                )
+            except Exception as e:
+                raise e
+            if buffered:
+                # A conditional toggle is written through and supersedes the
+                # buffered one - but only once it has passed its precondition
+                await completion_buffer.discard(user.id, [todo_id])
+        await todo_cache.invalidate(user.id)
+        return todo
 
-    async def delete(self, todo_id: UUID) -> TodoDelete:
+    async def delete(
+        self, todo_id: UUID, user: "UserDep", version: int | None = None
+    ) -> TodoDelete:
         try:
-            return await self.repo.delete(todo_id)
+            deleted = await self.repo.delete(
+                todo_id, owner_id=user.id, version=version
+            )
+        except exceptions.TodoVersionMismatchError:
+            raise
         except Exception as e:
             raise exceptions.TodoNotFoundError(todo_id=todo_id) from e
+        await todo_cache.invalidate(user.id)
+        return deleted
+
+    async def bulk_create(
+        self, payload: TodoBulkCreate, user: "UserDep"
+    ) -> TodoBulkResult:
+        results = await self.repo.bulk_create(payload.items, owner_id=user.id)
+        await todo_cache.invalidate(user.id)
+        return TodoBulkResult(results=results)
+
+    async def bulk_update(
+        self, payload: TodoBulkUpdate, user: "UserDep"
+    ) -> TodoBulkResult:
+        async with _superseding_toggles(user.id, app_settings.TODO_WRITE_BEHIND):
+            if app_settings.TODO_WRITE_BEHIND:
+                toggled = [i.id for i in payload.items if i.is_completed is not None]
+                await completion_buffer.discard(user.id, toggled)
+            results = await self.repo.bulk_update(payload.items, owner_id=user.id)
+        await todo_cache.invalidate(user.id)
+        return TodoBulkResult(results=results)
+
+    async def bulk_delete(
+        self, payload: TodoBulkDelete, user: "UserDep"
+    ) -> TodoBulkResult:
+        results = await self.repo.bulk_delete(payload.ids, owner_id=user.id)
+        await todo_cache.invalidate(user.id)
+        return TodoBulkResult(results=results)
+
+    async def set_all_completed(
+        self, payload: TodoPatch, user: "UserDep"
+    ) -> TodoBulkCount:
+        is_completed = True if payload.is_completed is None else payload.is_completed
+        async with _superseding_toggles(user.id, app_settings.TODO_WRITE_BEHIND):
+            if app_settings.TODO_WRITE_BEHIND:
+                await completion_buffer.discard(user.id)
+            updated = await self.repo.set_all_completed(
+                is_completed, owner_id=user.id
+            )
+        await todo_cache.invalidate(user.id)
+        return TodoBulkCount(updated=updated)
+
+
+def _superseding_toggles(owner_id: UUID, buffered: bool):
+    """
+    Lock out the flusher while a direct write discards and overwrites
+    buffered toggles; a no-op when nothing is buffered.
+    """
+    return completion_buffer.exclusive(owner_id) if buffered else nullcontext()
+
+
+def todo_etag(version: int, is_completed: bool) -> str:
+    """
+    Weak ETag of one todo. The completion flag is part of it because a
+    buffered toggle changes the todo before its version moves.
+    """
+    return weak_etag(version, int(is_completed))
+
+
+def _row_error(line: int, error: ValidationError) -> TodoImportRowError:
+    message = "; ".join(
+        f"{'.'.join(map(str, detail['loc'])) or 'row'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+    return TodoImportRowError(line=line, error=message)
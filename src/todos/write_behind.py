@@ -0,0 +1,207 @@
+"""Write-behind buffer for completion toggles.
+
+Provides:
+* ``completion_buffer`` – records the latest ``is_completed`` per todo in
+  Redis, hands pending states to readers and flushes them to Postgres in one
+  batched ``UPDATE``;
+* ``run_flusher`` – background loop started from the app lifespan when
+  ``TODO_WRITE_BEHIND`` is enabled.
+
+Pending toggles live in one hash per owner (``todo_id -> "1"/"0"``), so a
+burst of flips on the same todo collapses to its last state. Owners with
+pending entries are tracked in a set. An entry is only removed once the
+value that was written is still the current one, so a toggle that lands
+while a flush is running is kept for the next round and a crashed flush
+loses nothing.
+
+Direct writes that supersede buffered toggles (bulk updates, complete-all,
+conditional PATCH) take the owner's lock around their discard and commit.
+The flush holds the same lock from reading an owner's toggles until they are
+written, and skips owners that are locked, so it never writes back toggles
+that were discarded after it read them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable, Optional
+from uuid import UUID, uuid4
+
+from src.database.redis import get_redis_client
+from src.todos.cache import todo_cache
+
+log = logging.getLogger(__name__)
+
+PENDING_KEY_PREFIX = "todos:completion:"
+DIRTY_OWNERS_KEY = "todos:completion:owners"
+LOCK_KEY_PREFIX = "todos:completion:lock:"
+
+# Outlasts a flush or direct write; a crashed holder's lock expires with it
+LOCK_TTL_MS = 10_000
+LOCK_POLL_INTERVAL = 0.025
+
+# KEYS: owner hash, dirty owners set; ARGV: owner id, then todo id/state pairs
+_SETTLE_SCRIPT = """
+for i = 2, #ARGV, 2 do
+  if redis.call('HGET', KEYS[1], ARGV[i]) == ARGV[i + 1] then
+    redis.call('HDEL', KEYS[1], ARGV[i])
+  end
+end
+if redis.call('HLEN', KEYS[1]) == 0 then
+  redis.call('SREM', KEYS[2], ARGV[1])
+end
+"""
+
+# KEYS: owner locks; ARGV: the holder's token
+_RELEASE_SCRIPT = """
+for i = 1, #KEYS do
+  if redis.call('GET', KEYS[i]) == ARGV[1] then
+    redis.call('DEL', KEYS[i])
+  end
+end
+"""
+
+
+def _pending_key(owner_id: UUID | str) -> str:
+    return f"{PENDING_KEY_PREFIX}{owner_id}"
+
+
+def _lock_key(owner_id: UUID | str) -> str:
+    return f"{LOCK_KEY_PREFIX}{owner_id}"
+
+
+def _encode(is_completed: bool) -> str:
+    return "1" if is_completed else "0"
+
+
+class CompletionBuffer:
+    """Latest un-flushed completion state per todo, kept in Redis."""
+
+    async def record(self, owner_id: UUID, todo_id: UUID, is_completed: bool) -> None:
+        client = get_redis_client()
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.hset(_pending_key(owner_id), str(todo_id), _encode(is_completed))
+            pipe.sadd(DIRTY_OWNERS_KEY, str(owner_id))
+            await pipe.execute()
+
+    async def pending(
+        self, owner_id: UUID, todo_ids: Iterable[UUID]
+    ) -> dict[UUID, bool]:
+        """Pending states of ``todo_ids``; todos with none are left out."""
+        todo_ids = list(todo_ids)
+        if not todo_ids:
+            return {}
+        client = get_redis_client()
+        values = await client.hmget(_pending_key(owner_id), [str(i) for i in todo_ids])
+        return {
+            todo_id: value == "1"
+            for todo_id, value in zip(todo_ids, values)
+            if value is not None
+        }
+
+    async def snapshot(self, owner_id: UUID) -> dict[str, str]:
+        """Every pending state of the owner, as stored."""
+        return await get_redis_client().hgetall(_pending_key(owner_id))
+
+    async def discard(
+        self, owner_id: UUID, todo_ids: Optional[Iterable[UUID]] = None
+    ) -> None:
+        """
+        Drop pending states that a direct write is about to supersede: the
+        given todos, or every todo of the owner.
+        """
+        client = get_redis_client()
+        if todo_ids is None:
+            await client.delete(_pending_key(owner_id))
+            return
+        fields = [str(i) for i in todo_ids]
+        if fields:
+            await client.hdel(_pending_key(owner_id), *fields)
+
+    @asynccontextmanager
+    async def exclusive(self, owner_id: UUID) -> AsyncIterator[None]:
+        """
+        Hold the owner's lock for a direct write: discard the toggles it
+        supersedes and commit inside the block. Waits out a running flush.
+        """
+        client = get_redis_client()
+        token = uuid4().hex
+        while not await client.set(
+            _lock_key(owner_id), token, nx=True, px=LOCK_TTL_MS
+        ):
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            release = client.register_script(_RELEASE_SCRIPT)
+            await release(keys=[_lock_key(owner_id)], args=[token])
+
+    async def flush(self) -> int:
+        """
+        Write every pending state with one batched ``UPDATE`` and settle the
+        entries that did not change meanwhile. Owners locked by a direct
+        write are left for the next round. Returns the states written.
+        """
+        client = get_redis_client()
+        owners = list(await client.smembers(DIRTY_OWNERS_KEY))
+        if not owners:
+            return 0
+        token = uuid4().hex
+        async with client.pipeline(transaction=False) as pipe:
+            for owner in owners:
+                pipe.set(_lock_key(owner), token, nx=True, px=LOCK_TTL_MS)
+            acquired = await pipe.execute()
+        owners = [owner for owner, locked in zip(owners, acquired) if locked]
+        if not owners:
+            return 0
+        try:
+            return await self._flush_locked(client, owners)
+        finally:
+            release = client.register_script(_RELEASE_SCRIPT)
+            await release(keys=[_lock_key(owner) for owner in owners], args=[token])
+
+    async def _flush_locked(self, client, owners: list[str]) -> int:
+        # Imported here: the repository pulls in the ORM models
+        from src.core.repositories.todo import TodoRepository
+        from src.database.db import async_session_factory
+
+        async with client.pipeline(transaction=False) as pipe:
+            for owner in owners:
+                pipe.hgetall(_pending_key(owner))
+            snapshots = await pipe.execute()
+
+        states = [
+            (UUID(todo_id), UUID(owner), value == "1")
+            for owner, snapshot in zip(owners, snapshots)
+            for todo_id, value in snapshot.items()
+        ]
+        if states:
+            async with async_session_factory() as session:
+                await TodoRepository(session).apply_completion(states)
+
+            # Cached reads of these owners predate the flushed states
+            await todo_cache.invalidate(*owners)
+
+        settle = client.register_script(_SETTLE_SCRIPT)
+        for owner, snapshot in zip(owners, snapshots):
+            args = [item for pair in snapshot.items() for item in pair]
+            await settle(
+                keys=[_pending_key(owner), DIRTY_OWNERS_KEY], args=[owner, *args]
+            )
+        return len(states)
+
+
+completion_buffer = CompletionBuffer()
+
+
+async def run_flusher(interval: float) -> None:
+    """Flush ``completion_buffer`` every ``interval`` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await completion_buffer.flush()
+        except Exception:
+            # Entries stay in Redis and are retried on the next tick
+            log.exception("Flushing buffered completion toggles failed")
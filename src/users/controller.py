@@ -15,7 +15,7 @@ router = APIRouter(prefix="/users", tags=[APITags.USERS])
 @router.get("/me", response_model=UserResponse)
 async def get_current_user(user_dep: UserDep, service: UserServiceDep):
     """Get current authenticated user profile"""
-    user = await service._get_user_by_email(user_dep.email)
+    user = await service._get_user_by_email(user_dep.email, replica=True)
     return UserResponse.model_validate(user)
 
 
@@ -104,5 +104,5 @@ async def dashboard(
     service: UserServiceDep,
     request: Request,
 ):
-    user = await service._get_user_by_email(user_dep.email)
+    user = await service._get_user_by_email(user_dep.email, replica=True)
     return user.model_dump(exclude=["password_hash"])
@@ -6,13 +6,13 @@ from fastapi_mail import MessageType
 from pydantic import EmailStr
 from sqlmodel import select
 
+from src.auth.cache import invalidate_principal
 from src.auth.exceptions import EmailVerificationError
 from src.core.config import app_settings
 from src.core.security import (
     decode_token_urlsafe,
     generate_token_urlsafe,
-    hash_password,
-    verify_password,
+    password_hashing,
 )
 from src.database.db import DBSession
 from src.entities.user import User
@@ -28,11 +28,19 @@ from src.worker.tasks import send_mail, send_mail_template
 
 
 class UserService:
-    def __init__(self, session: DBSession):
+    def __init__(self, session: DBSession, read_session: DBSession | None = None):
         self.session = session
+        self.read_session = read_session or session
 
-    async def _get_user_by_email(self, email: EmailStr) -> User | None:
-        return await self.session.scalar(select(User).where(User.email == email))
+    async def _get_user_by_email(
+        self, email: EmailStr, replica: bool = False
+    ) -> User | None:
+        """
+        ``replica=True`` is for display-only reads; anything that goes on to
+        modify the returned user must load it from the primary session.
+        """
+        session = self.read_session if replica else self.session
+        return await session.scalar(select(User).where(User.email == email))
 
     async def verify_user_email(self, token: str):
         data = decode_token_urlsafe(
@@ -49,6 +57,7 @@ class UserService:
 
         user.email_verified = True
         await self.session.commit()
+        await invalidate_principal(user.id)
 
     async def password_reset_link(self, email: EmailStr) -> None:
         """
@@ -119,8 +128,9 @@ class UserService:
                 raise UserNotFoundError()
 
             # Hash and update password
-            user.password_hash = hash_password(new_password)
+            user.password_hash = await password_hashing.hash(new_password)
             await self.session.commit()
+            await invalidate_principal(user.id)
 
             logging.info(f"Password successfully reset for user: {user.id}")
 
@@ -138,7 +148,7 @@ class UserService:
     ) -> None:
         user = await self._get_user_by_email(email)
         # Verify current password
-        if not verify_password(
+        if not await password_hashing.verify(
             password_change.current_password,
             user.password_hash,
         ):
@@ -152,9 +162,12 @@ class UserService:
             raise PasswordMismatchError()
 
         # Update password
-        user.password_hash = hash_password(password_change.new_password)
+        user.password_hash = await password_hashing.hash(
+            password_change.new_password
+        )
 
         await self.session.commit()
+        await invalidate_principal(user.id)
         send_mail.delay(
             recipients=[user.email],
             subject="Password Change",
@@ -1,8 +1,12 @@
+from datetime import datetime, timedelta
+
 from asgiref.sync import async_to_sync
 from celery import Celery
+from celery.schedules import crontab
 from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
 from pydantic import EmailStr
 
+from src.core.config import app_settings
 from src.core.config import (
     database_settings as dbsettings,
 )
@@ -24,6 +28,13 @@ celery = Celery(
 
 send_messages = async_to_sync(fastmail.send_message)
 
+celery.conf.beat_schedule = {
+    "archive-completed-todos": {
+        "task": "src.worker.tasks.archive_completed_todos",
+        "schedule": crontab(hour=3, minute=0),
+    },
+}
+
 
 @celery.task
 def send_mail(recipients: list[str], subject: str, body: str, subtype: MessageType):
@@ -54,3 +65,44 @@ def send_mail_template(
         ),
         template_name=template_name,
     )
+
+
+async def _archive_completed_todos(cutoff: datetime, batch_size: int) -> int:
+    # Imported here so the mail-only worker import path stays light
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from src.core.repositories.todo import TodoRepository
+    from src.database.redis import close_redis
+    from src.entities import user  # noqa: F401 - resolves Todo.owner
+    from src.todos.cache import todo_cache
+
+    # Each task run gets its own event loop, so no pooled connections
+    engine = create_async_engine(dbsettings.POSTGRES_URL, poolclass=NullPool)
+    moved = 0
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            repo = TodoRepository(session)
+            while True:
+                batch, owners = await repo.archive_completed(cutoff, batch_size)
+                moved += batch
+                # Cached pages of these owners still list the moved rows
+                await todo_cache.invalidate(*owners)
+                if batch < batch_size:
+                    break
+    finally:
+        await engine.dispose()
+        # The Redis client is bound to this run's event loop as well
+        await close_redis()
+    return moved
+
+
+@celery.task
+def archive_completed_todos():
+    """Move todos completed over TODO_ARCHIVE_AFTER_DAYS ago into todos_archive."""
+    cutoff = datetime.now() - timedelta(days=app_settings.TODO_ARCHIVE_AFTER_DAYS)
+    moved = async_to_sync(_archive_completed_todos)(
+        cutoff, app_settings.TODO_ARCHIVE_BATCH_SIZE
+    )
+    return f"Archived {moved} todos"